@@ -0,0 +1,60 @@
+"""
+Benchmarks intent prompt assembly in isolation (no LLM call).
+
+Compares the old per-call path (re-render the catalog + system template on every request)
+against the precompiled prompt, and checks the system prefix is byte-stable across calls.
+
+Usage: python scripts/benchmarks/bench_intent_prompt.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+# Add backend to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.agent import intent_parser
+
+CONTEXT = "Conversation History:\nuser: hi\nassistant: Hello!\n\nRelevant Memories:\n[FACT] home: Pune"
+
+def legacy_assembly():
+    # Mirrors the pre-compiled behaviour: catalog + system prompt rendered per request
+    template = ChatPromptTemplate.from_messages([
+        ("system", intent_parser.SYSTEM_PROMPT + "\n" + intent_parser.CONTEXT_PROMPT),
+        ("human", "{utterance}")
+    ])
+    return template.format_messages(
+        intent_list=intent_parser._build_intent_list(),
+        intent_example="create_calendar_event",
+        context=CONTEXT,
+        utterance="what's on my calendar today"
+    )
+
+def compiled_assembly():
+    return intent_parser.intent_prompt.format_messages(
+        **intent_parser._chain_inputs("what's on my calendar today", CONTEXT)
+    )
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    
+    legacy = timeit.timeit(legacy_assembly, number=iterations)
+    compiled = timeit.timeit(compiled_assembly, number=iterations)
+    
+    print(f"Prompt version: {intent_parser.INTENT_PROMPT_VERSION}")
+    print(f"legacy   : {legacy / iterations * 1e6:8.1f} us/call")
+    print(f"compiled : {compiled / iterations * 1e6:8.1f} us/call")
+    print(f"speedup  : {legacy / compiled:8.2f}x")
+    
+    first = compiled_assembly()[0].content
+    second = intent_parser.intent_prompt.format_messages(
+        **intent_parser._chain_inputs("read my emails", "No context available.")
+    )[0].content
+    print(f"system prefix byte-stable: {first == second}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Recall and latency of the retrieve_memories vector search strategies on Postgres + pgvector.
+
+The script seeds synthetic users of different sizes into the configured database. One
+large user shares the table with many small ones, which is the case where HNSW plus a
+user_id filter loses rows. Vectors are clustered so that nearest neighbours are
+meaningful. For each user size it reports, against exact search as ground truth:
+- recall@k and p50/p95 latency of the exact strategy;
+- the same for HNSW at several ef_search values, with iterative scan on and off;
+- the extra round trip of the "auto" strategy: the bounded per-user count it runs when
+  its cached size check has expired.
+The seeded users (and, by cascade, their memories) are deleted at the end.
+
+Run it against a scratch database: it writes rows and HNSW inserts are not free.
+
+Usage: DATABASE_URL=postgresql://... python scripts/benchmarks/bench_memory_search.py [queries]
+"""
+
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+# Add backend to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+from sqlalchemy import insert
+
+from src.config import settings
+from src.database import SessionLocal
+from src.memory.retrieve import _is_small_user, search_by_vector
+from src.models.memory import EMBED_DIM, Memory
+from src.models.user import User
+
+TOP_K = 5
+CLUSTERS = 64
+# (number of users, memories per user)
+POPULATION = [(1, 20000), (20, 2000), (200, 50)]
+EF_SEARCH_VALUES = [40, 64, 128, 256]
+
+def _unit(vec):
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+def _sample(centers, rng):
+    center = rng.choice(centers)
+    return _unit([c + rng.gauss(0, 0.15) for c in center])
+
+def seed(db, rng):
+    centers = [_unit([rng.gauss(0, 1) for _ in range(EMBED_DIM)]) for _ in range(CLUSTERS)]
+    users = {}
+    for count, size in POPULATION:
+        for _ in range(count):
+            user_id = uuid4()
+            db.add(User(id=user_id, email=f"bench-{user_id}@example.com"))
+            db.flush()
+            rows = [
+                {
+                    "user_id": user_id,
+                    "type": "DOCUMENT" if i % 4 == 0 else "FACT",
+                    "source": "bench",
+                    "content": f"bench memory {i}",
+                    "content_hash": f"{user_id}-{i}",
+                    "embedding": _sample(centers, rng),
+                    "metadata_": {}
+                }
+                for i in range(size)
+            ]
+            for start in range(0, len(rows), 1000):
+                db.execute(insert(Memory), rows[start:start + 1000])
+            db.commit()
+            users.setdefault(size, []).append(user_id)
+    return centers, users
+
+def run(db, user_id, query, strategy, ef_search=None):
+    started = time.perf_counter()
+    rows = search_by_vector(db, str(user_id), query, top_k=TOP_K, strategy=strategy, ef_search=ef_search)
+    elapsed = time.perf_counter() - started
+    # End the transaction so SET LOCAL does not leak into the next run
+    db.rollback()
+    return [mem.id for mem, _ in rows], elapsed
+
+def report(label, recalls, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<32} recall@{TOP_K} {statistics.mean(recalls):6.3f}   p50 {statistics.median(latencies) * 1e3:7.2f} ms   p95 {p95 * 1e3:7.2f} ms")
+
+def main():
+    if settings.ENVIRONMENT == "test" or not settings.DATABASE_URL.startswith("postgresql"):
+        sys.exit("Needs a Postgres DATABASE_URL with pgvector (ENVIRONMENT != test)")
+
+    queries_per_user = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(7)
+    db = SessionLocal()
+    users = {}
+    try:
+        centers, users = seed(db, rng)
+        for size, user_ids in users.items():
+            print(f"users with {size} memories:")
+            cases = [(uid, _sample(centers, rng)) for uid in user_ids[:5] for _ in range(queries_per_user)]
+            truth = {i: run(db, uid, q, "exact")[0] for i, (uid, q) in enumerate(cases)}
+
+            def measure(label, strategy, ef_search=None):
+                recalls, latencies = [], []
+                for i, (uid, q) in enumerate(cases):
+                    ids, elapsed = run(db, uid, q, strategy, ef_search)
+                    expected = set(truth[i])
+                    recalls.append(len(expected & set(ids)) / max(len(expected), 1))
+                    latencies.append(elapsed)
+                report(label, recalls, latencies)
+
+            measure("exact", "exact")
+            
+            size_checks = []
+            for uid, _ in cases:
+                started = time.perf_counter()
+                _is_small_user(db, str(uid), settings.MEMORY_EXACT_SCAN_MAX_ROWS)
+                size_checks.append(time.perf_counter() - started)
+                db.rollback()
+            size_checks.sort()
+            print(f"  {'auto size check (count)':<32} {'':14}p50 {statistics.median(size_checks) * 1e3:7.2f} ms   p95 {size_checks[int(len(size_checks) * 0.95) - 1] * 1e3:7.2f} ms")
+            original = settings.MEMORY_HNSW_ITERATIVE_SCAN
+            try:
+                for mode in ("off", "relaxed_order"):
+                    settings.MEMORY_HNSW_ITERATIVE_SCAN = mode
+                    for ef in EF_SEARCH_VALUES:
+                        measure(f"hnsw ef={ef} iterative={mode}", "hnsw", ef)
+            finally:
+                settings.MEMORY_HNSW_ITERATIVE_SCAN = original
+    finally:
+        db.rollback()
+        for user_ids in users.values():
+            db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmarks policy evaluation: rules re-run per call vs the precomputed decision table.
+
+Cycles through every registered tool with its default action type and scope, the way
+ToolRuntime builds PolicyChecks, and reports throughput for both paths. It also checks
+that they agree.
+
+Usage: python scripts/benchmarks/bench_policy.py [iterations]
+"""
+
+import os
+import sys
+import time
+from uuid import uuid4
+
+# Add backend to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.policy.contracts import PolicyCheck
+from src.policy.engine import evaluate_policy, evaluate_policy_uncached, policy_table
+from src.policy.tool_registry import TOOL_POLICY_REGISTRY
+
+def build_checks():
+    user_id, session_id = uuid4(), uuid4()
+    return [
+        PolicyCheck(
+            user_id=user_id,
+            session_id=session_id,
+            tool_name=name,
+            action_type=meta["default_action_type"],
+            target_entity=meta["category"],
+            scope=meta["default_scope"],
+            sensitivity=meta["default_sensitivity"],
+            intent_summary=f"Execute {name}",
+            tool_args_preview={}
+        )
+        for name, meta in TOOL_POLICY_REGISTRY.items()
+    ]
+
+def throughput(fn, checks, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for check in checks:
+            fn(check)
+    return iterations * len(checks) / (time.perf_counter() - start)
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    checks = build_checks()
+    print(f"Policy table warmed: {policy_table.warm()} entries, {len(checks)} tools")
+    
+    rules = throughput(evaluate_policy_uncached, checks, iterations)
+    table = throughput(evaluate_policy, checks, iterations)
+    
+    print(f"rules : {rules:12,.0f} decisions/s")
+    print(f"table : {table:12,.0f} decisions/s")
+    print(f"speedup: {table / rules:.2f}x")
+    
+    agree = all(
+        evaluate_policy(c).model_dump(exclude={"expires_at"}) == evaluate_policy_uncached(c).model_dump(exclude={"expires_at"})
+        for c in checks
+    )
+    print(f"decisions agree: {agree}")
+
+if __name__ == "__main__":
+    main()
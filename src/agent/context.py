@@ -1,25 +1,23 @@
+import asyncio
+import hashlib
+import re
 from uuid import UUID
-from typing import Dict, Any
+from typing import Any, Dict, List
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
 from ..models.tool_execution import AgentMessage
-from ..memory.retrieve import retrieve_memories
+from ..memory.retrieve import aretrieve_memories, retrieve_memories
 
-def get_context(
+def get_history(
     db: Session,
     user_id: UUID, 
     session_id: UUID, 
-    utterance: str, 
     limit_messages: int = 10
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
     """
-    Retrieves the context for the agent:
-    1. Recent conversation history (last N messages).
-    2. Semantic memory / RAG context based on utterance.
+    Recent conversation history (last N messages), oldest first.
     """
-    
-    # 1. Fetch recent messages
     recent_msgs = db.query(AgentMessage).filter(
         AgentMessage.session_id == session_id,
         AgentMessage.user_id == user_id
@@ -32,13 +30,19 @@ def get_context(
             "content": m.content,
             "modality": m.modality
         })
-        
-    # 2. Memory Retrieval (A2.6)
+    return history
+
+CONTEXT_MEMORY_TYPES = ["FACT", "PREFERENCE", "TASK", "SUMMARY", "NOTE"]
+
+def get_memory_facts(db: Session, user_id: UUID, utterance: str) -> List[str]:
+    """
+    Semantic memory / RAG context based on utterance (A2.6).
+    """
     memories = retrieve_memories(
         db=db, 
         user_id=str(user_id), 
         query_text=utterance,
-        types=["FACT", "PREFERENCE", "TASK", "SUMMARY", "NOTE"],
+        types=CONTEXT_MEMORY_TYPES,
         top_k=5, 
         min_score=0.65
     )
@@ -46,8 +50,76 @@ def get_context(
     memory_facts = []
     for m in memories:
         memory_facts.append(f"[{m.type}] {m.content}")
-    
+    return memory_facts
+
+async def aget_memory_facts(db: Session, user_id: UUID, utterance: str) -> List[str]:
+    """
+    get_memory_facts without holding a thread for the embedding call.
+    """
+    memories = await aretrieve_memories(
+        db=db,
+        user_id=str(user_id),
+        query_text=utterance,
+        types=CONTEXT_MEMORY_TYPES,
+        top_k=5,
+        min_score=0.65
+    )
+    return [f"[{m.type}] {m.content}" for m in memories]
+
+def get_context(
+    db: Session,
+    user_id: UUID, 
+    session_id: UUID, 
+    utterance: str, 
+    limit_messages: int = 10
+) -> Dict[str, Any]:
+    """
+    Retrieves the context for the agent:
+    1. Recent conversation history (last N messages).
+    2. Semantic memory / RAG context based on utterance.
+    """
+    return {
+        "history": get_history(db, user_id, session_id, limit_messages),
+        "memory_facts": get_memory_facts(db, user_id, utterance)
+    }
+
+async def aget_context(
+    db: Session,
+    user_id: UUID,
+    session_id: UUID,
+    utterance: str,
+    limit_messages: int = 10
+) -> Dict[str, Any]:
+    """
+    Async get_context. Both parts use the same Session, so they run one after the other.
+    """
+    history = await asyncio.to_thread(get_history, db, user_id, session_id, limit_messages)
     return {
         "history": history,
-        "memory_facts": memory_facts
+        "memory_facts": await aget_memory_facts(db, user_id, utterance)
     }
+
+def serialize_context(context: Dict[str, Any]) -> str:
+    """
+    Renders context into the text block handed to the intent parser.
+    """
+    history_txt = "\n".join([f"{m['role']}: {m['content']}" for m in context.get("history", [])[-3:]])
+    memories_txt = "\n".join(context.get("memory_facts", []))
+    return f"Conversation History:\n{history_txt}\n\nRelevant Memories:\n{memories_txt}"
+
+# Utterances that lean on the previous turn ("what about Paris?", "do it again")
+FOLLOW_UP_PATTERN = re.compile(
+    r"^\s*(and|also|what about|how about|same)\b|\b(it|that|there|them|again)\b",
+    re.IGNORECASE
+)
+
+def context_fingerprint(user_id: UUID, utterance: str, context: Dict[str, Any]) -> str:
+    """
+    Hash of the context that can change how an utterance resolves, used as the intent cache key.
+    Memories always count; history only counts for follow-ups, so self-contained commands
+    like "read my emails" still hit across turns.
+    """
+    parts = [str(user_id)] + sorted(context.get("memory_facts", []))
+    if FOLLOW_UP_PATTERN.search(utterance):
+        parts += [f"{m['role']}: {m['content']}" for m in context.get("history", [])[-3:]]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
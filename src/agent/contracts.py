@@ -1,5 +1,5 @@
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 class Intent(BaseModel):
     """
@@ -15,18 +15,29 @@ class PlanStep(BaseModel):
     """
     A single step in the execution plan, mapping to a tool call.
     """
+    step_id: Optional[str] = None # Assigned by Plan if omitted
     tool_name: str
     args: Dict[str, Any]
     intent_summary: str # Justification/Context for the policy engine
+    depends_on: List[str] = Field(default_factory=list) # step_ids that must succeed first
+    runs_after: List[str] = Field(default_factory=list) # step_ids that must finish first (any outcome)
 
 class Plan(BaseModel):
     """
-    The sequence of actions the agent intends to take.
+    The actions the agent intends to take, as a DAG.
+    Steps without a dependency path between them may run concurrently (read-only tools only).
     """
     steps: List[PlanStep] = Field(default_factory=list)
     requires_user_input: bool = False
     clarifying_question: Optional[str] = None
 
+    @model_validator(mode="after")
+    def _assign_step_ids(self) -> "Plan":
+        for i, step in enumerate(self.steps, start=1):
+            if not step.step_id:
+                step.step_id = f"step_{i}"
+        return self
+
 class OrchestratorResponse(BaseModel):
     """
     The final response returned to the user/frontend.
@@ -0,0 +1,74 @@
+"""
+Pool of prebuilt AgentExecutors for the legacy /chat path.
+
+Building an executor re-assembles the tool list and the tool-calling agent, which is
+wasted work when nothing changed since the last request. One executor is kept per
+rag_enabled variant and rebuilt only when the assembled tool set differs from the one
+it was built with.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from langchain.agents import AgentExecutor
+
+from ..tools import get_all_tools
+from ..utils.logging import get_logger
+from ..observability.metrics import AGENT_EXECUTOR_POOL_TOTAL, AGENT_EXECUTOR_BUILD_SECONDS_SAVED
+from . import create_agent_executor
+
+logger = get_logger(__name__)
+
+# Names of the tools an executor was built with
+ToolSignature = Tuple[str, ...]
+
+
+def tool_signature(tools: List) -> ToolSignature:
+    return tuple(sorted(tool.name for tool in tools))
+
+
+class AgentExecutorPool:
+    def __init__(
+        self,
+        factory: Callable[[bool], AgentExecutor] = create_agent_executor,
+        tools_fn: Callable[[bool], List] = get_all_tools
+    ):
+        self.factory = factory
+        self.tools_fn = tools_fn
+        # rag_enabled -> (tool signature, executor, seconds it took to build)
+        self._executors: Dict[bool, Tuple[ToolSignature, AgentExecutor, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, rag_enabled: bool) -> AgentExecutor:
+        """
+        Returns the pooled executor for rag_enabled, building it on first use or when the
+        tool set changed. Each hit adds the avoided build time to the saved-seconds counter.
+        """
+        variant = "rag" if rag_enabled else "base"
+        signature = tool_signature(self.tools_fn(rag_enabled))
+
+        with self._lock:
+            entry = self._executors.get(rag_enabled)
+            if entry and entry[0] == signature:
+                AGENT_EXECUTOR_POOL_TOTAL.labels(result="hit", variant=variant).inc()
+                AGENT_EXECUTOR_BUILD_SECONDS_SAVED.labels(variant=variant).inc(entry[2])
+                return entry[1]
+
+            result = "rebuild" if entry else "miss"
+            start = time.perf_counter()
+            executor = self.factory(rag_enabled)
+            build_seconds = time.perf_counter() - start
+
+            self._executors[rag_enabled] = (signature, executor, build_seconds)
+            AGENT_EXECUTOR_POOL_TOTAL.labels(result=result, variant=variant).inc()
+            logger.info(f"Agent executor ({variant}) built in {build_seconds * 1000:.1f}ms ({result})")
+            return executor
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._executors.clear()
+
+
+# Global instance
+executor_pool = AgentExecutorPool()
@@ -0,0 +1,168 @@
+"""
+Deterministic first-stage intent classifier.
+
+Resolves trivial read-only commands ("what's the weather in Pune", "check my calendar
+for 3 days") with keyword rules and regex slot extractors, so they skip the GPT call.
+Anything that is ambiguous, multi-intent or side-effecting is left to the LLM parser.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .contracts import Intent
+from .intents_catalog import INTENTS
+
+# Utterances longer than this are rarely "trivial"; let the LLM handle them.
+MAX_WORDS = 20
+
+# Anything that looks like a write/side effect is never fast-pathed. "schedule" is only
+# a noun after "my", "the" or a possessive ("today's schedule"); otherwise it is a verb.
+WRITE_PATTERN = re.compile(
+    r"\b(send|create|book|add|set|delete|remove|cancel|reply|forward|draft|invite|move|"
+    r"remind|reschedule|postpone|mark|archive|flag|unflag|star|label|snooze|mute|"
+    r"update|change|edit|rename|accept|decline|rsvp|empty|unsubscribe)\b"
+    r"|(?<!\bmy )(?<!\bthe )(?<!'s )\bschedule\b",
+    re.IGNORECASE
+)
+
+# Calendar and mail rules also need explicit read phrasing ("what's on my calendar",
+# "show my emails"), so that a bare noun never carries a request to the read tool.
+READ_PATTERN = re.compile(
+    r"\b(what(?:'s| is| are)?|show|check|list|view|see|read|get|open|any|do i have|"
+    r"how many|my|today'?s|tomorrow'?s)\b",
+    re.IGNORECASE
+)
+
+# Qualifiers the extractors cannot turn into slots ("emails from Bob", "meetings about
+# the launch"). A read that drops them would answer a different question.
+UNPARSED_QUALIFIER = re.compile(
+    r"\b(from|about|regarding|with|by|containing|mentioning|subject|titled|called|"
+    r"unread|important|flagged|attachments?)\b",
+    re.IGNORECASE
+)
+# Below the default INTENT_FAST_PATH_THRESHOLD: the LLM parser takes over
+UNPARSED_CONFIDENCE = 0.6
+
+# Places that only user memory/context can resolve ("weather at home")
+PERSONAL_PLACES = {"home", "work", "office", "here", "there", "the office"}
+
+DAYS_PATTERN = re.compile(r"\b(\d{1,2})\s*-?\s*days?\b", re.IGNORECASE)
+
+# Slot extractor: utterance -> (slots, confidence)
+SlotExtractor = Callable[[str], Tuple[Dict[str, Any], float]]
+
+
+def _extract_weather(text: str) -> Tuple[Dict[str, Any], float]:
+    slots: Dict[str, Any] = {}
+    location = re.search(
+        r"\b(?:in|at|for)\s+(?!the\b|next\b|today\b|tomorrow\b|tonight\b|\d)"
+        r"([A-Za-z][A-Za-z .'-]*?)"
+        r"(?=\s+(?:today|tomorrow|tonight|this|next|for|over|on)\b|\s*[?.!,]|\s*$)",
+        text,
+        re.IGNORECASE
+    )
+    if location:
+        slots["location"] = location.group(1).strip()
+
+    days = DAYS_PATTERN.search(text)
+    if days:
+        slots["num_days"] = min(int(days.group(1)), 5)
+    elif re.search(r"\btomorrow\b", text, re.IGNORECASE):
+        slots["num_days"] = 2
+    elif re.search(r"\bweek\b", text, re.IGNORECASE):
+        slots["num_days"] = 5
+
+    place = slots.get("location", "").lower()
+    if not place or place in PERSONAL_PLACES or place.startswith("my "):
+        return slots, 0.5
+    return slots, 0.95
+
+
+def _extract_calendar(text: str) -> Tuple[Dict[str, Any], float]:
+    slots: Dict[str, Any] = {}
+    days = DAYS_PATTERN.search(text)
+    if days:
+        slots["days"] = int(days.group(1))
+    elif re.search(r"\btoday\b", text, re.IGNORECASE):
+        slots["days"] = 1
+    elif re.search(r"\btomorrow\b", text, re.IGNORECASE):
+        slots["days"] = 1
+        slots["specific_date"] = (date.today() + timedelta(days=1)).isoformat()
+    elif re.search(r"\bweek\b", text, re.IGNORECASE):
+        slots["days"] = 7
+
+    if UNPARSED_QUALIFIER.search(text):
+        return slots, UNPARSED_CONFIDENCE
+    return slots, (0.95 if "days" in slots else 0.6)
+
+
+def _extract_emails(text: str) -> Tuple[Dict[str, Any], float]:
+    slots: Dict[str, Any] = {}
+    folder = re.search(r"\b(inbox|sent|drafts|archive|deleted)\b", text, re.IGNORECASE)
+    if folder:
+        slots["folder"] = folder.group(1).lower()
+    count = re.search(r"\b(\d{1,2})\s+(?:\w+\s+)?(?:e-?mails|mails)\b", text, re.IGNORECASE)
+    if count:
+        slots["max_emails"] = int(count.group(1))
+    if UNPARSED_QUALIFIER.search(text):
+        return slots, UNPARSED_CONFIDENCE
+    return slots, 0.92
+
+
+def _extract_nothing(text: str) -> Tuple[Dict[str, Any], float]:
+    return {}, 0.95
+
+
+# intent name -> (trigger, slot extractor). Only read-only intents belong here.
+RULES: Dict[str, Tuple[re.Pattern, SlotExtractor]] = {
+    "get_weather_info": (
+        re.compile(r"\b(weather|forecast|temperature|raining|rain|sunny|humidity)\b", re.IGNORECASE),
+        _extract_weather
+    ),
+    "get_calendar_events": (
+        re.compile(r"\b(calendar|agenda|schedule|meetings?|events?|appointments?)\b", re.IGNORECASE),
+        _extract_calendar
+    ),
+    "read_emails": (
+        re.compile(r"\b(e-?mails?|inbox|mail)\b", re.IGNORECASE),
+        _extract_emails
+    ),
+    # Resource words only count with a metric: bare "ram"/"cpu" also occur in other
+    # requests ("what did Ram say", "how much ram should I buy")
+    "get_system_info": (
+        re.compile(
+            r"\b(system (?:info|information|status|stats)|(?:cpu|ram|memory) (?:usage|load)|"
+            r"disk (?:usage|space)|battery (?:level|status|percentage|life))\b",
+            re.IGNORECASE
+        ),
+        _extract_nothing
+    ),
+}
+
+# Intents whose trigger nouns also appear in write requests
+READ_PHRASING_REQUIRED = {"get_calendar_events", "read_emails"}
+
+# Rules must only reference catalog intents
+assert all(name in INTENTS for name in RULES), "fast-path rule references unknown intent"
+
+
+def classify(utterance: str) -> Optional[Intent]:
+    """
+    Returns a locally-resolved Intent, or None when no single rule applies.
+    The caller decides whether the confidence is high enough to skip the LLM.
+    """
+    text = utterance.strip()
+    if not text or len(text.split()) > MAX_WORDS or WRITE_PATTERN.search(text):
+        return None
+
+    matches: List[str] = [name for name, (trigger, _) in RULES.items() if trigger.search(text)]
+    if len(matches) != 1:
+        # No match, or a compound request ("weather and my calendar") -> LLM
+        return None
+
+    name = matches[0]
+    if name in READ_PHRASING_REQUIRED and not READ_PATTERN.search(text):
+        return None
+    slots, confidence = RULES[name][1](text)
+    return Intent(name=name, slots=slots, confidence=confidence)
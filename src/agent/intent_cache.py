@@ -0,0 +1,144 @@
+"""
+In-process cache of parsed intents.
+
+Keyed on the normalized utterance plus a fingerprint of the context that can change
+slot resolution (see context.context_fingerprint). Entries expire after a TTL and the
+least recently used entry is evicted when the cache is full. Optionally, a miss falls
+back to embedding similarity against earlier utterances with the same fingerprint.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from ..config import settings
+from ..observability.metrics import (
+    INTENT_CACHE_TOTAL, INTENT_CACHE_EVICTIONS_TOTAL, INTENT_CACHE_EMBED_ERRORS_TOTAL
+)
+from ..utils.logging import get_logger
+from .contracts import Intent
+
+logger = get_logger(__name__)
+
+# (fingerprint, normalized utterance)
+CacheKey = Tuple[str, str]
+
+
+def normalize_utterance(utterance: str) -> str:
+    """
+    Lowercases, drops punctuation and collapses whitespace so trivial variants share a key.
+    """
+    text = re.sub(r"[^\w\s]", " ", utterance.lower())
+    return " ".join(text.split())
+
+
+class IntentCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600,
+        embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        similarity_threshold: float = 0.95,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        # key -> (stored_at, intent, embedding)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Intent, Optional[List[float]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, utterance: str, fingerprint: str) -> Optional[Intent]:
+        key = (fingerprint, normalize_utterance(utterance))
+        now = self.clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                INTENT_CACHE_EVICTIONS_TOTAL.labels(reason="ttl").inc()
+                entry = None
+            if entry:
+                self._entries.move_to_end(key)
+                INTENT_CACHE_TOTAL.labels(result="hit").inc()
+                return entry[1].model_copy(deep=True)
+
+        if self.embed_fn:
+            similar = self._get_similar(key, now)
+            if similar:
+                INTENT_CACHE_TOTAL.labels(result="semantic_hit").inc()
+                return similar
+
+        INTENT_CACHE_TOTAL.labels(result="miss").inc()
+        return None
+
+    def put(self, utterance: str, fingerprint: str, intent: Intent) -> None:
+        key = (fingerprint, normalize_utterance(utterance))
+        vector = self._embed(key[1], "put") if self.embed_fn else None
+
+        with self._lock:
+            self._entries[key] = (self.clock(), intent.model_copy(deep=True), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                INTENT_CACHE_EVICTIONS_TOTAL.labels(reason="lru").inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get_similar(self, key: CacheKey, now: float) -> Optional[Intent]:
+        """
+        Nearest earlier utterance under the same fingerprint, if above the similarity threshold.
+        Vectors from the embeddings provider are unit-normalized, so the dot product is cosine.
+        """
+        query = self._embed(key[1], "get")
+        if query is None:
+            # Provider failed: treat as a miss
+            return None
+
+        best_score, best_key = 0.0, None
+        with self._lock:
+            for candidate_key, (stored_at, _, vector) in self._entries.items():
+                if candidate_key[0] != key[0] or vector is None or now - stored_at > self.ttl_seconds:
+                    continue
+                score = sum(a * b for a, b in zip(query, vector))
+                if score > best_score:
+                    best_score, best_key = score, candidate_key
+
+            if best_key is None or best_score < self.similarity_threshold:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][1].model_copy(deep=True)
+
+    def _embed(self, text: str, operation: str) -> Optional[List[float]]:
+        """
+        Embeds text for the similarity lookup. A cache must never fail the turn, so
+        provider errors are logged and return None.
+        """
+        try:
+            return self.embed_fn([text])[0]
+        except Exception as e:
+            INTENT_CACHE_EMBED_ERRORS_TOTAL.labels(operation=operation).inc()
+            logger.warning(f"Intent cache embedding failed ({operation}): {e}")
+            return None
+
+
+def _build_cache() -> IntentCache:
+    embed_fn = None
+    if settings.INTENT_CACHE_SEMANTIC:
+        from ..memory.embeddings import embeddings
+        embed_fn = embeddings.embed_texts
+    return IntentCache(
+        max_entries=settings.INTENT_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.INTENT_CACHE_TTL_SECONDS,
+        embed_fn=embed_fn,
+        similarity_threshold=settings.INTENT_CACHE_SIMILARITY
+    )
+
+# Global instance
+intent_cache = _build_cache()
@@ -1,12 +1,18 @@
+import asyncio
+import hashlib
 from typing import Optional
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 
 from ..config import settings
 from ..utils.logging import get_logger
+from ..observability.metrics import INTENT_FAST_PATH_TOTAL
 from .contracts import Intent
 from .intents_catalog import INTENTS
+from . import fast_path
+from .intent_cache import intent_cache
 
 logger = get_logger(__name__)
 
@@ -23,6 +29,8 @@ llm = ChatOpenAI(
 parser = PydanticOutputParser(pydantic_object=Intent)
 
 # System Prompt
+# Static part only: everything per-request (context, utterance) goes in later messages so the
+# rendered system message is byte-identical across calls and provider prompt caching applies.
 SYSTEM_PROMPT = """You are a strict intent classification engine.
 Your job is to analyze the user's command and map it to one of the known intents.
 
@@ -35,19 +43,21 @@ RULES:
 3. Confidence should be a float between 0.0 and 1.0.
 4. If critical slots are missing for the chosen intent, mark 'needs_clarification' as True and provide a single 'clarifying_question'.
    - Required slots for {intent_example}: Use catalog definitions.
-   
-    "CONTEXT (Use this to resolve references and parameters):\n{context}\n\n"
-    "OUTPUT FORMAT:\n"
-    "Return strictly a valid JSON object matching the schema:\n"
-    "{{ \n"
-    "  \"name\": \"intent_name_here\", \n"
-    "  \"slots\": {{ ... }}, \n"
-    "  \"confidence\": 0.9, \n"
-    "  \"needs_clarification\": false, \n"
-    "  \"clarifying_question\": null \n"
-    "}}\n"
+5. Use the CONTEXT message to resolve references and parameters.
+
+OUTPUT FORMAT:
+Return strictly a valid JSON object matching the schema:
+{{
+  "name": "intent_name_here",
+  "slots": {{ ... }},
+  "confidence": 0.9,
+  "needs_clarification": false,
+  "clarifying_question": null
+}}
 """
 
+CONTEXT_PROMPT = "CONTEXT (Use this to resolve references and parameters):\n{context}"
+
 def _build_intent_list() -> str:
     lines = []
     for k, v in INTENTS.items():
@@ -55,41 +65,135 @@ def _build_intent_list() -> str:
         lines.append(f"- {k}: {v.get('description', '')}. Required Slots: {v.get('required_slots', [])}")
     return "\n".join(lines)
 
-intent_prompt = ChatPromptTemplate.from_messages([
-    ("system", SYSTEM_PROMPT),
-    ("human", "{utterance}")
-])
+def compile_intent_prompt() -> None:
+    """
+    Renders the catalog into the system prompt once and rebuilds the chain.
+    Called at import; call again after INTENTS changes (catalog reload).
+    """
+    global COMPILED_SYSTEM_PROMPT, INTENT_PROMPT_VERSION, intent_prompt, chain
+    
+    COMPILED_SYSTEM_PROMPT = SYSTEM_PROMPT.format(
+        intent_list=_build_intent_list(),
+        intent_example="create_calendar_event"
+    )
+    INTENT_PROMPT_VERSION = hashlib.sha256(COMPILED_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+    
+    # A message object is not templated, so braces in the compiled prompt stay literal
+    intent_prompt = ChatPromptTemplate.from_messages([
+        SystemMessage(content=COMPILED_SYSTEM_PROMPT),
+        ("system", CONTEXT_PROMPT),
+        ("human", "{utterance}")
+    ])
+    chain = intent_prompt | llm | parser
+    
+    # Cached intents were produced by the previous prompt
+    intent_cache.clear()
+    logger.info(f"Intent prompt compiled (version {INTENT_PROMPT_VERSION})")
+
+compile_intent_prompt()
+
+def _chain_inputs(utterance: str, context_str: Optional[str]) -> dict:
+    return {
+        "utterance": utterance,
+        "context": context_str or "No context available."
+    }
+
+def _post_validate(result: Intent) -> Intent:
+    """
+    Forces clarification when the LLM picked an intent but left required slots empty.
+    """
+    if result.name in INTENTS and result.name != "unknown":
+        spec = INTENTS[result.name]
+        missing = [slot for slot in spec["required_slots"] if slot not in result.slots or not result.slots[slot]]
+        
+        if missing and not result.needs_clarification:
+            # LLM failed to flag it, we force it
+            result.needs_clarification = True
+            result.clarifying_question = f"I need the following information to proceed: {', '.join(missing)}."
+            
+    return result
 
-chain = intent_prompt | llm | parser
+def _try_fast_path(utterance: str) -> Optional[Intent]:
+    """
+    Returns the locally-classified Intent if it clears INTENT_FAST_PATH_THRESHOLD, else None.
+    """
+    if not settings.INTENT_FAST_PATH_ENABLED:
+        return None
+        
+    candidate = fast_path.classify(utterance)
+    if candidate and candidate.confidence >= settings.INTENT_FAST_PATH_THRESHOLD:
+        INTENT_FAST_PATH_TOTAL.labels(outcome="hit", intent=candidate.name).inc()
+        logger.debug(f"Fast-path intent {candidate.name} ({candidate.confidence})")
+        return _post_validate(candidate)
+        
+    INTENT_FAST_PATH_TOTAL.labels(outcome="miss", intent=candidate.name if candidate else "none").inc()
+    return None
 
-def parse_intent(utterance: str, context_str: Optional[str] = "") -> Intent:
+def parse_intent(
+    utterance: str,
+    context_str: Optional[str] = "",
+    context_fingerprint: Optional[str] = None
+) -> Intent:
     """
     Parses the user utterance into a structured Intent.
+    Trivial commands are resolved by the fast path; repeats are served from the intent cache
+    when a context_fingerprint is given; everything else goes to the LLM.
     """
+    fast = _try_fast_path(utterance)
+    if fast:
+        return fast
+        
+    use_cache = settings.INTENT_CACHE_ENABLED and context_fingerprint is not None
+    if use_cache:
+        cached = intent_cache.get(utterance, context_fingerprint)
+        if cached:
+            return cached
+        
     try:
-        intent_list_str = _build_intent_list()
+        result = _post_validate(chain.invoke(_chain_inputs(utterance, context_str)))
+        
+    except Exception as e:
+        # Fallback
+        logger.error(f"Intent Parsing Error: {e}")
+        return Intent(name="unknown", confidence=0.0)
         
-        result = chain.invoke({
-            "intent_list": intent_list_str,
-            "intent_example": "create_calendar_event",
-            "utterance": utterance,
-            "context": context_str or "No context available."
-        })
+    if use_cache:
+        intent_cache.put(utterance, context_fingerprint, result)
+    return result
 
+async def aparse_intent(
+    utterance: str,
+    context_str: Optional[str] = "",
+    context_fingerprint: Optional[str] = None
+) -> Intent:
+    """
+    Async variant of parse_intent. Awaits the LLM call instead of blocking the event loop.
+    """
+    fast = _try_fast_path(utterance)
+    if fast:
+        return fast
         
-        # Post-validation (Double check logic)
-        if result.name in INTENTS and result.name != "unknown":
-            spec = INTENTS[result.name]
-            missing = [slot for slot in spec["required_slots"] if slot not in result.slots or not result.slots[slot]]
-            
-            if missing and not result.needs_clarification:
-                # LLM failed to flag it, we force it
-                result.needs_clarification = True
-                result.clarifying_question = f"I need the following information to proceed: {', '.join(missing)}."
-                
-        return result
+    use_cache = settings.INTENT_CACHE_ENABLED and context_fingerprint is not None
+    if use_cache:
+        # Semantic lookups call the embeddings provider, keep that off the loop
+        if intent_cache.embed_fn:
+            cached = await asyncio.to_thread(intent_cache.get, utterance, context_fingerprint)
+        else:
+            cached = intent_cache.get(utterance, context_fingerprint)
+        if cached:
+            return cached
+        
+    try:
+        result = _post_validate(await chain.ainvoke(_chain_inputs(utterance, context_str)))
         
     except Exception as e:
         # Fallback
         logger.error(f"Intent Parsing Error: {e}")
         return Intent(name="unknown", confidence=0.0)
+        
+    if use_cache:
+        if intent_cache.embed_fn:
+            await asyncio.to_thread(intent_cache.put, utterance, context_fingerprint, result)
+        else:
+            intent_cache.put(utterance, context_fingerprint, result)
+    return result
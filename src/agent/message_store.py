@@ -1,6 +1,7 @@
 from uuid import UUID
 from sqlalchemy.orm import Session
 from ..models.tool_execution import AgentMessage
+from ..db.unit_of_work import commit, refresh
 
 def save_user_message(
     db: Session,
@@ -35,8 +36,8 @@ def save_user_message(
         status="COMPLETED" # User message is received=completed
     )
     db.add(msg)
-    db.commit()
-    db.refresh(msg)
+    commit(db)
+    refresh(db, msg)
     return msg
 
 def save_assistant_message(
@@ -60,6 +61,6 @@ def save_assistant_message(
         status="COMPLETED"
     )
     db.add(msg)
-    db.commit()
-    db.refresh(msg)
+    commit(db)
+    refresh(db, msg)
     return msg
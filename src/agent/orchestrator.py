@@ -1,18 +1,47 @@
+import asyncio
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 
+from ..config import settings
+from ..db.unit_of_work import aunit_of_work, checkpoint
 from ..utils.logging import get_logger
+from ..observability.metrics import INTENT_SPECULATION_TOTAL
 from ..policy.confirmations import resolve_confirmation
 from ..models.policy import PendingConfirmationModel
 from ..tools.runtime import ToolRuntime
+from ..tools.registry import get_tool
+from ..tools.contracts import ToolResult
 from .message_store import save_user_message, save_assistant_message
-from .contracts import OrchestratorResponse
-from .intent_parser import parse_intent
-from .context import get_context
+from .contracts import Intent, OrchestratorResponse, Plan, PlanStep
+from .intent_parser import aparse_intent
+from .context import (
+    aget_context, aget_memory_facts, context_fingerprint, get_history, serialize_context
+)
 from .planner import build_plan
 
 logger = get_logger(__name__)
 
+# (phase, data) progress callback, see ahandle_user_utterance
+PhaseCallback = Callable[[str, Dict[str, Any]], None]
+
+# The sync entry point runs turns on one long-lived loop. A fresh asyncio.run() per turn would
+# close the loop that loop-bound clients (the intent LLM, the embeddings pool) keep connections on.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="orchestrator-loop", daemon=True).start()
+    return _sync_loop
+
 class AgentOrchestrator:
     def __init__(self):
         self.tool_runtime = ToolRuntime()
@@ -25,11 +54,57 @@ class AgentOrchestrator:
         utterance: str,
         modality: str = "voice",
         idempotency_key: str = None
+    ) -> OrchestratorResponse:
+        """
+        Sync entry point kept for scripts/tests.
+        Runs the async pipeline to completion on a shared background loop; must not be called
+        from a running event loop (use ahandle_user_utterance there).
+        """
+        future = asyncio.run_coroutine_threadsafe(self.ahandle_user_utterance(
+            db=db,
+            user_id=user_id,
+            session_id=session_id,
+            utterance=utterance,
+            modality=modality,
+            idempotency_key=idempotency_key
+        ), _get_sync_loop())
+        return future.result()
+
+    async def ahandle_user_utterance(
+        self,
+        db: Session,
+        user_id: UUID,
+        session_id: UUID,
+        utterance: str,
+        modality: str = "voice",
+        idempotency_key: str = None,
+        on_phase: Optional[PhaseCallback] = None
     ) -> OrchestratorResponse:
         """
         Main entry point for handling a user command.
+        The LLM call is awaited natively; blocking DB/tool work is offloaded to worker threads
+        so a slow turn does not stall the event loop.
+        on_phase(phase, data) is called on the event loop as each phase finishes
+        (context, intent, plan, policy, tool), letting callers stream progress.
+        With AGENT_UNIT_OF_WORK the turn's writes are committed in one transaction at the end.
         """
+        if not settings.AGENT_UNIT_OF_WORK:
+            return await self._handle_turn(db, user_id, session_id, utterance, modality, idempotency_key, on_phase)
         
+        async with aunit_of_work(db):
+            return await self._handle_turn(db, user_id, session_id, utterance, modality, idempotency_key, on_phase)
+
+    async def _handle_turn(
+        self,
+        db: Session,
+        user_id: UUID,
+        session_id: UUID,
+        utterance: str,
+        modality: str,
+        idempotency_key: Optional[str],
+        on_phase: Optional[PhaseCallback]
+    ) -> OrchestratorResponse:
+        emit = self._phase_emitter(on_phase)
         
         # Start Trace
         from ..observability.langfuse_client import langfuse_client
@@ -42,20 +117,21 @@ class AgentOrchestrator:
         )
         
         # 1. Persist User Message
-        save_user_message(db, user_id, session_id, utterance, modality, trace_id=trace.id, idempotency_key=idempotency_key)
+        await asyncio.to_thread(
+            save_user_message, db, user_id, session_id, utterance, modality,
+            trace_id=trace.id, idempotency_key=idempotency_key
+        )
         
         # 2. Check for Pending Confirmation Logic
-        pending_conf = db.query(PendingConfirmationModel).filter(
-            PendingConfirmationModel.session_id == session_id,
-            PendingConfirmationModel.user_id == user_id,
-            PendingConfirmationModel.status == "pending"
-        ).first()
+        pending_conf = await asyncio.to_thread(self._find_pending_confirmation, db, user_id, session_id)
         
         if pending_conf:
             logger.info(f"Attempting to resolve confirmation {pending_conf.id} with: {utterance}")
             langfuse_client.observe(trace, "confirmation.resolve_attempt", input=utterance)
             
-            resolution = resolve_confirmation(user_id, session_id, pending_conf.id, utterance, db)
+            resolution = await asyncio.to_thread(
+                resolve_confirmation, user_id, session_id, pending_conf.id, utterance, db
+            )
             
             langfuse_client.observe(trace, "confirmation.resolution", output=resolution)
             
@@ -64,19 +140,19 @@ class AgentOrchestrator:
                 tool_args = resolution["tool_args"]
                 
                 # Execute via Runtime
-                result = self.tool_runtime.execute(
+                result = await self.tool_runtime.aexecute(
                     user_id=user_id,
                     session_id=session_id,
                     tool_name=tool_name,
                     args_dict=tool_args,
                     db=db,
-                    trace=trace
+                    trace=trace,
+                    on_phase=emit
                 )
+                emit("tool", {"tool": tool_name, "status": result.status})
                 
                 response_text = self._summarize_result(result)
-                save_assistant_message(db, user_id, session_id, response_text, modality, trace_id=trace.id)
-                
-                trace.update(output=response_text)
+                await self._reply(db, user_id, session_id, response_text, modality, trace)
                 return OrchestratorResponse(
                      assistant_text=response_text,
                      should_speak=True,
@@ -85,72 +161,57 @@ class AgentOrchestrator:
                 
             elif resolution["status"] == "still_pending":
                  msg = resolution["message"]
-                 save_assistant_message(db, user_id, session_id, msg, modality, trace_id=trace.id)
-                 trace.update(output=msg)
+                 await self._reply(db, user_id, session_id, msg, modality, trace)
                  return OrchestratorResponse(assistant_text=msg, should_speak=True)
                  
             else:
                 msg = f"Confirmation failed: {resolution.get('message')}"
-                save_assistant_message(db, user_id, session_id, msg, modality, trace_id=trace.id)
-                trace.update(output=msg)
+                await self._reply(db, user_id, session_id, msg, modality, trace)
                 return OrchestratorResponse(assistant_text=msg, should_speak=True)
 
-        # 3. Context Retrieval (A2.6)
-        context = get_context(db, user_id, session_id, utterance)
+        # 3 + 4. Context Retrieval (A2.6) and Intent Parsing
+        if settings.INTENT_SPECULATIVE_PARSE:
+            context, intent = await self._speculative_context_and_intent(db, user_id, session_id, utterance)
+        else:
+            context = await aget_context(db, user_id, session_id, utterance)
+            intent = await aparse_intent(
+                utterance,
+                context_str=serialize_context(context),
+                context_fingerprint=context_fingerprint(user_id, utterance, context)
+            )
         langfuse_client.observe(trace, "context.retrieved", output={"context_len": len(context)})
-
-        # Serialize Context
-        history_txt = "\n".join([f"{m['role']}: {m['content']}" for m in context.get("history", [])[-3:]])
-        memories_txt = "\n".join(context.get("memory_facts", []))
-        context_str = f"Conversation History:\n{history_txt}\n\nRelevant Memories:\n{memories_txt}"
-
-        # 4. Intent Parsing
-        intent = parse_intent(utterance, context_str=context_str)
+        emit("context", {"history": len(context["history"]), "memories": len(context["memory_facts"])})
         langfuse_client.observe(trace, "intent.parsed", output=intent.model_dump())
+        emit("intent", {"intent": intent.name, "confidence": intent.confidence})
         
         # 5. Planning
         plan = build_plan(intent, context)
         langfuse_client.observe(trace, "plan.built", output=plan.model_dump())
+        emit("plan", {"tools": [step.tool_name for step in plan.steps]})
         
         if plan.requires_user_input:
             msg = plan.clarifying_question or "Could you clarify that?"
-            save_assistant_message(db, user_id, session_id, msg, modality, trace_id=trace.id)
-            trace.update(output=msg)
+            await self._reply(db, user_id, session_id, msg, modality, trace)
             return OrchestratorResponse(assistant_text=msg, should_speak=True)
             
         # 6. Execute Plan Steps
-        results = []
-        for step in plan.steps:
-            langfuse_client.observe(trace, "tool.execution_start", input={"tool": step.tool_name, "args": step.args})
-            
-            result = self.tool_runtime.execute(
-                user_id=user_id,
-                session_id=session_id,
-                tool_name=step.tool_name,
-                args_dict=step.args,
-                db=db,
-                trace=trace
-            )
-            results.append(result)
-            
-            langfuse_client.observe(trace, "tool.execution_result", output=result.model_dump())
-            
-            if result.status != "success":
-                break
+        step_results = await self._execute_plan(db, user_id, session_id, plan, trace, emit)
                 
         # 7. Response Generation
-        final_result = results[-1] if results else None
+        executed = [step_results[step.step_id] for step in plan.steps if step.step_id in step_results]
+        final_result = executed[-1] if executed else None
         
         if not final_result:
              msg = "I didn't do anything."
-             save_assistant_message(db, user_id, session_id, msg, modality, trace_id=trace.id)
-             trace.update(output=msg)
+             await self._reply(db, user_id, session_id, msg, modality, trace)
              return OrchestratorResponse(assistant_text=msg)
              
-        response_text = self._summarize_result(final_result)
-        save_assistant_message(db, user_id, session_id, response_text, modality, trace_id=trace.id)
+        # Lookups that fed the final step are reported ahead of its outcome
+        parts = [self._describe_result(r) for r in executed[:-1]]
+        parts.append(self._summarize_result(final_result))
+        response_text = "\n\n".join(p for p in parts if p)
+        await self._reply(db, user_id, session_id, response_text, modality, trace)
         
-        trace.update(output=response_text)
         # Helper to extract confirmation info
         pending_conf_data = None
         if final_result.status == "needs_confirmation":
@@ -159,13 +220,206 @@ class AgentOrchestrator:
                  "prompt": final_result.confirmation_prompt
              }
 
+        metadata = {"tool_result": final_result.model_dump()}
+        if len(plan.steps) > 1:
+            metadata["step_results"] = {step_id: r.model_dump() for step_id, r in step_results.items()}
+
         return OrchestratorResponse(
             assistant_text=response_text,
             should_speak=True,
-            metadata={"tool_result": final_result.model_dump()},
+            metadata=metadata,
             pending_confirmation=pending_conf_data
         )
 
+    async def _execute_plan(
+        self, db: Session, user_id: UUID, session_id: UUID, plan: Plan, trace, emit: PhaseCallback
+    ) -> Dict[str, ToolResult]:
+        """
+        Runs plan steps in dependency order. Each round, every step whose dependencies succeeded
+        is ready; read-only ready steps run concurrently (each on its own DB session), anything
+        with side effects runs alone in plan order. Dependents of a failed step are skipped;
+        steps that only run after it (advisory lookups) do not block anything.
+        """
+        from ..observability.langfuse_client import langfuse_client
+        
+        results: Dict[str, ToolResult] = {}
+        pending = list(plan.steps)
+        session_factory = self._parallel_session_factory(db)
+        
+        while pending:
+            ready = [s for s in pending if all(d in results for d in s.depends_on + s.runs_after)]
+            if not ready:
+                # Unknown or cyclic dependency; nothing else can run
+                logger.warning(f"Unrunnable plan steps: {[s.step_id for s in pending]}")
+                break
+                
+            blocked = [s for s in ready if any(results[d].status != "success" for d in s.depends_on)]
+            for step in blocked:
+                logger.info(f"Skipping step {step.step_id}: a dependency did not succeed")
+                pending.remove(step)
+            runnable = [s for s in ready if s not in blocked]
+            if not runnable:
+                continue
+                
+            concurrent = [s for s in runnable if self._is_read_only(s)]
+            if session_factory is None or len(concurrent) < 2:
+                concurrent = []
+            batch = concurrent or runnable[:1]
+            
+            for step in batch:
+                langfuse_client.observe(trace, "tool.execution_start", input={"tool": step.tool_name, "args": step.args})
+                
+            if concurrent:
+                # Step sessions use their own connections; release the turn's open
+                # transaction first so they never wait on its locks.
+                await asyncio.to_thread(checkpoint, db)
+                batch_results = await asyncio.gather(*[
+                    self._execute_step_isolated(session_factory, user_id, session_id, step, trace, emit)
+                    for step in batch
+                ])
+            else:
+                batch_results = [await self._execute_step(db, user_id, session_id, batch[0], trace, emit)]
+                
+            for step, result in zip(batch, batch_results):
+                results[step.step_id] = result
+                pending.remove(step)
+                langfuse_client.observe(trace, "tool.execution_result", output=result.model_dump())
+                emit("tool", {"tool": step.tool_name, "status": result.status})
+                
+        return results
+
+    async def _execute_step_isolated(
+        self, session_factory, user_id: UUID, session_id: UUID, step: PlanStep, trace, emit: PhaseCallback
+    ) -> ToolResult:
+        """
+        Executes a step on a private DB session so concurrent steps never share one.
+        """
+        step_db = session_factory()
+        try:
+            if not settings.AGENT_UNIT_OF_WORK:
+                return await self._execute_step(step_db, user_id, session_id, step, trace, emit)
+            async with aunit_of_work(step_db):
+                return await self._execute_step(step_db, user_id, session_id, step, trace, emit)
+        finally:
+            await asyncio.to_thread(step_db.close)
+
+    async def _execute_step(
+        self, db: Session, user_id: UUID, session_id: UUID, step: PlanStep, trace, emit: PhaseCallback
+    ) -> ToolResult:
+        return await self.tool_runtime.aexecute(
+            user_id=user_id,
+            session_id=session_id,
+            tool_name=step.tool_name,
+            args_dict=step.args,
+            db=db,
+            trace=trace,
+            on_phase=emit
+        )
+
+    def _parallel_session_factory(self, db: Session):
+        """
+        Concurrent steps need their own sessions on the same engine. If the request session is
+        bound to a single connection (e.g. a test transaction), steps run sequentially instead.
+        """
+        bind = db.get_bind()
+        if isinstance(bind, Engine):
+            return sessionmaker(autocommit=False, autoflush=False, bind=bind)
+        return None
+
+    def _is_read_only(self, step: PlanStep) -> bool:
+        tool_entry = get_tool(step.tool_name)
+        return bool(tool_entry) and not tool_entry[0].side_effects
+
+    async def _speculative_context_and_intent(
+        self, db: Session, user_id: UUID, session_id: UUID, utterance: str
+    ) -> Tuple[Dict[str, Any], Intent]:
+        """
+        Starts the intent LLM call on a history-only context while memories are retrieved,
+        saving one network round-trip. The speculative result is kept unless the retrieved
+        memories could change slot resolution, in which case intent is re-parsed with full context.
+        """
+        history = await asyncio.to_thread(get_history, db, user_id, session_id)
+        speculative_context = {"history": history, "memory_facts": []}
+        speculative_task = asyncio.create_task(
+            aparse_intent(
+                utterance,
+                context_str=serialize_context(speculative_context),
+                context_fingerprint=context_fingerprint(user_id, utterance, speculative_context)
+            )
+        )
+        
+        try:
+            memory_facts = await aget_memory_facts(db, user_id, utterance)
+        except Exception:
+            speculative_task.cancel()
+            raise
+            
+        context = {"history": history, "memory_facts": memory_facts}
+        intent = await speculative_task
+        
+        if self._memories_affect_intent(intent, memory_facts):
+            INTENT_SPECULATION_TOTAL.labels(outcome="reparsed").inc()
+            intent = await aparse_intent(
+                utterance,
+                context_str=serialize_context(context),
+                context_fingerprint=context_fingerprint(user_id, utterance, context)
+            )
+        else:
+            INTENT_SPECULATION_TOTAL.labels(outcome="accepted").inc()
+            
+        return context, intent
+
+    def _memories_affect_intent(self, intent: Intent, memory_facts: List[str]) -> bool:
+        """
+        True if memories could have resolved the intent differently: the speculative parse
+        was unresolved, or one of its slot values is mentioned by a retrieved memory
+        (e.g. location="home" with a memory "home: Pune").
+        """
+        if not memory_facts:
+            # Speculative context is identical to the full one
+            return False
+            
+        if intent.name == "unknown" or intent.needs_clarification:
+            return True
+            
+        memory_words = set(re.findall(r"\w+", " ".join(memory_facts).lower()))
+        for value in intent.slots.values():
+            if isinstance(value, str) and set(re.findall(r"\w+", value.lower())) & memory_words:
+                return True
+        return False
+
+    def _phase_emitter(self, on_phase: Optional[PhaseCallback]) -> PhaseCallback:
+        """
+        Wraps on_phase so it is safe to call from worker threads (tool runtime): the callback
+        always runs on the event loop.
+        """
+        if on_phase is None:
+            return lambda phase, data: None
+        loop = asyncio.get_running_loop()
+        return lambda phase, data: loop.call_soon_threadsafe(on_phase, phase, data)
+
+    def _find_pending_confirmation(self, db: Session, user_id: UUID, session_id: UUID):
+        return db.query(PendingConfirmationModel).filter(
+            PendingConfirmationModel.session_id == session_id,
+            PendingConfirmationModel.user_id == user_id,
+            PendingConfirmationModel.status == "pending"
+        ).first()
+
+    async def _reply(self, db: Session, user_id: UUID, session_id: UUID, text: str, modality: str, trace) -> None:
+        """
+        Persists the assistant message and closes the trace with it.
+        """
+        await asyncio.to_thread(save_assistant_message, db, user_id, session_id, text, modality, trace_id=trace.id)
+        trace.update(output=text)
+
+    def _describe_result(self, result) -> str:
+        """
+        Text of a successful lookup step (e.g. the weather report) for merged responses.
+        """
+        if result.status != "success" or not result.data:
+            return ""
+        return str(result.data.get("message") or result.data.get("result") or "")
+
     def _summarize_result(self, result) -> str:
         """
         Converts ToolResult into a voice-friendly string.
@@ -188,4 +442,7 @@ class AgentOrchestrator:
         elif result.status == "error":
             return f"Something went wrong. {result.error}"
             
+        elif result.status == "unknown":
+            return f"I'm not sure that went through. {result.error}"
+            
         return "Command completed."
@@ -1,7 +1,11 @@
-from typing import Dict, Any
+from datetime import date
+from typing import Any, Dict, List
 from .contracts import Intent, Plan, PlanStep
 from .intents_catalog import INTENTS
 
+# The weather tool forecasts today + 4 days
+FORECAST_DAYS = 5
+
 def build_plan(intent: Intent, context: Dict[str, Any]) -> Plan:
     """
     Constructs an execution plan based on the intent and catalog.
@@ -33,10 +37,66 @@ def build_plan(intent: Intent, context: Dict[str, Any]) -> Plan:
     # We pass the slots directly as args. 
     # The tool runtime validation will catch any issues/types.
     
+    prerequisites = _prerequisite_steps(intent)
+    
     step = PlanStep(
+        step_id=intent.name,
         tool_name=tool_name,
         args=intent.slots,
-        intent_summary=f"User wants to {catalog_entry.get('description', 'perform action')} with params: {intent.slots}"
+        intent_summary=f"User wants to {catalog_entry.get('description', 'perform action')} with params: {intent.slots}",
+        # Advisory lookups: run first, but a failed lookup must not block the action
+        runs_after=[p.step_id for p in prerequisites]
     )
     
-    return Plan(steps=[step])
+    return Plan(steps=prerequisites + [step])
+
+def _prerequisite_steps(intent: Intent) -> List[PlanStep]:
+    """
+    Read-only lookups that precede the main step. They have no dependencies on each
+    other, so the orchestrator runs them concurrently. They are advisory: the main step
+    runs after them whether or not they succeed.
+    
+    Offline calendar events: the agent must check the weather at the event's location and
+    time first (see the system prompt's tool-chaining rule), and we look for clashes on that day.
+    The weather check is left out when the event falls outside the forecast window.
+    """
+    slots = intent.slots
+    if intent.name != "create_calendar_event" or not slots.get("location") or slots.get("create_teams_meeting"):
+        return []
+    
+    weather_args: Dict[str, Any] = {"location": slots["location"]}
+    calendar_args: Dict[str, Any] = {"days": 1}
+    with_weather = True
+    
+    event_date = _parse_date(slots.get("start_time_str"))
+    if event_date:
+        days_ahead = (event_date - date.today()).days
+        with_weather = 0 <= days_ahead < FORECAST_DAYS
+        weather_args["num_days"] = days_ahead + 1
+        calendar_args["specific_date"] = event_date.isoformat()
+    
+    steps = []
+    if with_weather:
+        steps.append(PlanStep(
+            step_id="weather_check",
+            tool_name="get_weather_info",
+            args=weather_args,
+            intent_summary=f"Check weather at {slots['location']} before scheduling an offline event"
+        ))
+    steps.append(PlanStep(
+        step_id="calendar_check",
+        tool_name="get_calendar_events",
+        args=calendar_args,
+        intent_summary="Check for clashing events before scheduling"
+    ))
+    return steps
+
+def _parse_date(text: Any):
+    if not isinstance(text, str) or not text:
+        return None
+    try:
+        import dateparser  # type: ignore
+        parsed = dateparser.parse(text)
+        return parsed.date() if parsed else None
+    except Exception:
+        return None
@@ -3,8 +3,11 @@ Chat and history endpoints
 """
 
 import os
+import re
 import time
 import json
+import asyncio
+from typing import Any, Dict
 from fastapi import APIRouter, Request, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -12,7 +15,7 @@ from langchain_core.messages import SystemMessage
 
 from .. import models
 from ..database import get_db, SessionLocal
-from ..agent import create_agent_executor
+from ..agent.executor_pool import executor_pool
 from ..config import settings
 FAISS_INDEX_PATH = settings.FAISS_INDEX_PATH
 from ..utils.context import set_session_id
@@ -26,6 +29,23 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="", tags=["Chat"])
 
 
+def _phase_message(phase: str, data: Dict[str, Any]) -> str:
+    """
+    Human-readable status line for an orchestrator phase event.
+    """
+    if phase == "context":
+        return f"Recalled {data.get('memories', 0)} memories"
+    if phase == "intent":
+        return f"Understood: {data.get('intent')}"
+    if phase == "plan":
+        return "Planning " + ", ".join(data.get("tools", [])) if data.get("tools") else "Planning..."
+    if phase == "policy":
+        return f"Policy {data.get('decision')} for {data.get('tool')}"
+    if phase == "tool":
+        return f"Executed {data.get('tool')} ({data.get('status')})"
+    return phase
+
+
 @router.post("/history")
 async def get_history(
     request: Request,
@@ -108,36 +128,59 @@ async def chat_endpoint(
             # In orchestrated mode, the orchestrator handles peristence (User + AI)
             # We treat conversation_id as session_id
             
-            # Note: We run synchronous orchestrator in this async endpoint. 
-            # Ideally offload to threadpool but for now blocking is expected in Step 7.
+            # The orchestrator runs inside the generator and reports each phase as it
+            # finishes, so the client sees progress before the whole turn completes.
             orchestrator = AgentOrchestrator()
+            phases: asyncio.Queue = asyncio.Queue()
             
-            try:
-                response = orchestrator.handle_user_utterance(
-                    db=db,
-                    user_id=user_id,
-                    session_id=conversation_id,
-                    utterance=chat_request.message
-                )
-            except Exception as e:
-                logger.error(f"Orchestrator failed: {e}", exc_info=True)
-                # Fallback or error
-                error_data = json.dumps({"message": f"Agent error: {str(e)}", "code": "INTERNAL_ERROR"})
-                
-                async def error_gen():
-                    yield f"event: error\ndata: {error_data}\n\n"
-                
-                return StreamingResponse(error_gen(), media_type="text/event-stream")
+            async def run_orchestrator():
+                # The request session may be closed once streaming starts, use our own
+                stream_db = SessionLocal()
+                try:
+                    return await orchestrator.ahandle_user_utterance(
+                        db=stream_db,
+                        user_id=user_id,
+                        session_id=conversation_id,
+                        utterance=chat_request.message,
+                        on_phase=lambda phase, data: phases.put_nowait((phase, data))
+                    )
+                finally:
+                    stream_db.close()
+                    phases.put_nowait(None)
 
             # Convert to SSE
             async def orchestrated_generator():
                 # Status: Thinking
                 yield "event: status\ndata: {\"phase\": \"thinking\", \"message\": \"Thinking...\"}\n\n"
                 
+                task = asyncio.create_task(run_orchestrator())
+                tool_names = []
+                try:
+                    while (item := await phases.get()) is not None:
+                        phase, data = item
+                        if phase == "tool":
+                            tool_names.append(data["tool"])
+                        status_data = json.dumps({
+                            "phase": phase,
+                            "message": _phase_message(phase, data),
+                            **data
+                        })
+                        yield f"event: status\ndata: {status_data}\n\n"
+                    response = await task
+                except asyncio.CancelledError:
+                    # Client went away
+                    task.cancel()
+                    raise
+                except Exception as e:
+                    logger.error(f"Orchestrator failed: {e}", exc_info=True)
+                    error_data = json.dumps({"message": f"Agent error: {str(e)}", "code": "INTERNAL_ERROR"})
+                    yield f"event: error\ndata: {error_data}\n\n"
+                    return
+                
                 # If tool was used (metadata has tool_result)
                 if response.metadata and "tool_result" in response.metadata:
                      tool_res = response.metadata["tool_result"]
-                     tool_name = tool_res.get("tool_name", "unknown") if isinstance(tool_res, dict) else "tool"
+                     tool_name = tool_names[-1] if tool_names else "tool"
                      
                      yield f"event: status\ndata: {{\"phase\": \"using_tools\", \"message\": \"Executed {tool_name}\"}}\n\n"
                      
@@ -153,9 +196,14 @@ async def chat_endpoint(
                 # Status: Speaking/Responding
                 yield "event: status\ndata: {\"phase\": \"synthesizing\", \"message\": \"Responding...\"}\n\n"
                 
-                # Stream the text (single chunk for now)
-                token_data = json.dumps({"delta": response.assistant_text})
-                yield f"event: token\ndata: {token_data}\n\n"
+                # The reply comes from the orchestrator's deterministic summarizer, not an
+                # LLM, so it is complete at this point: it is split into word-sized token
+                # events (whitespace kept with each chunk) for clients that render deltas.
+                # Nothing arrives earlier than one event would; the phase events above are
+                # what shorten time to first byte.
+                for chunk in re.findall(r"\s*\S+\s*", response.assistant_text or ""):
+                    token_data = json.dumps({"delta": chunk})
+                    yield f"event: token\ndata: {token_data}\n\n"
                 
                 # Done
                 yield "event: done\ndata: {\"ok\": true}\n\n"
@@ -177,11 +225,9 @@ async def chat_endpoint(
         # Init Context Manager
         context_manager = ConversationContextManager(db, current_user, conversation_id)
         
-        # Re-create agent only if RAG status changes (simplified check)
-        rag_enabled = os.path.exists(FAISS_INDEX_PATH) and bool(
-            os.listdir(FAISS_INDEX_PATH) if os.path.exists(FAISS_INDEX_PATH) else []
-        )
-        agent_executor = create_agent_executor(rag_enabled=rag_enabled)
+        # Pooled per RAG status, rebuilt only when the tool set changes
+        rag_enabled = os.path.isdir(FAISS_INDEX_PATH) and bool(os.listdir(FAISS_INDEX_PATH))
+        agent_executor = executor_pool.get(rag_enabled=rag_enabled)
 
         # Get Optimized Context
         system_context_str, chat_history_messages = await context_manager.get_context()
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
@@ -6,8 +7,8 @@ from ..database import get_db
 from ..auth.dependencies import get_current_user
 from ..models import User, Memory
 from ..schemas.memory import MemoryCreate, MemoryRead, MemorySearch, MemoryUpdate
-from ..memory.write import write_memory, compute_content_hash
-from ..memory.retrieve import retrieve_memories
+from ..memory.write import awrite_memory, compute_content_hash
+from ..memory.retrieve import aretrieve_memories
 from ..memory.embeddings import embeddings
 from ..utils.redaction import redact_text
 
@@ -39,13 +40,14 @@ def list_memories(
     results = stmt.order_by(Memory.created_at.desc()).offset(offset).limit(limit).all()
     return results
 
+# create and search await the async embedding path; the sync DB work runs in threads
 @router.post("/", response_model=MemoryRead)
-def create_memory(
+async def create_memory(
     item: MemoryCreate,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    mem_id = write_memory(
+    mem_id = await awrite_memory(
         db=db,
         user_id=user.id,
         session_id=None, # User created context
@@ -55,15 +57,15 @@ def create_memory(
         metadata=item.metadata
     )
     
-    return db.query(Memory).filter(Memory.id == mem_id).first()
+    return await asyncio.to_thread(lambda: db.query(Memory).filter(Memory.id == mem_id).first())
 
 @router.post("/search", response_model=List[MemoryRead])
-def search_memories(
+async def search_memories(
     params: MemorySearch,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    results = retrieve_memories(
+    results = await aretrieve_memories(
         db=db,
         user_id=str(user.id),
         query_text=params.query,
@@ -100,11 +102,13 @@ def update_memory(
         
     if update.content:
         safe_content = redact_text(update.content)
-        mem.content = safe_content
-        mem.content_hash = compute_content_hash(safe_content)
-        # Re-embed
-        vectors = embeddings.embed_texts([safe_content])
-        mem.embedding = vectors[0]
+        content_hash = compute_content_hash(safe_content)
+        # Re-embed only when the content actually changed
+        if content_hash != mem.content_hash:
+            mem.content = safe_content
+            mem.content_hash = content_hash
+            vectors = embeddings.embed_texts([safe_content])
+            mem.embedding = vectors[0]
         
     if update.metadata:
         # Merge or replace? Prompt says "update content (re-embed), update metadata".
@@ -88,7 +88,7 @@ async def post_session_message(
     orchestrator = AgentOrchestrator()
     try:
         # handle_user_utterance now accepts idempotency_key
-        result = orchestrator.handle_user_utterance(
+        result = await orchestrator.ahandle_user_utterance(
             db=db,
             user_id=current_user.id,
             session_id=session_id,
@@ -64,9 +64,8 @@ async def voice_chat(
         session_id = conversation.id
         
         # Execute Intent
-        # We run this in thread pool to avoid blocking async event loop
-        response = await asyncio.to_thread(
-            orchestrator.handle_user_utterance,
+        # Async pipeline; blocking DB/tool work is offloaded inside the orchestrator
+        response = await orchestrator.ahandle_user_utterance(
             db=db,
             user_id=current_user.id,
             session_id=session_id, # Using conversation_id as session_id
@@ -75,9 +75,92 @@ class Settings(BaseSettings):
     
     # Memory Configuration
     MEMORY_BACKEND: str = "pgvector"  # options: "pgvector", "faiss"
+    # Vector search in retrieve_memories (see memory/retrieve.py):
+    # "hnsw" (ANN index), "exact" (per-user prefilter + exact scan), or "auto" (exact for
+    # users with at most MEMORY_EXACT_SCAN_MAX_ROWS live memories, HNSW otherwise).
+    # scripts/benchmarks/bench_memory_search.py, pgvector 0.6.2 (no iterative scan), one
+    # 20k-row user beside 20 x 2k and 200 x 50: HNSW recall@5 is 0.15-0.33 for 2k-row users
+    # (ef_search 40-256) at 13-37 ms p50, exact is 1.0 at 36 ms; the size check is ~2 ms.
+    # Hence "auto", with the size check cached per user (0 = check on every search).
+    MEMORY_SEARCH_STRATEGY: str = "auto"
+    MEMORY_EXACT_SCAN_MAX_ROWS: int = 2000
+    MEMORY_SEARCH_SIZE_CACHE_TTL_SECONDS: int = 300
+    # Per-query HNSW candidate list size (pgvector default 40)
+    MEMORY_HNSW_EF_SEARCH: int = 64
+    # pgvector >= 0.8 keeps scanning until enough rows pass the user/type filters:
+    # "off", "strict_order" or "relaxed_order"; max_scan_tuples 0 keeps the server default
+    MEMORY_HNSW_ITERATIVE_SCAN: str = "relaxed_order"
+    MEMORY_HNSW_MAX_SCAN_TUPLES: int = 0
+    # "local" (deterministic random vectors, tests), "hashed" (offline hashed n-gram
+    # features), "sentence" (CPU sentence model, see memory/local_model.py) or "openai"
+    EMBEDDINGS_PROVIDER: str = "local"
+    # "sentence" provider: Hugging Face repo and ONNX exports, loaded on first use
+    LOCAL_EMBEDDINGS_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    LOCAL_EMBEDDINGS_ONNX_FILE: str = "onnx/model.onnx"
+    LOCAL_EMBEDDINGS_INT8_FILE: str = "onnx/model_quint8_avx2.onnx"
+    LOCAL_EMBEDDINGS_INT8: bool = False
+    LOCAL_EMBEDDINGS_THREADS: int = 2
+    LOCAL_EMBEDDINGS_BATCH_SIZE: int = 32
+    LOCAL_EMBEDDINGS_MAX_LENGTH: int = 256
+    # Coalesce concurrent OpenAI embedding calls (see memory/embedding_batcher.py).
+    # The API caps a request at 2048 inputs and 300k tokens; tokens are estimated.
+    EMBEDDINGS_BATCHING: bool = True
+    EMBEDDINGS_BATCH_WAIT_MS: float = 5.0
+    EMBEDDINGS_BATCH_MAX_INPUTS: int = 256
+    EMBEDDINGS_BATCH_MAX_TOKENS: int = 100000
+    EMBEDDINGS_BATCH_MAX_CONCURRENCY: int = 4
+    # Connection pool of the async OpenAI client used by aembed_texts
+    EMBEDDINGS_HTTP_MAX_CONNECTIONS: int = 20
+    # Content-addressed embedding cache: in-process LRU entries (0 = no LRU, -1 = no
+    # cache at all) in front of the embedding_cache table (see memory/embedding_cache.py)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 4096
+    EMBEDDING_CACHE_PERSIST: bool = True
 
     # Agent Configuration
     AGENT_MODE: str = "orchestrated" # options: "orchestrated", "legacy"
+    # Start the intent LLM call on history-only context while memories are retrieved
+    INTENT_SPECULATIVE_PARSE: bool = False
+    # Rule-based classifier that resolves trivial read-only commands without the LLM
+    INTENT_FAST_PATH_ENABLED: bool = True
+    INTENT_FAST_PATH_THRESHOLD: float = 0.9
+    # Parsed-intent cache (normalized utterance + context fingerprint)
+    INTENT_CACHE_ENABLED: bool = True
+    INTENT_CACHE_TTL_SECONDS: int = 600
+    INTENT_CACHE_MAX_ENTRIES: int = 1024
+    INTENT_CACHE_SEMANTIC: bool = False  # also match on embedding similarity
+    INTENT_CACHE_SIMILARITY: float = 0.95
+    # Buffer a turn's writes and commit them in one transaction (see db/unit_of_work.py).
+    # Opt-in: saves a COMMIT per write, but holds the transaction open across the LLM and
+    # tool calls, and a failure late in the turn also rolls back the saved user message.
+    AGENT_UNIT_OF_WORK: bool = False
+    # Write-behind queue for tool_calls audit rows (see tools/audit.py)
+    TOOL_AUDIT_ASYNC: bool = False
+    TOOL_AUDIT_QUEUE_SIZE: int = 10000
+    TOOL_AUDIT_BATCH_SIZE: int = 200
+    TOOL_AUDIT_FLUSH_INTERVAL_MS: int = 500
+    TOOL_AUDIT_ENQUEUE_TIMEOUT_MS: int = 50
+    TOOL_AUDIT_LATE_SECONDS: float = 5.0
+    # Effective scopes per (user, session); 0 disables (see security/scope_cache.py)
+    SCOPE_CACHE_TTL_SECONDS: int = 30
+    SCOPE_CACHE_MAX_ENTRIES: int = 4096
+    # Rate limit / loop breaker backend: "memory", "redis" (shared across workers) or "db"
+    TOOL_GUARD_BACKEND: str = "memory"
+    TOOL_GUARD_REDIS_URL: str = "redis://localhost:6379/0"
+    # Tool execution: default deadline (ToolSpec.timeout_seconds overrides) and
+    # worker threads for blocking tools
+    TOOL_TIMEOUT_SECONDS: float = 30.0
+    TOOL_THREAD_POOL_SIZE: int = 16
+    # Per-tool circuit breaker (see tools/circuit_breaker.py)
+    TOOL_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    TOOL_CIRCUIT_RESET_SECONDS: float = 30.0
+    TOOL_CIRCUIT_HALF_OPEN_PROBES: int = 1
+    # Read-only tool results (ToolSpec.cache_ttl_seconds opts in); 0 disables
+    # (see tools/result_cache.py)
+    TOOL_RESULT_CACHE_MAX_ENTRIES: int = 1024
+    TOOL_RESULT_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Background expiry of confirmations and memories; 0 disables (see db/expiry_sweeper.py)
+    EXPIRY_SWEEP_INTERVAL_SECONDS: float = 60.0
+    EXPIRY_SWEEP_BATCH_SIZE: int = 500
     
     FAISS_INDEX_PATH: str = "faiss_index"
 
@@ -0,0 +1,177 @@
+"""
+Background sweeper for rows that expire by time.
+
+Expiry used to be applied lazily. resolve_confirmation marked a single confirmation expired
+when it was touched, and retrieve_memories filtered on expires_at in every query. Rows that
+were never touched again stayed "pending" or live forever and slowed the hot queries.
+
+Every EXPIRY_SWEEP_INTERVAL_SECONDS, a daemon thread:
+- bulk-updates pending or confirmed pending_confirmations past expires_at to "expired";
+- soft-deletes expired memories (is_deleted=True) and writes one EXPIRED MemoryEvent per
+  memory, EXPIRY_SWEEP_BATCH_SIZE rows per transaction;
+- sets CONFIRMATIONS_PENDING from a count of live pending confirmations. The count is
+  authoritative, so the gauge is right across several workers.
+
+Memory batches are claimed with SELECT ... FOR UPDATE SKIP LOCKED on Postgres, so two
+workers sweeping at once do not expire the same memory twice. The read paths keep their
+own expiry filters, which cover the time between sweeps.
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.memory import Memory, MemoryEvent
+from ..models.policy import PendingConfirmationModel
+from ..observability.metrics import CONFIRMATIONS_PENDING, EXPIRY_SWEEP_ROWS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+def expire_confirmations(db: Session, now: datetime) -> int:
+    """
+    Marks every pending or unused confirmed confirmation past its expiry as expired.
+    """
+    result = db.execute(
+        update(PendingConfirmationModel)
+        .where(
+            PendingConfirmationModel.status.in_(("pending", "confirmed")),
+            PendingConfirmationModel.expires_at <= now
+        )
+        .values(status="expired")
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+def count_pending_confirmations(db: Session, now: datetime) -> int:
+    return db.query(func.count(PendingConfirmationModel.id)).filter(
+        PendingConfirmationModel.status == "pending",
+        or_(PendingConfirmationModel.expires_at == None, PendingConfirmationModel.expires_at > now)
+    ).scalar() or 0
+
+
+def expire_memories(db: Session, now: datetime, batch_size: int = 500) -> int:
+    """
+    Soft-deletes expired memories in batches, with an EXPIRED event for each.
+    """
+    expired = 0
+    while True:
+        rows = db.query(Memory.id, Memory.user_id).filter(
+            Memory.is_deleted == False,
+            Memory.expires_at != None,
+            Memory.expires_at <= now
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+        if not rows:
+            break
+
+        db.execute(
+            update(Memory)
+            .where(Memory.id.in_([row.id for row in rows]))
+            .values(is_deleted=True, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(insert(MemoryEvent), [
+            {
+                "user_id": row.user_id,
+                "memory_id": row.id,
+                "event_type": "EXPIRED",
+                "actor": "system",
+                "reason": "ttl_sweep"
+            }
+            for row in rows
+        ])
+        db.commit()
+        expired += len(rows)
+
+        if len(rows) < batch_size:
+            break
+    return expired
+
+
+class ExpirySweeper:
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        interval: float = 60.0,
+        batch_size: int = 500
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        if self.running or self.interval <= 0:
+            return
+        if self.session_factory is None:
+            from ..database import SessionLocal
+            self.session_factory = SessionLocal
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="expiry-sweeper", daemon=True)
+        self._worker.start()
+        logger.info(f"Expiry sweeper started (every {self.interval}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._worker.join(timeout)
+        self._worker = None
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Runs one sweep. Returns the number of rows expired per kind.
+        """
+        if self.session_factory is None:
+            from ..database import SessionLocal
+            self.session_factory = SessionLocal
+
+        now = datetime.now(timezone.utc)
+        db = self.session_factory()
+        try:
+            counts = {
+                "confirmations": expire_confirmations(db, now),
+                "memories": expire_memories(db, now, self.batch_size)
+            }
+            CONFIRMATIONS_PENDING.set(count_pending_confirmations(db, now))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for kind, count in counts.items():
+            if count:
+                EXPIRY_SWEEP_ROWS_TOTAL.labels(kind=kind).inc(count)
+        return counts
+
+    def _run(self) -> None:
+        # Sweep once at startup, then on every interval until stopped
+        while True:
+            try:
+                counts = self.sweep()
+                if any(counts.values()):
+                    logger.info(f"Expiry sweep: {counts}")
+            except Exception as e:
+                logger.error(f"Expiry sweep failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+
+# Global instance (started by the app lifespan)
+expiry_sweeper = ExpirySweeper(
+    interval=settings.EXPIRY_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.EXPIRY_SWEEP_BATCH_SIZE
+)
@@ -0,0 +1,135 @@
+"""
+Unit of work for an orchestrator turn.
+
+Normally every persistence helper commits on its own (user message, policy decision,
+pending confirmation, tool call, memory events, assistant message), which costs a
+COMMIT plus often a refresh SELECT per write. Inside a unit of work those helpers call
+commit() below instead of db.commit(): the write stays in the open transaction and the
+whole turn is committed once when the unit of work ends.
+
+Autoflush is switched on for the duration so reads later in the turn (history, pending
+confirmations) still see the turn's own writes, in the same transaction.
+
+Best-effort writes go through best_effort(), which isolates them in a SAVEPOINT so a failed
+insert cannot poison the turn's transaction.
+
+Side-effecting tools call checkpoint() before they run, so the policy decision and any
+consumed confirmation are durable before an irreversible action happens.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy.orm import Session
+
+UOW_KEY = "unit_of_work"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return bool(db.info.get(UOW_KEY))
+
+
+def begin_unit_of_work(db: Session) -> bool:
+    """
+    Starts buffering commits on db. Returns False if a unit of work is already active
+    (the outer one owns the final commit).
+    """
+    if in_unit_of_work(db):
+        return False
+    db.info[UOW_KEY] = {"autoflush": db.autoflush}
+    db.autoflush = True
+    return True
+
+
+def end_unit_of_work(db: Session, success: bool = True) -> None:
+    """
+    Commits (or rolls back) everything buffered since begin_unit_of_work.
+    """
+    state = db.info.pop(UOW_KEY, None)
+    if state is None:
+        return
+    db.autoflush = state["autoflush"]
+    if success:
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    else:
+        db.rollback()
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    owner = begin_unit_of_work(db)
+    try:
+        yield db
+    except BaseException:
+        if owner:
+            end_unit_of_work(db, success=False)
+        raise
+    if owner:
+        end_unit_of_work(db)
+
+
+def commit(db: Session) -> None:
+    """
+    Commits now, or leaves the write in the enclosing unit of work's transaction.
+    """
+    if not in_unit_of_work(db):
+        db.commit()
+
+
+def refresh(db: Session, instance) -> None:
+    """
+    db.refresh outside a unit of work. Inside one the instance was never expired, so
+    reloading it would only cost a round-trip.
+    """
+    if not in_unit_of_work(db):
+        db.refresh(instance)
+
+
+@contextmanager
+def best_effort(db: Session) -> Iterator[Session]:
+    """
+    Scope for a write whose failure must not fail the turn (audit rows). Outside a unit of
+    work the write is committed, or rolled back on failure. Inside one it runs in a SAVEPOINT
+    that is flushed on exit, so a failure rolls back only the savepoint and leaves the
+    session usable for the rest of the turn. The error is re-raised for the caller to log.
+    """
+    if in_unit_of_work(db):
+        with db.begin_nested():
+            yield db
+        return
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def checkpoint(db: Session) -> None:
+    """
+    Durability point: commits the turn's writes so far, keeping the unit of work open.
+    No-op outside a unit of work, where every write was already committed.
+    """
+    if in_unit_of_work(db):
+        db.commit()
+
+
+@asynccontextmanager
+async def aunit_of_work(db: Session) -> AsyncIterator[Session]:
+    """
+    unit_of_work for async callers: the final commit/rollback runs in a worker thread.
+    """
+    owner = begin_unit_of_work(db)
+    try:
+        yield db
+    except BaseException:
+        if owner:
+            await asyncio.to_thread(end_unit_of_work, db, False)
+        raise
+    if owner:
+        await asyncio.to_thread(end_unit_of_work, db)
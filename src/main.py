@@ -6,6 +6,7 @@ import os
 # Fix OpenMP runtime conflict on macOS
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 
+import threading  # noqa: E402
 from contextlib import asynccontextmanager  # noqa: E402
 
 from fastapi import FastAPI, Request  # noqa: E402
@@ -14,7 +15,7 @@ from fastapi.staticfiles import StaticFiles  # noqa: E402
 
 # Local Imports
 from .database import init_db  # noqa: E402
-from .tools.config import async_client  # noqa: E402
+from .tools.config import aclose_async_client  # noqa: E402
 from .config import settings  # noqa: E402
 from .utils.logging import get_logger  # noqa: E402
 from .utils.security import setup_cors, setup_rate_limiting  # noqa: E402
@@ -47,24 +48,47 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up Project VICTUS AI Assistant...")
     init_db()
     
-    # Initialize global HTTP client
-    # async_client is strictly for internal tool use if needed, usually init lazily
+    # Tool HTTP clients are created lazily, one per event loop (see tools.config)
     
     # Initialize Agent Executor
-    from .agent import create_agent_executor
+    from .agent.executor_pool import executor_pool
     try:
         # RAG is enabled by default for now, or check settings
-        app.state.agent_executor = create_agent_executor(rag_enabled=True)
+        # Built through the pool so /chat reuses it instead of building its own
+        app.state.agent_executor = executor_pool.get(rag_enabled=True)
         logger.info("Agent executor initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize agent executor: {e}")
         app.state.agent_executor = None
     
+    # Precompute static policy decisions for the registered tools
+    from .policy.engine import policy_table
+    logger.info(f"Policy decision table warmed with {policy_table.warm()} entries")
+    
+    # Write-behind audit sink for tool calls
+    from .tools.audit import audit_sink
+    if settings.TOOL_AUDIT_ASYNC:
+        audit_sink.start()
+    
+    # Expire stale confirmations and memories in the background
+    from .db.expiry_sweeper import expiry_sweeper
+    expiry_sweeper.start()
+    
+    # Load a local embedding model off the request path, so the first query is not slow
+    from .memory.embeddings import embeddings
+    provider = getattr(embeddings, "provider", embeddings)
+    if hasattr(provider, "warm"):
+        threading.Thread(target=provider.warm, name="embeddings-warm", daemon=True).start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down...")
-    await async_client.aclose()
+    expiry_sweeper.stop()
+    # Flush queued tool audit rows before exit
+    audit_sink.stop()
+    await aclose_async_client()
+    await embeddings.aclose()
 
 # FastAPI App Definition
 app = FastAPI(
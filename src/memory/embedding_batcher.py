@@ -0,0 +1,274 @@
+"""
+Request coalescing for embedding API calls.
+
+write_memory, retrieve_memories and update_memory each embed one text, so every caller
+used to pay for its own round trip to the embeddings API. EmbeddingBatcher puts those
+texts on a queue. A dispatcher thread waits up to max_wait for more texts to arrive, then
+hands them to a sender thread that makes one call and gives each caller its own vectors back.
+
+Up to max_concurrency batches are in flight at once. When every sender is busy the
+dispatcher waits for one to free up, and texts arriving meanwhile join the next batch.
+
+A batch closes when it reaches max_batch_size inputs or max_batch_tokens estimated tokens,
+whichever comes first. Large caller requests are spread over several batches and
+reassembled in order. When the API rejects a batch as too large (HTTP 413, or a 400
+whose message says an input or token limit was exceeded), the batch is split in half and
+each half is retried. Only a single text that is still rejected fails, and only its caller
+sees the error. Any other error, including other 400s, fails the whole batch at once.
+
+Token counts are estimated from the text length (about 4 characters per token) and not
+computed with a tokenizer. The estimate only decides where batches close. The hard limits
+are enforced by the API and handled by the split-and-retry.
+"""
+
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, List, Optional, Tuple
+
+from ..config import settings
+from ..observability.metrics import EMBEDDING_BATCH_INPUTS, EMBEDDING_BATCH_SPLITS_TOTAL
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rough tokens-per-character for English text with cl100k-style tokenizers
+CHARS_PER_TOKEN = 4
+# A 400 is only a size rejection when its message says so; other 400s (unknown model,
+# malformed input) would fail the same way on every half
+LIMIT_EXCEEDED_PATTERN = re.compile(
+    r"context_length_exceeded|maximum context length|too many (?:tokens|inputs)|too (?:long|large)|"
+    r"max(?:imum)? (?:of )?\d+ (?:tokens|inputs)|tokens per request|exceed",
+    re.IGNORECASE
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_oversized(error: Exception) -> bool:
+    status_code = getattr(error, "status_code", None)
+    if status_code == 413:
+        return True
+    if status_code != 400:
+        return False
+    # openai.BadRequestError carries the API's error object in .body
+    body = getattr(error, "body", None)
+    return bool(LIMIT_EXCEEDED_PATTERN.search(f"{error} {body or ''}"))
+
+
+def split_batches(texts: List[str], max_batch_size: int, max_batch_tokens: int) -> List[List[str]]:
+    """
+    Consecutive chunks of texts within the batch limits (one text per chunk at least).
+    """
+    batches: List[List[str]] = []
+    tokens = 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if batches and len(batches[-1]) < max_batch_size and tokens + cost <= max_batch_tokens:
+            batches[-1].append(text)
+            tokens += cost
+        else:
+            batches.append([text])
+            tokens = cost
+    return batches
+
+
+class _Request:
+    """
+    One embed() call waiting for its vectors.
+    """
+    __slots__ = ("vectors", "remaining", "error", "done", "_lock")
+
+    def __init__(self, size: int):
+        self.vectors: List[Optional[List[float]]] = [None] * size
+        self.remaining = size
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+        # Batches of one request can be resolved by different sender threads
+        self._lock = threading.Lock()
+
+    def resolve(self, index: int, vector: List[float]) -> None:
+        with self._lock:
+            self.vectors[index] = vector
+            self.remaining -= 1
+            finished = self.remaining == 0
+        if finished:
+            self.done.set()
+
+    def fail(self, error: Exception) -> None:
+        with self._lock:
+            if self.error is None:
+                self.error = error
+        self.done.set()
+
+
+# (request, index in the request, text, estimated tokens)
+_Item = Tuple[_Request, int, str, int]
+
+
+class EmbeddingBatcher:
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 256,
+        max_batch_tokens: int = 100000,
+        max_wait: float = 0.005,
+        timeout: float = 120.0,
+        max_concurrency: int = 4
+    ):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._queue: "queue.Queue[Optional[List[_Item]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._senders: Optional[ThreadPoolExecutor] = None
+        # One slot per batch in flight
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._senders = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embedding-send")
+            self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stops the dispatcher after it has sent everything already queued.
+        """
+        with self._lock:
+            if not self.running:
+                return
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+            # Let batches already in flight finish
+            self._senders.shutdown(wait=True)
+            self._senders = None
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds texts through the shared batch. Blocks until this call's vectors are back.
+        """
+        if not texts:
+            return []
+        if not self.running:
+            # Started on first use so import-time construction never spawns a thread
+            self.start()
+
+        request = _Request(len(texts))
+        self._queue.put([(request, i, text, estimate_tokens(text)) for i, text in enumerate(texts)])
+        if not request.done.wait(self.timeout):
+            raise TimeoutError(f"Embedding request timed out after {self.timeout}s")
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _run(self) -> None:
+        pending: Deque[_Item] = deque()
+        stopping = False
+        while True:
+            if not pending:
+                if stopping:
+                    return
+                items = self._queue.get()
+                if items is None:
+                    return
+                pending.extend(items)
+
+            # Wait for a free sender; texts queued meanwhile are collected below
+            self._slots.acquire()
+            
+            # Collect more texts until the batch is full or the wait window closes,
+            # then take whatever is already queued
+            deadline = time.monotonic() + self.max_wait
+            while not stopping and not self._is_full(pending):
+                remaining = deadline - time.monotonic()
+                try:
+                    items = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if items is None:
+                    stopping = True
+                else:
+                    pending.extend(items)
+
+            self._senders.submit(self._send_in_slot, self._take_batch(pending))
+
+    def _is_full(self, pending: Deque[_Item]) -> bool:
+        if len(pending) >= self.max_batch_size:
+            return True
+        return sum(item[3] for item in pending) >= self.max_batch_tokens
+
+    def _take_batch(self, pending: Deque[_Item]) -> List[_Item]:
+        # Always take at least one text, even one estimated over the token budget
+        batch = [pending.popleft()]
+        tokens = batch[0][3]
+        while pending and len(batch) < self.max_batch_size and tokens + pending[0][3] <= self.max_batch_tokens:
+            item = pending.popleft()
+            tokens += item[3]
+            batch.append(item)
+        return batch
+
+    def _send_in_slot(self, batch: List[_Item]) -> None:
+        try:
+            self._send(batch)
+        except Exception as e:
+            # Never leave a caller waiting for its timeout
+            for request, _, _, _ in batch:
+                request.fail(e)
+        finally:
+            self._slots.release()
+
+    def _send(self, batch: List[_Item]) -> None:
+        live = [item for item in batch if item[0].error is None]
+        if not live:
+            return
+        try:
+            EMBEDDING_BATCH_INPUTS.observe(len(live))
+            vectors = self.embed_fn([text for _, _, text, _ in live])
+        except Exception as e:
+            if len(live) > 1 and is_oversized(e):
+                EMBEDDING_BATCH_SPLITS_TOTAL.inc()
+                middle = len(live) // 2
+                logger.warning(f"Embedding batch of {len(live)} rejected as too large, splitting: {e}")
+                self._send(live[:middle])
+                self._send(live[middle:])
+                return
+            logger.error(f"Embedding batch of {len(live)} failed: {e}")
+            for request, _, _, _ in live:
+                request.fail(e)
+            return
+
+        if len(vectors) != len(live):
+            error = ValueError(f"Embeddings API returned {len(vectors)} vectors for {len(live)} inputs")
+            for request, _, _, _ in live:
+                request.fail(error)
+            return
+
+        for (request, index, _, _), vector in zip(live, vectors):
+            request.resolve(index, vector)
+
+
+def create_batcher(embed_fn: Callable[[List[str]], List[List[float]]]) -> EmbeddingBatcher:
+    return EmbeddingBatcher(
+        embed_fn,
+        max_batch_size=settings.EMBEDDINGS_BATCH_MAX_INPUTS,
+        max_batch_tokens=settings.EMBEDDINGS_BATCH_MAX_TOKENS,
+        max_wait=settings.EMBEDDINGS_BATCH_WAIT_MS / 1000,
+        max_concurrency=settings.EMBEDDINGS_BATCH_MAX_CONCURRENCY
+    )
@@ -0,0 +1,240 @@
+"""
+Content-addressed embedding cache.
+
+The same texts get embedded again and again:
+- recall keys in _recall_fact;
+- repeated queries in get_context;
+- update_memory and write_memory for content that was embedded before.
+
+Embeddings are a pure function of (model, dimension, text), so the cache is keyed on
+(model, dim, content_hash). content_hash is the same SHA-256 that write_memory stores on
+Memory.content_hash. CachedEmbeddings runs redact_text before hashing, because not every
+caller redacts first (the semantic intent cache passes raw utterances). So only hashes of
+redacted text are kept. The providers redact before embedding too, so the vector for the
+redacted text is the same one the provider would return for the raw text.
+
+There are two tiers:
+- An in-process LRU of packed float32 arrays (about 6 KB per 1536-dim vector), bounded by
+  EMBEDDING_CACHE_MAX_ENTRIES.
+- The embedding_cache table, shared by all workers and kept across restarts. Lookups are
+  one indexed IN query per embed call. Misses are inserted with ON CONFLICT DO NOTHING in
+  a short session of their own, outside the caller's transaction.
+
+In-process providers (the local sentence model) use the LRU only: for them a DB round
+trip costs about as much as computing the vector again.
+
+Only texts missing from both tiers go to the provider. A persistent-tier failure is
+logged and treated as a miss: the cache never makes an embed call fail.
+
+Rows are not evicted. Changing the model or dimension changes the key, so old rows are
+never read again and can be dropped by model.
+"""
+
+import asyncio
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..observability.metrics import EMBEDDING_CACHE_TOTAL
+from ..utils.logging import get_logger
+from ..utils.redaction import redact_text
+from .embeddings import EmbeddingsProvider
+
+logger = get_logger(__name__)
+
+# (model, dim, content_hash)
+CacheKey = Tuple[str, int, str]
+
+
+def content_hash(text: str) -> str:
+    # Same digest as write.compute_content_hash
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        persist: bool = True,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.max_entries = max_entries
+        self.persist = persist
+        self.session_factory = session_factory
+        self._entries: "OrderedDict[CacheKey, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, model: str, dim: int, hashes: List[str]) -> Dict[str, List[float]]:
+        """
+        Cached vectors for the given content hashes. Missing hashes are left out.
+        """
+        found: Dict[str, List[float]] = {}
+        if self.max_entries > 0:
+            with self._lock:
+                for h in hashes:
+                    key = (model, dim, h)
+                    packed = self._entries.get(key)
+                    if packed is not None:
+                        self._entries.move_to_end(key)
+                        found[h] = packed.tolist()
+        if found:
+            EMBEDDING_CACHE_TOTAL.labels(tier="memory", result="hit").inc(len(found))
+
+        missing = [h for h in hashes if h not in found]
+        if missing and self.persist:
+            stored = self._load(model, dim, missing)
+            if stored:
+                EMBEDDING_CACHE_TOTAL.labels(tier="db", result="hit").inc(len(stored))
+                self._remember(model, dim, stored)
+                for h, data in stored.items():
+                    found[h] = unpack_vector(data)
+
+        misses = len(set(hashes) - found.keys())
+        if misses:
+            EMBEDDING_CACHE_TOTAL.labels(tier="all", result="miss").inc(misses)
+        return found
+
+    def put_many(self, model: str, dim: int, vectors: Dict[str, List[float]]) -> None:
+        if not vectors:
+            return
+        packed = {h: pack_vector(v) for h, v in vectors.items()}
+        self._remember(model, dim, packed)
+        if self.persist:
+            self._store(model, dim, packed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, model: str, dim: int, packed: Dict[str, bytes]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for h, data in packed.items():
+                vector = array("f")
+                vector.frombytes(data)
+                self._entries[(model, dim, h)] = vector
+                self._entries.move_to_end((model, dim, h))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from ..database import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _load(self, model: str, dim: int, hashes: List[str]) -> Dict[str, bytes]:
+        from ..models.embedding_cache import EmbeddingCacheEntry
+        try:
+            db = self._session()
+            try:
+                rows = db.query(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.vector).filter(
+                    EmbeddingCacheEntry.model == model,
+                    EmbeddingCacheEntry.dim == dim,
+                    EmbeddingCacheEntry.content_hash.in_(hashes)
+                ).all()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed, treating as miss: {e}")
+            return {}
+        return {row.content_hash: bytes(row.vector) for row in rows}
+
+    def _store(self, model: str, dim: int, packed: Dict[str, bytes]) -> None:
+        from ..models.embedding_cache import EmbeddingCacheEntry
+        rows = [
+            {"model": model, "dim": dim, "content_hash": h, "vector": data}
+            for h, data in packed.items()
+        ]
+        try:
+            db = self._session()
+            try:
+                if db.bind.dialect.name == "postgresql":
+                    from sqlalchemy.dialects.postgresql import insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert
+                db.execute(insert(EmbeddingCacheEntry).on_conflict_do_nothing(), rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed for {len(rows)} vectors: {e}")
+
+
+class CachedEmbeddings(EmbeddingsProvider):
+    """
+    Provider wrapper that serves repeated texts from an EmbeddingCache.
+    """
+    def __init__(self, provider: EmbeddingsProvider, cache: EmbeddingCache):
+        self.provider = provider
+        self.cache = cache
+        self.model = provider.model
+        self.dim = provider.dim
+
+    def _missing(self, hashes: List[str], texts: List[str], found: Dict[str, List[float]]) -> Dict[str, str]:
+        # Each distinct missing text is embedded once
+        missing: Dict[str, str] = {}
+        for h, text in zip(hashes, texts):
+            if h not in found and h not in missing:
+                missing[h] = text
+        return missing
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        texts = [redact_text(t) for t in texts]
+        hashes = [content_hash(t) for t in texts]
+        found = self.cache.get_many(self.model, self.dim, list(dict.fromkeys(hashes)))
+
+        missing = self._missing(hashes, texts, found)
+        if missing:
+            vectors = self.provider.embed_texts(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model, self.dim, fresh)
+            found.update(fresh)
+
+        return [found[h] for h in hashes]
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        texts = [redact_text(t) for t in texts]
+        hashes = [content_hash(t) for t in texts]
+        # The persistent tier is sync SQLAlchemy; keep it off the event loop
+        if self.cache.persist:
+            found = await asyncio.to_thread(self.cache.get_many, self.model, self.dim, list(dict.fromkeys(hashes)))
+        else:
+            found = self.cache.get_many(self.model, self.dim, list(dict.fromkeys(hashes)))
+
+        missing = self._missing(hashes, texts, found)
+        if missing:
+            vectors = await self.provider.aembed_texts(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            if self.cache.persist:
+                await asyncio.to_thread(self.cache.put_many, self.model, self.dim, fresh)
+            else:
+                self.cache.put_many(self.model, self.dim, fresh)
+            found.update(fresh)
+
+        return [found[h] for h in hashes]
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
@@ -1,66 +1,246 @@
-from typing import List
-import os
+import asyncio
+import hashlib
+import re
+import threading
+import weakref
+import zlib
+from typing import Any, List
+
+import numpy as np
+
 from ..config import settings
 from ..utils.logging import get_logger
 from ..utils.redaction import redact_text
 
 logger = get_logger(__name__)
 
+WORD_PATTERN = re.compile(r"\w+")
+
 class EmbeddingsProvider:
+    # Cache key parts (see embedding_cache.py); cacheable is False when embedding is
+    # cheaper than a cache lookup
+    model: str = "unknown"
+    dim: int = 1536
+    cacheable: bool = False
+
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         raise NotImplementedError
 
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async variant for the event loop. Providers without a native async path run
+        embed_texts in a worker thread.
+        """
+        return await asyncio.to_thread(self.embed_texts, texts)
+
+    async def aclose(self) -> None:
+        """
+        Releases the running loop's async resources, if the provider holds any.
+        """
+
+def stable_hash(text: str) -> int:
+    """
+    64-bit hash of text that is the same in every process (unlike hash(), which
+    PYTHONHASHSEED randomizes).
+    """
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    matrix /= norms
+    return matrix
+
 class LocalEmbeddings(EmbeddingsProvider):
     """
     Deterministic fake embeddings for testing/dev.
+    Each text seeds its own generator with a stable hash, so a text gets the same unit
+    vector in every process. Vectors carry no meaning: only identical texts are similar.
     """
+    model = "local-fake"
+
     def __init__(self, dim: int = 1536):
         self.dim = dim
 
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Float32 matrix of shape (len(texts), dim) with unit rows.
+        """
+        matrix = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = np.random.default_rng(stable_hash(text)).random(self.dim, dtype=np.float32)
+        # uniform(-1, 1), then one vectorized normalization for the whole batch
+        matrix *= 2
+        matrix -= 1
+        return normalize_rows(matrix)
+
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        # Deterministic pseudo-random based on text length/content
-        import random
-        results = []
-        for text in texts:
-            # Seed with hash of text to be deterministic
-            random.seed(hash(text))
-            # Generate normalized vector
-            vec = [random.uniform(-1, 1) for _ in range(self.dim)]
-            norm = sum(x*x for x in vec) ** 0.5
-            vec = [x/norm for x in vec]
-            results.append(vec)
-        return results
+        return self.embed_matrix(texts).tolist()
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        # Sub-millisecond per text: a thread hop would cost more than it saves
+        return self.embed_texts(texts)
+
+class HashedNgramEmbeddings(LocalEmbeddings):
+    """
+    Offline embeddings from hashed features (the "hashing trick"), no model or network.
+    Features are lowercased word unigrams and character trigrams of each word. Each
+    feature adds +1 or -1 to one of dim buckets chosen by a stable hash, with sublinear
+    (sqrt) term weighting. Texts that share words or word pieces get high cosine
+    similarity, so retrieval works well enough for local dev and offline use.
+    """
+    model = "hashed-ngram-v1"
+
+    def __init__(self, dim: int = 1536, ngram: int = 3):
+        super().__init__(dim)
+        self.ngram = ngram
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        for word in WORD_PATTERN.findall(text.lower()):
+            features.append(word)
+            padded = f"<{word}>"
+            if len(padded) > self.ngram:
+                features.extend(
+                    "#" + padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)
+                )
+        return features
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        rows, buckets = [], []
+        for i, text in enumerate(texts):
+            hashes = [zlib.crc32(f.encode("utf-8")) for f in self._features(text)]
+            rows.extend([i] * len(hashes))
+            buckets.extend(hashes)
+
+        hashes = np.asarray(buckets, dtype=np.uint32)
+        counts = np.zeros((len(texts), self.dim), dtype=np.float32)
+        # Low bits pick the bucket, the top bit the sign
+        signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.intp), hashes % self.dim), signs)
+        matrix = np.sign(counts) * np.sqrt(np.abs(counts))
+
+        # Texts without any word characters fall back to the per-text random vector
+        empty = ~matrix.any(axis=1)
+        if empty.any():
+            matrix[empty] = super().embed_matrix([t for t, e in zip(texts, empty) if e])
+        return normalize_rows(matrix)
 
 class OpenAIEmbeddingsProvider(EmbeddingsProvider):
     """
     OpenAI Embeddings using text-embedding-3-small (default).
     """
+    cacheable = True
+
     def __init__(self, dim: int = 1536):
         from openai import OpenAI
+        from .embedding_batcher import create_batcher
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # One async client per event loop: pooled connections belong to the loop
+        # that opened them (same pattern as tools.config.get_async_client)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
         self.model = "text-embedding-3-small"
         self.dim = dim # 3-small supports dimensions, or we use default 1536
+        # Concurrent callers share API calls (see embedding_batcher.py)
+        self.batcher = create_batcher(self._embed_batch) if settings.EMBEDDINGS_BATCHING else None
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         # Redact before sending to OpenAI
         safe_texts = [redact_text(t) for t in texts]
-        
-        # Batching could be added here if needed
+        if self.batcher is not None:
+            return self.batcher.embed(safe_texts)
+        return self._embed_batch(safe_texts)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         data = self.client.embeddings.create(
-            input=safe_texts, 
+            input=texts, 
             model=self.model,
             dimensions=self.dim
         ).data
-        return [d.embedding for d in data]
+        # Results carry their input index; do not rely on response order
+        return [d.embedding for d in sorted(data, key=lambda d: d.index)]
+
+    @property
+    def async_client(self):
+        # The running loop's client, created on first use; keeps a pool of
+        # keep-alive connections shared by all async callers on that loop
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+                client = AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+                        max_connections=settings.EMBEDDINGS_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.EMBEDDINGS_HTTP_MAX_CONNECTIONS
+                    ))
+                )
+                self._async_clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        from .embedding_batcher import split_batches
+        safe_texts = [redact_text(t) for t in texts]
+        if not safe_texts:
+            return []
+        batches = split_batches(
+            safe_texts, settings.EMBEDDINGS_BATCH_MAX_INPUTS, settings.EMBEDDINGS_BATCH_MAX_TOKENS
+        )
+        results = await asyncio.gather(*(self._aembed_batch(batch) for batch in batches))
+        return [vector for batch in results for vector in batch]
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        from .embedding_batcher import is_oversized
+        try:
+            response = await self.async_client.embeddings.create(
+                input=texts,
+                model=self.model,
+                dimensions=self.dim
+            )
+        except Exception as e:
+            if len(texts) > 1 and is_oversized(e):
+                # Same split-and-retry as the sync batcher
+                middle = len(texts) // 2
+                first, second = await asyncio.gather(
+                    self._aembed_batch(texts[:middle]), self._aembed_batch(texts[middle:])
+                )
+                return first + second
+            raise
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+def with_cache(provider: EmbeddingsProvider, persist: bool = True) -> EmbeddingsProvider:
+    if not provider.cacheable or settings.EMBEDDING_CACHE_MAX_ENTRIES < 0:
+        return provider
+    from .embedding_cache import CachedEmbeddings, EmbeddingCache
+    cache = EmbeddingCache(
+        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        persist=persist and settings.EMBEDDING_CACHE_PERSIST
+    )
+    return CachedEmbeddings(provider, cache)
 
 def get_embeddings_provider() -> EmbeddingsProvider:
-    provider_type = getattr(settings, "EMBEDDINGS_PROVIDER", "local")
+    provider_type = settings.EMBEDDINGS_PROVIDER
     
     if provider_type == "openai":
         if not settings.OPENAI_API_KEY:
              logger.warning("OpenAI API Key missing, falling back to local embeddings.")
              return LocalEmbeddings()
-        return OpenAIEmbeddingsProvider()
+        return with_cache(OpenAIEmbeddingsProvider())
+    elif provider_type == "hashed":
+        return HashedNgramEmbeddings()
+    elif provider_type == "sentence":
+        from .local_model import create_sentence_embeddings
+        # In-process model: recomputing is cheaper than a DB round trip, so LRU only
+        return with_cache(create_sentence_embeddings(), persist=False)
     else:
         return LocalEmbeddings()
 
@@ -0,0 +1,190 @@
+"""
+Sentence embeddings from a small transformer run on CPU (EMBEDDINGS_PROVIDER="sentence").
+
+The "openai" provider costs a network round trip on every retrieve_memories call in the
+orchestrator's hot path. The "local" provider returns random vectors with no meaning.
+This provider runs a small sentence-embedding model (all-MiniLM-L6-v2 by default, 384
+dims) in-process with ONNX Runtime and the Hugging Face tokenizer, so torch is not
+needed. onnxruntime, tokenizers and huggingface_hub come with the "sentence" extra
+(poetry install --extras sentence).
+
+- Lazy: the model and tokenizer are fetched (huggingface_hub cache) and loaded on the
+  first embed call, or by warm(), which the app lifespan runs in the background.
+- Batching: texts are sorted by length and encoded LOCAL_EMBEDDINGS_BATCH_SIZE at a time,
+  so padding stays short. Output is mean-pooled over the attention mask, as
+  sentence-transformers does, then L2-normalized.
+- int8: LOCAL_EMBEDDINGS_INT8 loads the dynamically quantized export of the same model,
+  which is about 4x smaller and usually about 2x faster on AVX2/VNNI CPUs.
+- Threads: LOCAL_EMBEDDINGS_THREADS caps ONNX Runtime's intra-op pool, so inference does
+  not compete with the request workers for every core.
+- Dimension: vectors are zero-padded to EMBED_DIM. That preserves cosine similarity
+  exactly. Models wider than EMBED_DIM go through a fixed, seeded Gaussian projection
+  instead, which preserves it approximately.
+
+Vectors from different providers are not comparable. Switching a database that already
+holds OpenAI embeddings to this provider needs a re-embed of the stored memories.
+"""
+
+import importlib.util
+import threading
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from ..config import settings
+from ..models.memory import EMBED_DIM
+from ..utils.logging import get_logger
+from .embeddings import EmbeddingsProvider, normalize_rows
+
+logger = get_logger(__name__)
+
+# Seed of the projection matrix; changing it changes every stored vector
+PROJECTION_SEED = 1536
+
+# Import names of the "sentence" extra
+REQUIRED_MODULES = ("onnxruntime", "tokenizers", "huggingface_hub")
+
+
+@lru_cache(maxsize=4)
+def _projection(native: int, dim: int) -> np.ndarray:
+    rng = np.random.default_rng(PROJECTION_SEED)
+    return rng.standard_normal((native, dim), dtype=np.float32) / np.sqrt(dim)
+
+
+def fit_dimension(matrix: np.ndarray, dim: int) -> np.ndarray:
+    """
+    Pads (exact) or projects (approximate) unit rows to dim columns, keeping them unit.
+    """
+    native = matrix.shape[1]
+    if native == dim:
+        return matrix
+    if native < dim:
+        padded = np.zeros((matrix.shape[0], dim), dtype=np.float32)
+        padded[:, :native] = matrix
+        return padded
+    return normalize_rows(matrix @ _projection(native, dim))
+
+
+class SentenceEmbeddings(EmbeddingsProvider):
+    # Inference takes a few ms per text; the in-process LRU is cheaper still
+    cacheable = True
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        onnx_file: str = "onnx/model.onnx",
+        int8_file: str = "onnx/model_quint8_avx2.onnx",
+        use_int8: bool = False,
+        threads: int = 2,
+        batch_size: int = 32,
+        max_length: int = 256,
+        dim: int = EMBED_DIM
+    ):
+        self.model_name = model_name
+        self.onnx_file = int8_file if use_int8 else onnx_file
+        self.threads = threads
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.dim = dim
+        # Cache key: the same text embeds differently per export and quantization
+        self.model = f"{model_name}:{self.onnx_file}"
+        self._session = None
+        self._tokenizer = None
+        self._input_names: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._session is not None
+
+    def warm(self) -> None:
+        """
+        Loads the model now instead of on the first embed call.
+        """
+        try:
+            self._load()
+        except Exception as e:
+            # The first embed call retries the load and surfaces the error
+            logger.error(f"Failed to load local embedding model {self.model}: {e}")
+
+    def _load(self) -> None:
+        if self._session is not None:
+            return
+        with self._lock:
+            if self._session is not None:
+                return
+            import onnxruntime as ort
+            from huggingface_hub import hf_hub_download
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_file(hf_hub_download(self.model_name, "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=self.max_length)
+            tokenizer.enable_padding()
+
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.threads
+            options.inter_op_num_threads = 1
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = ort.InferenceSession(
+                hf_hub_download(self.model_name, self.onnx_file),
+                sess_options=options,
+                providers=["CPUExecutionProvider"]
+            )
+
+            self._input_names = [i.name for i in session.get_inputs()]
+            self._tokenizer = tokenizer
+            self._session = session
+            logger.info(f"Loaded local embedding model {self.model} ({self.threads} threads)")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        hidden = self._session.run(None, feeds)[0]
+        # Mean pooling over real tokens only
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return normalize_rows(pooled.astype(np.float32))
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        self._load()
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        # Similar lengths in one batch keep padding (and wasted compute) small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        pooled: Optional[np.ndarray] = None
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            batch = self._encode([texts[i] for i in indices])
+            if pooled is None:
+                pooled = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+            pooled[indices] = batch
+        return fit_dimension(pooled, self.dim)
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+
+def create_sentence_embeddings() -> SentenceEmbeddings:
+    # Fail at startup, not on the first memory lookup
+    missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        raise RuntimeError(
+            f"EMBEDDINGS_PROVIDER='sentence' needs {', '.join(missing)}. "
+            "Install the 'sentence' extra: poetry install --extras sentence"
+        )
+    return SentenceEmbeddings(
+        model_name=settings.LOCAL_EMBEDDINGS_MODEL,
+        onnx_file=settings.LOCAL_EMBEDDINGS_ONNX_FILE,
+        int8_file=settings.LOCAL_EMBEDDINGS_INT8_FILE,
+        use_int8=settings.LOCAL_EMBEDDINGS_INT8,
+        threads=settings.LOCAL_EMBEDDINGS_THREADS,
+        batch_size=settings.LOCAL_EMBEDDINGS_BATCH_SIZE,
+        max_length=settings.LOCAL_EMBEDDINGS_MAX_LENGTH
+    )
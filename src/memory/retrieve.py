@@ -1,12 +1,151 @@
-from typing import List, Optional
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_, text
 
+from ..config import settings
 from ..models.memory import Memory, MemoryEvent
+from ..observability.metrics import MEMORY_SEARCH_SECONDS
+from ..utils.logging import get_logger
 from ..utils.redaction import redact_text
 from .embeddings import embeddings
 
+logger = get_logger(__name__)
+
+# Vector search strategies (settings.MEMORY_SEARCH_STRATEGY):
+# - hnsw:  ORDER BY distance through ix_memories_embedding_hnsw (or a per-type partial
+#          HNSW index when the type filter matches one), with per-query ef_search. On
+#          pgvector >= 0.8 the scan is iterative: without it the index returns ef_search
+#          candidates across all users, and the user_id/type filters can leave fewer than
+#          top_k of them.
+# - exact: prefilter by user through the btree indexes, then an exact distance sort.
+#          Perfect recall, and cheap while a user has a few thousand memories.
+# - auto:  exact for users at or below MEMORY_EXACT_SCAN_MAX_ROWS, hnsw above. The size
+#          check is cached per user for MEMORY_SEARCH_SIZE_CACHE_TTL_SECONDS, so most
+#          retrievals skip its COUNT round trip.
+# scripts/benchmarks/bench_memory_search.py measures recall and latency of each.
+SEARCH_STRATEGIES = ("hnsw", "exact", "auto")
+ITERATIVE_SCAN_MODES = ("strict_order", "relaxed_order")
+
+_pgvector_version: Optional[Tuple[int, ...]] = None
+
+def _get_pgvector_version(db: Session) -> Tuple[int, ...]:
+    # Checked once per process; iterative scans need pgvector 0.8
+    global _pgvector_version
+    if _pgvector_version is None:
+        raw = db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar() or "0"
+        _pgvector_version = tuple(int(part) for part in raw.split(".") if part.isdigit())
+    return _pgvector_version
+
+def _configure_hnsw(db: Session, ef_search: int, top_k: int) -> None:
+    """
+    Per-transaction HNSW settings (SET LOCAL ends with the transaction).
+    """
+    db.execute(text(f"SET LOCAL hnsw.ef_search = {max(int(ef_search), int(top_k))}"))
+    
+    mode = settings.MEMORY_HNSW_ITERATIVE_SCAN
+    if mode in ITERATIVE_SCAN_MODES and _get_pgvector_version(db) >= (0, 8):
+        db.execute(text(f"SET LOCAL hnsw.iterative_scan = {mode}"))
+        if settings.MEMORY_HNSW_MAX_SCAN_TUPLES > 0:
+            db.execute(text(f"SET LOCAL hnsw.max_scan_tuples = {int(settings.MEMORY_HNSW_MAX_SCAN_TUPLES)}"))
+
+# (user_id, max_rows) -> (checked_at, is_small); a stale entry only picks the slower
+# strategy for a user who just crossed the threshold, never a wrong result
+_user_size_cache: "OrderedDict[Tuple[str, int], Tuple[float, bool]]" = OrderedDict()
+_user_size_lock = threading.Lock()
+_USER_SIZE_CACHE_MAX_ENTRIES = 4096
+
+def _is_small_user(db: Session, user_id: str, max_rows: int) -> bool:
+    # Bounded count: stops reading after max_rows + 1 index entries
+    capped = db.query(Memory.id).filter(
+        Memory.user_id == user_id,
+        Memory.is_deleted == False
+    ).limit(max_rows + 1).subquery()
+    return db.query(func.count()).select_from(capped).scalar() <= max_rows
+
+def _is_small_user_cached(db: Session, user_id: str, max_rows: int) -> bool:
+    ttl = settings.MEMORY_SEARCH_SIZE_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return _is_small_user(db, user_id, max_rows)
+    key = (str(user_id), max_rows)
+    with _user_size_lock:
+        entry = _user_size_cache.get(key)
+        if entry and time.monotonic() - entry[0] <= ttl:
+            _user_size_cache.move_to_end(key)
+            return entry[1]
+    
+    is_small = _is_small_user(db, user_id, max_rows)
+    with _user_size_lock:
+        _user_size_cache[key] = (time.monotonic(), is_small)
+        _user_size_cache.move_to_end(key)
+        while len(_user_size_cache) > _USER_SIZE_CACHE_MAX_ENTRIES:
+            _user_size_cache.popitem(last=False)
+    return is_small
+
+def choose_search_strategy(db: Session, user_id: str, strategy: Optional[str] = None) -> str:
+    """
+    Resolves "auto" (or the configured default) to "hnsw" or "exact" for this user.
+    """
+    strategy = strategy or settings.MEMORY_SEARCH_STRATEGY
+    if strategy not in SEARCH_STRATEGIES:
+        logger.warning(f"Unknown MEMORY_SEARCH_STRATEGY '{strategy}', using hnsw")
+        return "hnsw"
+    if strategy == "auto":
+        return "exact" if _is_small_user_cached(db, user_id, settings.MEMORY_EXACT_SCAN_MAX_ROWS) else "hnsw"
+    return strategy
+
+def search_by_vector(
+    db: Session,
+    user_id: str,
+    query_vec: Sequence[float],
+    types: Optional[List[str]] = None,
+    metadata_filter: Optional[dict] = None,
+    top_k: int = 5,
+    strategy: Optional[str] = None,
+    ef_search: Optional[int] = None
+) -> List[Tuple[Memory, float]]:
+    """
+    Nearest live memories of a user as (memory, cosine distance), closest first.
+    The score threshold is applied by the caller: a distance predicate in the WHERE clause
+    would be checked after the index scan and only shrink the candidate set.
+    """
+    strategy = choose_search_strategy(db, user_id, strategy)
+    now = datetime.now(timezone.utc)
+    
+    distance_col = Memory.embedding.cosine_distance(query_vec)
+    stmt = db.query(Memory, distance_col.label("distance")).filter(
+        Memory.user_id == user_id,
+        Memory.is_deleted == False,
+        or_(Memory.expires_at == None, Memory.expires_at > now)
+    )
+    
+    if types:
+        stmt = stmt.filter(Memory.type.in_(types))
+        
+    if metadata_filter:
+        for key, value in metadata_filter.items():
+            # JSONB contains check
+            stmt = stmt.filter(Memory.metadata_.contains({key: value}))
+    
+    if strategy == "exact":
+        # "+ 0" keeps the sort expression from matching the HNSW index, so Postgres
+        # filters by user via btree and sorts the distances exactly
+        order_by = distance_col + 0
+    else:
+        _configure_hnsw(db, ef_search or settings.MEMORY_HNSW_EF_SEARCH, top_k)
+        order_by = distance_col
+    
+    started = time.perf_counter()
+    rows = stmt.order_by(order_by).limit(top_k).all()
+    MEMORY_SEARCH_SECONDS.labels(strategy=strategy).observe(time.perf_counter() - started)
+    
+    # relaxed_order iterative scans may return neighbours slightly out of order
+    return sorted(((mem, float(dist)) for mem, dist in rows), key=lambda row: row[1])
+
 def retrieve_memories(
     db: Session,
     user_id: str,
@@ -14,17 +153,17 @@ def retrieve_memories(
     types: Optional[List[str]] = None,
     metadata_filter: Optional[dict] = None,
     top_k: int = 5,
-    min_score: float = 0.70
+    min_score: float = 0.70,
+    query_vec: Optional[Sequence[float]] = None
 ) -> List[Memory]:
     """
     Semantic search for memories.
+    query_vec skips embedding query_text (aretrieve_memories embeds it asynchronously).
     """
-    safe_query = redact_text(query_text)
-    query_vec = embeddings.embed_texts([safe_query])[0]
-    
-    now = datetime.now(timezone.utc)
+    if query_vec is None:
+        safe_query = redact_text(query_text)
+        query_vec = embeddings.embed_texts([safe_query])[0]
     
-    from src.config import settings
     if settings.ENVIRONMENT == "test":
          # Fallback for SQLite testing (Exact match or just recent)
          # We'll ignore vector similarity since we lack pgvector
@@ -47,28 +186,18 @@ def retrieve_memories(
     # min_score 0.70 => max_distance 0.30
     max_distance = 1.0 - min_score
     
-    # Build wrapper for distance
-    distance_col = Memory.embedding.cosine_distance(query_vec).label("distance")
-    
-    stmt = db.query(Memory, distance_col).filter(
-        Memory.user_id == user_id,
-        Memory.is_deleted == False,
-        or_(Memory.expires_at == None, Memory.expires_at > now),
-        distance_col < max_distance
+    results = search_by_vector(
+        db, user_id, query_vec,
+        types=types,
+        metadata_filter=metadata_filter,
+        top_k=top_k
     )
     
-    if types:
-        stmt = stmt.filter(Memory.type.in_(types))
-        
-    if metadata_filter:
-        for key, value in metadata_filter.items():
-            # JSONB contains check
-            stmt = stmt.filter(Memory.metadata_.contains({key: value}))
-        
-    results = stmt.order_by(distance_col).limit(top_k).all()
-    
     memories = []
     for mem, dist in results:
+        if dist >= max_distance:
+            # Sorted by distance: everything after is further away
+            break
         # Attach score for convenience (not persisted)
         mem.score = 1.0 - dist
         memories.append(mem)
@@ -90,3 +219,27 @@ def retrieve_memories(
         db.commit()
         
     return memories
+
+async def aretrieve_memories(
+    db: Session,
+    user_id: str,
+    query_text: str,
+    types: Optional[List[str]] = None,
+    metadata_filter: Optional[dict] = None,
+    top_k: int = 5,
+    min_score: float = 0.70
+) -> List[Memory]:
+    """
+    retrieve_memories for async callers: the query is embedded without blocking a thread
+    on the HTTP call, then the (sync) vector search runs in a worker thread.
+    """
+    safe_query = redact_text(query_text)
+    query_vec = (await embeddings.aembed_texts([safe_query]))[0]
+    return await asyncio.to_thread(
+        retrieve_memories, db, user_id, query_text,
+        types=types,
+        metadata_filter=metadata_filter,
+        top_k=top_k,
+        min_score=min_score,
+        query_vec=query_vec
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
@@ -6,6 +7,7 @@ from sqlalchemy import select
 from ..models.memory import Memory, MemoryEvent
 from ..utils.redaction import redact_text, redact_dict
 from .embeddings import embeddings
+from ..db.unit_of_work import commit
 
 def compute_content_hash(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -18,11 +20,13 @@ def write_memory(
     source: str,
     content: str,
     metadata: dict = None,
-    retention_days: int = None
+    retention_days: int = None,
+    embedding: list = None
 ) -> str:
     """
     Writes a memory with deduplication and embedding.
     Returns memory_id.
+    embedding is a precomputed vector of the redacted content (see awrite_memory).
     """
     # 1. Redact
     safe_content = redact_text(content)
@@ -64,13 +68,14 @@ def write_memory(
             reason="Deduplicated write"
         )
         db.add(event)
-        db.commit()
+        commit(db)
         return str(existing.id)
 
     # 3. Embed
     # Note: embed_texts returns list of lists
-    vectors = embeddings.embed_texts([safe_content])
-    embedding_vector = vectors[0]
+    if embedding is None:
+        embedding = embeddings.embed_texts([safe_content])[0]
+    embedding_vector = embedding
 
     from src.config import settings
     if settings.ENVIRONMENT == "test":
@@ -103,6 +108,30 @@ def write_memory(
         actor=source
     )
     db.add(event)
-    db.commit()
+    commit(db)
     
     return str(new_memory.id)
+
+async def awrite_memory(
+    db: Session,
+    user_id: str,
+    session_id: str | None,
+    type_: str,
+    source: str,
+    content: str,
+    metadata: dict = None,
+    retention_days: int = None
+) -> str:
+    """
+    write_memory for async callers. The content is embedded up front with the async
+    client (a duplicate is served by the embedding cache), then the write runs in a
+    worker thread.
+    """
+    safe_content = redact_text(content)
+    embedding = (await embeddings.aembed_texts([safe_content]))[0]
+    return await asyncio.to_thread(
+        write_memory, db, user_id, session_id, type_, source, content,
+        metadata=metadata,
+        retention_days=retention_days,
+        embedding=embedding
+    )
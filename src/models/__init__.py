@@ -9,6 +9,7 @@ from .token import PasswordResetToken
 from .oauth import OAuthAccount
 from .memory import Memory, MemoryEvent
 from .tool_execution import ToolExecution, AgentMessage, Confirmation
+from .embedding_cache import EmbeddingCacheEntry
 
 __all__ = [
     "User",
@@ -25,5 +26,6 @@ __all__ = [
     "AgentMessage",
     "ToolExecution",
     "Confirmation",
+    "EmbeddingCacheEntry",
 ]
 
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Integer, LargeBinary
+from sqlalchemy.sql import func
+from src.database import Base
+from src.db.types import TZDateTime
+
+class EmbeddingCacheEntry(Base):
+    """
+    Persistent tier of the content-addressed embedding cache (see memory/embedding_cache.py).
+    Vectors are stored as packed float32, about 6 KB for a 1536-dim embedding.
+    """
+    __tablename__ = "embedding_cache"
+
+    model = Column(String(128), primary_key=True)
+    dim = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the (redacted) text
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(TZDateTime, server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Boolean, UniqueConstraint, Index
+from sqlalchemy import Column, String, ForeignKey, Boolean, UniqueConstraint, Index, and_, text
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 from src.database import Base
@@ -25,6 +25,25 @@ else:
             postgresql_with={'m': 16, 'ef_construction': 64},
             postgresql_ops={'embedding': 'vector_cosine_ops'}
         ),
+        # Per-type partial indexes: document chunks dwarf conversational memories for
+        # users who upload files, so a type-filtered search walks a graph of its own type
+        # instead of filtering the shared one (see memory/retrieve.py)
+        Index(
+            'ix_memories_embedding_hnsw_documents',
+            'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+            postgresql_where=text("type = 'DOCUMENT'")
+        ),
+        Index(
+            'ix_memories_embedding_hnsw_conversational',
+            'embedding',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+            postgresql_where=text("type <> 'DOCUMENT'")
+        ),
     )
 
 class Memory(Base):
@@ -58,6 +77,12 @@ class Memory(Base):
         UniqueConstraint('user_id', 'content_hash', name='uq_memories_user_content_hash'),
         Index('ix_memories_user_id_created_at', 'user_id', 'created_at'),
         Index('ix_memories_user_id_type', 'user_id', 'type'),
+        # Only live rows with a TTL, for the expiry sweeper
+        Index(
+            'ix_memories_expires_at_live',
+            'expires_at',
+            postgresql_where=and_(is_deleted == False, expires_at != None)
+        ),
     ) + vector_index_args
 
 class MemoryEvent(Base):
@@ -1,8 +1,12 @@
+import hashlib
+import json
 from datetime import datetime
+from typing import Any, Dict
 from uuid import uuid4
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import validates
 
 from ..database import Base
 
@@ -24,6 +28,14 @@ class PolicyDecisionModel(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
 
 
+def compute_args_hash(tool_args: Dict[str, Any]) -> str:
+    """
+    SHA-256 of the canonical JSON form of tool args (key order does not matter).
+    """
+    canonical = json.dumps(tool_args or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 class PendingConfirmationModel(Base):
     __tablename__ = "pending_confirmations"
 
@@ -33,6 +45,8 @@ class PendingConfirmationModel(Base):
     
     tool_name = Column(String, nullable=False)
     tool_args = Column(JSON, nullable=False)
+    # Set from tool_args on assignment; lets approvals be matched by index, not in Python
+    args_hash = Column(String(64), nullable=True)
     
     required_phrase = Column(String, nullable=True)
     decision_type = Column(String, nullable=False) # ESCALATE, ALLOW_WITH_CONFIRMATION
@@ -41,3 +55,13 @@ class PendingConfirmationModel(Base):
     status = Column(String, default="pending", nullable=False) # pending, confirmed, expired, cancelled
     
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_pending_confirmations_lookup', 'session_id', 'tool_name', 'status', 'args_hash'),
+        Index('ix_pending_confirmations_status_expires_at', 'status', 'expires_at'),
+    )
+
+    @validates("tool_args")
+    def _hash_tool_args(self, key, value):
+        self.args_hash = compute_args_hash(value)
+        return value
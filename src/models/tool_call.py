@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, String, ForeignKey, Integer, Index
+from sqlalchemy import Column, String, ForeignKey, Integer, Index, Boolean, false
 from sqlalchemy.sql import func
 from src.database import Base
 from src.db.types import UUIDType, TZDateTime, JsonBType
@@ -18,6 +18,7 @@ class ToolCall(Base):
     result = Column(JsonBType, nullable=False, server_default='{}')
     status = Column(String, nullable=False) # success, error
     latency_ms = Column(Integer, nullable=False, default=0)
+    cached = Column(Boolean, nullable=False, default=False, server_default=false()) # served from result cache
     
     created_at = Column(TZDateTime, server_default=func.now(), nullable=False)
 
@@ -38,6 +38,132 @@ TOOL_ERRORS_TOTAL = get_or_create_metric(
     ["tool_name", "error_type"]
 )
 
+TOOL_CIRCUIT_STATE = get_or_create_metric(
+    Gauge,
+    "victus_tool_circuit_state",
+    "Tool circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["tool_name"]
+)
+
+TOOL_CIRCUIT_TRANSITIONS_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_tool_circuit_transitions_total",
+    "Tool circuit breaker state transitions",
+    ["tool_name", "state"]
+)
+
+SCOPE_CACHE_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_scope_cache_total",
+    "Effective-scope cache lookups by result",
+    ["result"]  # hit, miss
+)
+
+POLICY_TABLE_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_policy_table_total",
+    "Precomputed policy decision lookups by result",
+    ["result"]  # hit, miss
+)
+
+TOOL_RESULT_CACHE_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_tool_result_cache_total",
+    "Read-only tool result cache events",
+    ["tool_name", "result"]  # hit, miss, evicted, too_large
+)
+
+TOOL_AUDIT_ROWS_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_tool_audit_rows_total",
+    "Write-behind tool_calls audit rows by outcome",
+    ["outcome"]  # written, dropped, late, failed
+)
+
+TOOL_AUDIT_QUEUE_DEPTH = get_or_create_metric(
+    Gauge,
+    "victus_tool_audit_queue_depth",
+    "Tool audit rows waiting to be written"
+)
+
+# Agent Metrics
+INTENT_SPECULATION_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_intent_speculation_total",
+    "Speculative intent parses by outcome",
+    ["outcome"]  # accepted, reparsed
+)
+
+INTENT_FAST_PATH_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_intent_fast_path_total",
+    "Fast-path intent classification attempts by outcome",
+    ["outcome", "intent"]  # hit, miss
+)
+
+INTENT_CACHE_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_intent_cache_total",
+    "Intent cache lookups by result",
+    ["result"]  # hit, semantic_hit, miss
+)
+
+INTENT_CACHE_EVICTIONS_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_intent_cache_evictions_total",
+    "Intent cache evictions by reason",
+    ["reason"]  # ttl, lru
+)
+
+INTENT_CACHE_EMBED_ERRORS_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_intent_cache_embed_errors_total",
+    "Semantic intent cache embedding failures by operation",
+    ["operation"]  # get, put
+)
+
+AGENT_EXECUTOR_POOL_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_agent_executor_pool_total",
+    "Agent executor pool lookups by result",
+    ["result", "variant"]  # hit, miss, rebuild / rag, base
+)
+
+AGENT_EXECUTOR_BUILD_SECONDS_SAVED = get_or_create_metric(
+    Counter,
+    "victus_agent_executor_build_seconds_saved_total",
+    "Executor build time avoided by pool hits, in seconds",
+    ["variant"]
+)
+
+# Memory Metrics
+MEMORY_SEARCH_SECONDS = get_or_create_metric(
+    Histogram,
+    "victus_memory_search_seconds",
+    "Vector search latency in retrieve_memories by strategy",
+    ["strategy"]  # hnsw, exact
+)
+
+EMBEDDING_BATCH_INPUTS = get_or_create_metric(
+    Histogram,
+    "victus_embedding_batch_inputs",
+    "Texts per embeddings API call after coalescing",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+)
+
+EMBEDDING_BATCH_SPLITS_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_embedding_batch_splits_total",
+    "Embedding batches split in half after the API rejected them as too large"
+)
+
+EMBEDDING_CACHE_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_embedding_cache_total",
+    "Embedding cache lookups per text",
+    ["tier", "result"]  # memory/db hit, all miss
+)
+
 # Policy Metrics
 POLICY_DENIES_TOTAL = get_or_create_metric(
     Counter,
@@ -52,6 +178,13 @@ CONFIRMATIONS_PENDING = get_or_create_metric(
     "Current number of pending confirmations"
 )
 
+EXPIRY_SWEEP_ROWS_TOTAL = get_or_create_metric(
+    Counter,
+    "victus_expiry_sweep_rows_total",
+    "Rows expired by the background sweeper",
+    ["kind"]  # confirmations, memories
+)
+
 # WS Metrics
 WS_CONNECTIONS_ACTIVE = get_or_create_metric(
     Gauge,
@@ -4,6 +4,7 @@ from typing import Dict, Any
 
 from sqlalchemy.orm import Session
 from ..models.policy import PendingConfirmationModel
+from ..db.unit_of_work import commit, refresh
 
 def resolve_confirmation(
     user_id: UUID, 
@@ -29,7 +30,7 @@ def resolve_confirmation(
         
     if confirmation.expires_at and confirmation.expires_at < datetime.now(timezone.utc):
         confirmation.status = "expired"
-        db.commit()
+        commit(db)
         return {"status": "error", "message": "Confirmation expired"}
 
     # Check required phrase if present
@@ -43,7 +44,7 @@ def resolve_confirmation(
              
     # If we got here, it's confirmed
     confirmation.status = "confirmed"
-    db.commit()
+    commit(db)
     
     return {
         "status": "confirmed",
@@ -69,7 +70,7 @@ def cancel_confirmation(
         return {"status": "error", "message": "Confirmation not found"}
         
     confirmation.status = "cancelled"
-    db.commit()
+    commit(db)
     
     return {"status": "cancelled"}
 
@@ -110,7 +111,7 @@ def create_confirmation(
         expires_at=expires_at
     )
     db.add(new_conf)
-    db.commit()
-    db.refresh(new_conf)
+    commit(db)
+    refresh(db, new_conf)
     return new_conf
 
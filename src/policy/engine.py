@@ -1,16 +1,37 @@
-from datetime import timedelta     
-from typing import Optional
+"""
+Deterministic policy engine.
+
+The rules only read static tool metadata from TOOL_POLICY_REGISTRY plus
+(tool_name, action_type, scope, target_entity), so the outcome is precomputed into a lookup
+table (PolicyDecisionTable). evaluate_policy is then a dict lookup. A per-request overlay
+adds what depends on the moment of the call: the expiry of actions that need confirmation.
+Future rules that read per-request context (device_locked, network, ...) belong in the
+overlay, not in _evaluate_rules.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from .contracts import PolicyCheck, PolicyDecision
-from .tool_registry import TOOL_POLICY_REGISTRY
+from .tool_registry import TOOL_POLICY_REGISTRY, ToolPolicyMeta
+from ..observability.metrics import POLICY_TABLE_TOTAL
 
-def evaluate_policy(check: PolicyCheck) -> PolicyDecision:
+ACTION_TYPES = ("READ", "WRITE", "EXECUTE", "DELETE")
+SCOPES = ("single", "batch", "all")
+
+def _evaluate_rules(
+    tool_name: str,
+    tool_meta: Optional[ToolPolicyMeta],
+    action_type: str,
+    scope: str,
+    target_entity: str
+) -> PolicyDecision:
     """
     Evaluates a tool request against deterministic policy rules.
-    NO LLM calls allowed here. Purely rules-based.
+    NO LLM calls allowed here. Purely rules-based, and only static inputs: the result is
+    cached by PolicyDecisionTable.
     """
-    tool_meta = TOOL_POLICY_REGISTRY.get(check.tool_name)
-    
     # Rule 1: Unknown tools -> DENY
     if not tool_meta:
         return PolicyDecision(
@@ -27,11 +48,11 @@ def evaluate_policy(check: PolicyCheck) -> PolicyDecision:
     required_confirmation_phrase: Optional[str] = None
     
     # Factors
-    is_read_only = check.action_type == "READ" and not tool_meta.get("side_effects", False)
+    is_read_only = action_type == "READ" and not tool_meta.get("side_effects", False)
     is_external = tool_meta.get("external_communication", False)
-    is_destructive = tool_meta.get("destructive", False) or check.action_type == "DELETE"
-    is_system_exec = tool_meta.get("category") == "system" and check.action_type == "EXECUTE"
-    is_batch = check.scope in ("batch", "all")
+    is_destructive = tool_meta.get("destructive", False) or action_type == "DELETE"
+    is_system_exec = tool_meta.get("category") == "system" and action_type == "EXECUTE"
+    is_batch = scope in ("batch", "all")
     
     # --- Scoring Logic ---
     
@@ -66,7 +87,7 @@ def evaluate_policy(check: PolicyCheck) -> PolicyDecision:
         # We don't have the specific args fully parsed here beyond preview, 
         # but we need to mention what will be sent/who receives.
         # This is a template that the frontend or voice system will fill/read.
-        user_prompt = f"The agent wants to communicate externally using {check.tool_name}. Please review who will receive this message."
+        user_prompt = f"The agent wants to communicate externally using {tool_name}. Please review who will receive this message."
 
     # Rule 4: Destructive actions
     if is_destructive:
@@ -74,16 +95,16 @@ def evaluate_policy(check: PolicyCheck) -> PolicyDecision:
         risk_score = max(risk_score, 85)
         reason_code = "DESTRUCTIVE_ACTION"
         user_prompt = "This action is destructive and irreversible. Please explicitly confirm."
-        required_confirmation_phrase = f"CONFIRM {check.action_type} {check.target_entity.upper()}"
-        if "DELETE" in check.tool_name.upper() or check.action_type == "DELETE":
-             required_confirmation_phrase = "CONFIRM DELETE FILE" if check.target_entity == "file" else f"CONFIRM DELETE {check.target_entity.upper()}"
+        required_confirmation_phrase = f"CONFIRM {action_type} {target_entity.upper()}"
+        if "DELETE" in tool_name.upper() or action_type == "DELETE":
+             required_confirmation_phrase = "CONFIRM DELETE FILE" if target_entity == "file" else f"CONFIRM DELETE {target_entity.upper()}"
 
 
     # Rule 5: Batch scope triggers confirmation if not already escalated
     if is_batch and decision == "ALLOW" and risk_score > 30:
          decision = "ALLOW_WITH_CONFIRMATION"
          reason_code = "BATCH_OPERATION_CONFIRM"
-         user_prompt = f"The agent involves {check.scope} entries. Please confirm."
+         user_prompt = f"The agent involves {scope} entries. Please confirm."
 
     # Rule 6: System execution
     if is_system_exec:
@@ -133,19 +154,99 @@ def evaluate_policy(check: PolicyCheck) -> PolicyDecision:
         required_confirmation_phrase = None
         
     if decision in ("ALLOW_WITH_CONFIRMATION", "ESCALATE") and not user_prompt:
-        user_prompt = f"Policy requires confirmation for {check.tool_name}."
-
-    expires_at = None
-    if decision != "ALLOW" and decision != "DENY":
-         # Default 1 hour expiration for proposed actions
-         from datetime import datetime
-         expires_at = datetime.now() + timedelta(hours=1)
+        user_prompt = f"Policy requires confirmation for {tool_name}."
 
     return PolicyDecision(
         decision=decision,
         risk_score=risk_score,
         reason_code=reason_code,
         user_prompt=user_prompt,
-        required_confirmation_phrase=required_confirmation_phrase,
-        expires_at=expires_at
+        required_confirmation_phrase=required_confirmation_phrase
+    )
+
+def _apply_overlay(static: PolicyDecision, check: PolicyCheck) -> PolicyDecision:
+    """
+    Adds the per-request parts to a precomputed decision.
+    """
+    if static.decision != "ALLOW" and static.decision != "DENY":
+         # Default 1 hour expiration for proposed actions
+         return static.model_copy(update={"expires_at": datetime.now() + timedelta(hours=1)})
+    # Frozen, so the cached instance can be shared
+    return static
+
+# (tool_name, action_type, scope, target_entity)
+DecisionKey = Tuple[str, str, str, str]
+
+class _TableEntry(NamedTuple):
+    # Registry entry the decision was computed from; a patched or replaced entry misses
+    tool_meta: Optional[ToolPolicyMeta]
+    decision: PolicyDecision
+
+class PolicyDecisionTable:
+    """
+    Static policy decisions keyed on (tool_name, action_type, scope, target_entity).
+
+    warm() fills the table for every registered tool, action type and scope, with the tool's
+    category as target entity (what ToolRuntime sends). Other keys are computed on first use.
+    An entry is only used while the registry still holds the same metadata object, so
+    replacing or removing a registry entry takes effect at once. Mutating a metadata dict in
+    place needs clear().
+    """
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: Dict[DecisionKey, _TableEntry] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, tool_name: str, action_type: str, scope: str, target_entity: str) -> PolicyDecision:
+        tool_meta = TOOL_POLICY_REGISTRY.get(tool_name)
+        key = (tool_name, action_type, scope, target_entity)
+        entry = self._entries.get(key)
+        if entry is not None and entry.tool_meta is tool_meta:
+            POLICY_TABLE_TOTAL.labels(result="hit").inc()
+            return entry.decision
+        
+        POLICY_TABLE_TOTAL.labels(result="miss").inc()
+        decision = _evaluate_rules(tool_name, tool_meta, action_type, scope, target_entity)
+        with self._lock:
+            # target_entity is free text, so keep the table bounded
+            if key in self._entries or len(self._entries) < self.max_entries:
+                self._entries[key] = _TableEntry(tool_meta, decision)
+        return decision
+
+    def warm(self) -> int:
+        """
+        Precomputes decisions for the registered tools. Returns the table size.
+        """
+        for tool_name, tool_meta in list(TOOL_POLICY_REGISTRY.items()):
+            target_entity = tool_meta.get("category", "other")
+            for action_type in ACTION_TYPES:
+                for scope in SCOPES:
+                    decision = _evaluate_rules(tool_name, tool_meta, action_type, scope, target_entity)
+                    with self._lock:
+                        self._entries[(tool_name, action_type, scope, target_entity)] = _TableEntry(tool_meta, decision)
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# Global instance (warmed by the app lifespan)
+policy_table = PolicyDecisionTable()
+
+def evaluate_policy(check: PolicyCheck) -> PolicyDecision:
+    """
+    Evaluates a tool request against deterministic policy rules.
+    Static part from the precomputed table, per-request part from the overlay.
+    """
+    static = policy_table.lookup(check.tool_name, check.action_type, check.scope, check.target_entity)
+    return _apply_overlay(static, check)
+
+def evaluate_policy_uncached(check: PolicyCheck) -> PolicyDecision:
+    """
+    Same result as evaluate_policy without the table (reference path for tests and benchmarks).
+    """
+    static = _evaluate_rules(
+        check.tool_name, TOOL_POLICY_REGISTRY.get(check.tool_name),
+        check.action_type, check.scope, check.target_entity
     )
+    return _apply_overlay(static, check)
@@ -3,7 +3,8 @@ from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
-from ..models.policy import PolicyDecisionModel, PendingConfirmationModel
+from ..models.policy import PolicyDecisionModel, PendingConfirmationModel, compute_args_hash
+from ..db.unit_of_work import commit
 from .contracts import PolicyCheck, PolicyDecision
 from .engine import evaluate_policy
 
@@ -17,34 +18,33 @@ def check_and_record_policy(check: PolicyCheck, db: Session) -> PolicyDecision:
     """
     
     # 0. Check for existing confirmation
-    # Look for a valid, confirmed permission for this exact action
-    active_confirmation = db.query(PendingConfirmationModel).filter(
+    # Look for a valid, confirmed permission for this exact action. The args hash keeps a
+    # confirmation from being reused for a different payload, and the whole match is one
+    # query on ix_pending_confirmations_lookup.
+    conf = db.query(PendingConfirmationModel).filter(
         PendingConfirmationModel.session_id == check.session_id,
         PendingConfirmationModel.tool_name == check.tool_name,
         PendingConfirmationModel.status == "confirmed",
+        PendingConfirmationModel.args_hash == compute_args_hash(check.tool_args_preview),
         PendingConfirmationModel.expires_at > datetime.now(timezone.utc)
-    ).all() # Fetch all candidates to check args
+    ).order_by(PendingConfirmationModel.created_at.desc()).first()
     
-    for conf in active_confirmation:
-        # Compare args (simple equality check - usually works for JSON if keys ordered same, 
-        # but for safety we might rely on the user confirming the *intent* which maps to this ID.
-        # However, checking args prevents reusing a confirmation for a different payload.)
-        if conf.tool_args == check.tool_args_preview:
-            # Found a match!
-            # Mark it as used/completed so it can't be reused indefinitely (one-time use)
-            conf.status = "completed"
-            db.add(conf)
-            db.commit() # Commit state change
-            
-            # Return ALLOW decision
-            return PolicyDecision(
-                 decision="ALLOW",
-                 risk_score=0,
-                 reason_code="USER_CONFIRMED",
-                 intent_summary=check.intent_summary,
-                 id=None # We don't persist a new policy decision record for the ALLOW? 
-                         # Actually we should log that it allowed execution.
-            )
+    if conf:
+        # Found a match!
+        # Mark it as used/completed so it can't be reused indefinitely (one-time use)
+        conf.status = "completed"
+        db.add(conf)
+        commit(db) # Commit state change
+        
+        # Return ALLOW decision
+        return PolicyDecision(
+             decision="ALLOW",
+             risk_score=0,
+             reason_code="USER_CONFIRMED",
+             intent_summary=check.intent_summary,
+             id=None # We don't persist a new policy decision record for the ALLOW? 
+                     # Actually we should log that it allowed execution.
+        )
             
     # 1. Evaluate
     decision = evaluate_policy(check)
@@ -84,7 +84,7 @@ def check_and_record_policy(check: PolicyCheck, db: Session) -> PolicyDecision:
         )
         db.add(confirmation)
         
-    db.commit()
+    commit(db)
     
     # Return decision with the generated ID
     return decision.model_copy(update={"id": db_decision.id})
@@ -140,4 +140,33 @@ TOOL_POLICY_REGISTRY: Dict[str, ToolPolicyMeta] = {
         "external_communication": False,
         "destructive": False,
     },
+    "create_calendar_event": {
+        "category": "calendar",
+        "default_action_type": "WRITE",
+        "default_sensitivity": "medium",
+        "default_scope": "single",
+        "side_effects": True,
+        "external_communication": False,
+        "destructive": False,
+    },
+    # Lookups only: the query goes out but nothing is sent to a person,
+    # so no external-communication confirmation (and results can be cached)
+    "get_weather_info": {
+        "category": "other",
+        "default_action_type": "READ",
+        "default_sensitivity": "low",
+        "default_scope": "single",
+        "side_effects": False,
+        "external_communication": False,
+        "destructive": False,
+    },
+    "web_search": {
+        "category": "web",
+        "default_action_type": "READ",
+        "default_sensitivity": "low",
+        "default_scope": "single",
+        "side_effects": False,
+        "external_communication": False,
+        "destructive": False,
+    },
 }
@@ -0,0 +1,96 @@
+"""
+Per-process cache of effective scopes keyed by (user_id, session_id).
+
+ToolRuntime used to load the full User and Session rows on every execution just to
+resolve ScopeSet. Plan steps in one turn hit the same pair repeatedly, so the resolved
+list is cached for a short TTL.
+
+Entries are invalidated when User.scopes or Session.scopes_override is assigned through
+the ORM (attribute events below). Bulk UPDATEs and in-place mutation of the JSON list
+bypass those events: call invalidate_user / invalidate_session explicitly, or rely on
+the TTL bounding staleness.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from ..config import settings
+from ..models.user import User
+from ..models.session import Session as SessionModel
+from ..observability.metrics import SCOPE_CACHE_TOTAL
+
+# (user_id, session_id) as strings so UUID objects and str ids share entries
+ScopeKey = Tuple[str, str]
+
+
+class ScopeCache:
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (stored_at, effective scopes)
+        self._entries: "OrderedDict[ScopeKey, Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: Any, session_id: Any) -> Optional[List[str]]:
+        if self.ttl_seconds <= 0:
+            return None
+        key = (str(user_id), str(session_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                SCOPE_CACHE_TOTAL.labels(result="hit").inc()
+                return list(entry[1])
+            if entry:
+                del self._entries[key]
+        SCOPE_CACHE_TOTAL.labels(result="miss").inc()
+        return None
+
+    def put(self, user_id: Any, session_id: Any, scopes: List[str]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = (str(user_id), str(session_id))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), tuple(scopes))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        self._invalidate(0, user_id)
+
+    def invalidate_session(self, session_id: Any) -> None:
+        self._invalidate(1, session_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _invalidate(self, position: int, value: Any) -> None:
+        if value is None:
+            return
+        value = str(value)
+        with self._lock:
+            for key in [k for k in self._entries if k[position] == value]:
+                del self._entries[key]
+
+
+# Global instance
+scope_cache = ScopeCache(
+    ttl_seconds=settings.SCOPE_CACHE_TTL_SECONDS,
+    max_entries=settings.SCOPE_CACHE_MAX_ENTRIES
+)
+
+
+@event.listens_for(User.scopes, "set")
+def _user_scopes_changed(target, value, oldvalue, initiator):
+    scope_cache.invalidate_user(target.id)
+
+
+@event.listens_for(SessionModel.scopes_override, "set")
+def _session_scopes_changed(target, value, oldvalue, initiator):
+    scope_cache.invalidate_session(target.id)
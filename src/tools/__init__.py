@@ -4,7 +4,7 @@ Provides modular tool implementations for the AI agent
 """
 
 from .assembler import get_all_tools
-from .config import async_client
+from .config import get_async_client
 from .web_search import web_search_tool
 from .system_tools import (
     list_files,
@@ -26,7 +26,7 @@ from .rag_tools import query_uploaded_documents, update_vector_store
 
 __all__ = [
     "get_all_tools",
-    "async_client",
+    "get_async_client",
     "web_search_tool",
     "list_files",
     "open_app",
@@ -0,0 +1,169 @@
+"""
+Write-behind sink for tool_calls audit rows.
+
+ToolRuntime normally inserts and commits the audit row on the request path. With
+TOOL_AUDIT_ASYNC the row is put on a bounded in-process queue instead, and a background
+thread bulk-inserts queued rows in their own transaction. The audit write then no longer
+adds to user-visible latency.
+
+Backpressure: when the queue is full, enqueue() blocks for up to
+TOOL_AUDIT_ENQUEUE_TIMEOUT_MS, then drops the row. Dropped rows, rows that took longer than
+TOOL_AUDIT_LATE_SECONDS to reach the database, and rows that failed to insert are counted
+in victus_tool_audit_rows_total. When a bulk insert fails, its rows are retried one at a
+time, so a single bad row does not cost the rest of the batch. stop() drains the queue on
+shutdown.
+
+Rows become visible to DB-backed guards (rate limit, loop breaker) up to one flush
+interval later than with synchronous writes.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.tool_call import ToolCall
+from ..observability.metrics import TOOL_AUDIT_ROWS_TOTAL, TOOL_AUDIT_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+
+class ToolCallAuditSink:
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        enqueue_timeout: float = 0.05,
+        late_after: float = 5.0
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.late_after = late_after
+        # (enqueued_at, row)
+        self._queue: "queue.Queue[Tuple[float, Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if self.session_factory is None:
+            from ..database import SessionLocal
+            self.session_factory = SessionLocal
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="tool-audit-writer", daemon=True)
+        self._worker.start()
+        logger.info("Tool audit writer started")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stops the worker after writing everything still queued.
+        """
+        if not self.running:
+            return
+        self._stop.set()
+        self._worker.join(timeout)
+        if self._worker.is_alive():
+            logger.warning(f"Tool audit writer did not drain within {timeout}s, {self._queue.qsize()} rows pending")
+        self._worker = None
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """
+        Queues a tool_calls row. Returns False if it was dropped because the queue stayed full.
+        """
+        try:
+            self._queue.put((time.monotonic(), row), timeout=self.enqueue_timeout)
+        except queue.Full:
+            TOOL_AUDIT_ROWS_TOTAL.labels(outcome="dropped").inc()
+            logger.warning(f"Tool audit queue full, dropped row for {row.get('tool_name')}")
+            return False
+        TOOL_AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def flush(self) -> int:
+        """
+        Writes all currently queued rows. Returns the number written.
+        """
+        written = 0
+        while True:
+            batch = self._take_batch(block=False)
+            if not batch:
+                return written
+            written += self._write(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._take_batch(block=True)
+            if batch:
+                self._write(batch)
+        # Shutdown: drain what is left
+        self.flush()
+
+    def _take_batch(self, block: bool) -> List[Tuple[float, Dict[str, Any]]]:
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        TOOL_AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    def _write(self, batch: List[Tuple[float, Dict[str, Any]]]) -> int:
+        if self._insert([row for _, row in batch]):
+            written = batch
+        else:
+            logger.warning(f"Bulk insert of {len(batch)} tool audit rows failed, retrying row by row")
+            written = [item for item in batch if self._insert([item[1]])]
+            failed = len(batch) - len(written)
+            if failed:
+                TOOL_AUDIT_ROWS_TOTAL.labels(outcome="failed").inc(failed)
+        if not written:
+            return 0
+
+        now = time.monotonic()
+        late = sum(1 for enqueued_at, _ in written if now - enqueued_at > self.late_after)
+        TOOL_AUDIT_ROWS_TOTAL.labels(outcome="written").inc(len(written))
+        if late:
+            TOOL_AUDIT_ROWS_TOTAL.labels(outcome="late").inc(late)
+        return len(written)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> bool:
+        # One transaction per call; returns False (and logs single rows) on failure
+        db = self.session_factory()
+        try:
+            db.execute(insert(ToolCall), rows)
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            if len(rows) == 1:
+                logger.error(f"Failed to write tool audit row for {rows[0].get('tool_name')}: {e}")
+            return False
+        finally:
+            db.close()
+
+
+# Global instance (started by the app lifespan when TOOL_AUDIT_ASYNC is on)
+audit_sink = ToolCallAuditSink(
+    max_queue=settings.TOOL_AUDIT_QUEUE_SIZE,
+    batch_size=settings.TOOL_AUDIT_BATCH_SIZE,
+    flush_interval=settings.TOOL_AUDIT_FLUSH_INTERVAL_MS / 1000,
+    enqueue_timeout=settings.TOOL_AUDIT_ENQUEUE_TIMEOUT_MS / 1000,
+    late_after=settings.TOOL_AUDIT_LATE_SECONDS
+)
@@ -1,6 +1,6 @@
 
 from enum import Enum
-from typing import Type, Any, Callable
+from typing import Type, Any, Callable, Optional
 from pydantic import BaseModel
 from langchain_core.tools import BaseTool
 
@@ -18,6 +18,8 @@ class SafeTool(BaseTool):
     """
     risk_level: RiskLevel = RiskLevel.HIGH
     required_scope: str = Scope.CORE.value
+    timeout_seconds: Optional[float] = None  # latency budget, see ToolSpec
+    cache_ttl_seconds: Optional[float] = None  # read-only result cache, see ToolSpec
     
     class Config:
         arbitrary_types_allowed = True
@@ -33,6 +35,8 @@ class SafeTool(BaseTool):
         risk_level: RiskLevel = RiskLevel.HIGH,
         required_scope: str = Scope.CORE.value,
         return_direct: bool = False,
+        timeout_seconds: Optional[float] = None,
+        cache_ttl_seconds: Optional[float] = None,
     ) -> "SafeTool":
         """
         Creates a SafeTool from a function.
@@ -44,6 +48,8 @@ class SafeTool(BaseTool):
             risk_level=risk_level,
             required_scope=required_scope,
             return_direct=return_direct,
+            timeout_seconds=timeout_seconds,
+            cache_ttl_seconds=cache_ttl_seconds,
         )
         object.__setattr__(instance, "_func", func)
         return instance
@@ -51,25 +57,9 @@ class SafeTool(BaseTool):
     def _run(self, *args: Any, **kwargs: Any) -> Any:
         # Use ToolRuntime for execution
         from .runtime import ToolRuntime
-        from ..utils.context import get_trace_id, get_user_id, get_session_id
         from ..database import SessionLocal
         
-        user_id = get_user_id()
-        session_id = get_session_id()
-        
-        # If no context (e.g. testing), we might fail or mock.
-        # Assuming context exists or using fallback.
-        if not user_id:
-             # Fallback/Error? For now strict.
-             # Wait, existing tools might run without session in some scripts?
-             # But runtime requires IDs.
-             import uuid
-             user_id = uuid.uuid4() # unsafe default
-             
-        if not session_id:
-             import uuid
-             session_id = uuid.uuid4()
-
+        user_id, session_id = self._context_ids()
         db = SessionLocal()
         try:
             runtime = ToolRuntime()
@@ -80,18 +70,7 @@ class SafeTool(BaseTool):
                 args_dict=kwargs, 
                 db=db
             )
-            
-            if result.status == "success":
-                return result.data
-            elif result.status == "needs_confirmation":
-                return (
-                    f"Action Requires Confirmation. Prompt: {result.confirmation_prompt}. "
-                    f"Please confirm this action (Pending ID: {result.pending_confirmation_id})."
-                )
-            elif result.status == "denied":
-                return f"Action Denied: {result.error}"
-            else:
-                return f"Error: {result.error}"
+            return self._format_result(result)
 
         except Exception as e:
             return f"System Error executing {self.name}: {e}"
@@ -99,9 +78,63 @@ class SafeTool(BaseTool):
             db.close()
 
     async def _arun(self, *args: Any, **kwargs: Any) -> Any:
-        # Async version invoking sync runtime (as Runtime using sync DB session)
-        # In future, Runtime should be async.
-        return self._run(*args, **kwargs)
+        # Async tools are awaited natively, blocking ones run in the runtime's tool pool
+        import asyncio
+        from .runtime import ToolRuntime
+        from ..database import SessionLocal
+        
+        user_id, session_id = self._context_ids()
+        db = SessionLocal()
+        try:
+            runtime = ToolRuntime()
+            result = await runtime.aexecute(
+                user_id=user_id, 
+                session_id=session_id, 
+                tool_name=self.name, 
+                args_dict=kwargs, 
+                db=db
+            )
+            return self._format_result(result)
+
+        except Exception as e:
+            return f"System Error executing {self.name}: {e}"
+        finally:
+            await asyncio.to_thread(db.close)
+
+    def _context_ids(self):
+        from ..utils.context import get_user_id, get_session_id
+        
+        user_id = get_user_id()
+        session_id = get_session_id()
+        
+        # If no context (e.g. testing), we might fail or mock.
+        # Assuming context exists or using fallback.
+        if not user_id:
+             # Fallback/Error? For now strict.
+             # Wait, existing tools might run without session in some scripts?
+             # But runtime requires IDs.
+             import uuid
+             user_id = uuid.uuid4() # unsafe default
+             
+        if not session_id:
+             import uuid
+             session_id = uuid.uuid4()
+        return user_id, session_id
+
+    def _format_result(self, result) -> Any:
+        if result.status == "success":
+            return result.data
+        elif result.status == "needs_confirmation":
+            return (
+                f"Action Requires Confirmation. Prompt: {result.confirmation_prompt}. "
+                f"Please confirm this action (Pending ID: {result.pending_confirmation_id})."
+            )
+        elif result.status == "denied":
+            return f"Action Denied: {result.error}"
+        elif result.status == "unknown":
+            return f"Outcome Unknown: {result.error} Do NOT retry; ask the user to check first."
+        else:
+            return f"Error: {result.error}"
 
     # Legacy logging logic removed as Runtime handles persistence
     def _create_pending_action(self, action_id: str, args: dict):
@@ -0,0 +1,161 @@
+"""
+Per-tool circuit breakers.
+
+A tool whose upstream keeps timing out or answering 5xx is failed fast instead of holding
+the request (and its DB session) for the full latency budget each time:
+
+- closed: calls run; FAILURE_THRESHOLD consecutive upstream failures open the breaker
+- open: calls are rejected until RESET_SECONDS have passed
+- half_open: up to HALF_OPEN_PROBES calls run as probes; a success closes the breaker,
+  a failure opens it again
+
+Only UPSTREAM_FAILURES (timeouts, connection errors, 5xx) count as failures; other exceptions mean the upstream
+answered, so they do not trip the breaker. State is exported as victus_tool_circuit_state.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Dict
+
+import httpx
+import requests  # type: ignore
+
+from ..config import settings
+from ..observability.metrics import TOOL_CIRCUIT_STATE, TOOL_CIRCUIT_TRANSITIONS_TOTAL
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge values
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class UpstreamError(Exception):
+    """
+    Raised by tools when an upstream service fails (5xx), so the breaker can see it.
+    """
+    def __init__(self, service: str, status_code: int, detail: str = ""):
+        self.service = service
+        self.status_code = status_code
+        super().__init__(f"{service} returned {status_code}{': ' + detail if detail else ''}")
+
+
+# Exceptions that mean the upstream is unhealthy (timeouts, unreachable, 5xx)
+UPSTREAM_FAILURES = (
+    UpstreamError,
+    asyncio.TimeoutError,
+    concurrent.futures.TimeoutError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    httpx.TimeoutException,
+    httpx.ConnectError,
+)
+
+
+def raise_for_upstream(service: str, status_code: int, detail: str = "") -> None:
+    if status_code >= 500:
+        raise UpstreamError(service, status_code, detail[:200])
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        half_open_probes: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        TOOL_CIRCUIT_STATE.labels(tool_name=name).set(STATE_VALUES[CLOSED])
+
+    def allow(self) -> bool:
+        """
+        Whether a call may run now. In half-open state an allowed call is a probe and must
+        be followed by record_success, record_failure or release.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return False
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._open()
+                return
+            self._failures += 1
+            if self.state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """
+        Gives back a probe slot without an outcome (e.g. the call was cancelled).
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._failures = 0
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        if state != HALF_OPEN:
+            self._probes_in_flight = 0
+        TOOL_CIRCUIT_STATE.labels(tool_name=self.name).set(STATE_VALUES[state])
+        TOOL_CIRCUIT_TRANSITIONS_TOTAL.labels(tool_name=self.name, state=state).inc()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(tool_name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(tool_name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                tool_name,
+                failure_threshold=settings.TOOL_CIRCUIT_FAILURE_THRESHOLD,
+                reset_seconds=settings.TOOL_CIRCUIT_RESET_SECONDS,
+                half_open_probes=settings.TOOL_CIRCUIT_HALF_OPEN_PROBES
+            )
+            _breakers[tool_name] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    """
+    Drops all breaker state (useful for tests).
+    """
+    with _breakers_lock:
+        _breakers.clear()
@@ -2,16 +2,42 @@
 Configuration and utilities for tools
 """
 
+import asyncio
 import os
 import platform
+import threading
+import weakref
 import httpx
 from pathlib import Path
 from typing import Dict
 
 HOME_DIR = Path.home()
 
-# Shared async HTTP client for all tools
-async_client = httpx.AsyncClient(timeout=10.0)
+# Shared async HTTP clients for all tools, one per event loop: an AsyncClient's pooled
+# connections belong to the loop that opened them and fail once that loop is closed.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    The running loop's HTTP client, created on first use. Must be called from a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(timeout=10.0)
+            _async_clients[loop] = client
+    return client
+
+async def aclose_async_client() -> None:
+    """
+    Closes the running loop's HTTP client, if it has one.
+    """
+    with _async_clients_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 def get_windows_special_folder(folder_name: str) -> Path:
     """
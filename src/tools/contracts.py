@@ -3,6 +3,13 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+class ToolError(Exception):
+    """
+    Raised by a tool that ran but could not produce a result (bad input, auth, not found).
+    The runtime records it as an error, so it is never cached as a successful result.
+    """
+
+
 class ToolSpec(BaseModel):
     """
     Defines the contract for a tool.
@@ -29,6 +36,11 @@ class ToolSpec(BaseModel):
     default_scope: Literal["single", "batch", "all"]
     
     required_capabilities: List[str] = Field(default_factory=list)
+    
+    # Latency budget enforced by ToolRuntime; None -> settings.TOOL_TIMEOUT_SECONDS
+    timeout_seconds: Optional[float] = None
+    # Result cache TTL for read-only tools; None -> not cached (ignored if side_effects)
+    cache_ttl_seconds: Optional[float] = None
 
 
 class ToolResult(BaseModel):
@@ -37,12 +49,15 @@ class ToolResult(BaseModel):
     """
     model_config = ConfigDict(frozen=True)
 
-    status: Literal["success", "error", "needs_confirmation", "denied"]
+    # "unknown": a side-effecting tool timed out and may still have completed
+    status: Literal["success", "error", "needs_confirmation", "denied", "unknown"]
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     
     latency_ms: int
     redactions_applied: List[str] = Field(default_factory=list)
+    # Served from the read-only result cache
+    cached: bool = False
     
     # IDs for tracking and context
     policy_decision_id: Optional[UUID] = None
@@ -1,18 +1,46 @@
+"""
+Tool guards: per-(session, tool) rate limit and failure loop breaker.
+
+Backends (TOOL_GUARD_BACKEND):
+- "memory": process-local sliding window and failure ring buffer (default, no queries)
+- "redis": same semantics in Redis so limits hold across workers (needs the redis package)
+- "db": counts tool_calls rows, for parity with the audit trail
+
+Every backend sees the same attempts: ToolRuntime calls record() for each tool_calls row
+it persists.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from uuid import UUID
+from typing import Deque, Tuple
+from uuid import UUID, uuid4
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
+from ..config import settings
 from ..models.tool_call import ToolCall
 
+logger = logging.getLogger(__name__)
+
 # Limits
 MAX_CALLS_PER_MINUTE = 10
 MAX_CONSECUTIVE_FAILURES = 3
+WINDOW_SECONDS = 60
 
 class ToolGuards:
+    """
+    DB backend: counts persisted tool_calls rows.
+    """
     def __init__(self, db: Session):
         self.db = db
 
+    def record(self, session_id: UUID, tool_name: str, status: str) -> None:
+        # The tool_calls row written by ToolRuntime is the record
+        pass
+
     def check_rate_limit(self, session_id: UUID, tool_name: str) -> bool:
         """
         Check if tool usage exceeds rate limits (calls per minute).
@@ -72,3 +100,123 @@ class ToolGuards:
         
         # All failed -> Break loop
         return False
+
+
+class InMemoryToolGuards:
+    """
+    Process-local backend. Per (session, tool): timestamps of the last MAX_CALLS_PER_MINUTE
+    attempts (sliding window) and the last MAX_CONSECUTIVE_FAILURES statuses.
+    Least recently used keys are dropped past max_keys.
+    """
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        # (session_id, tool_name) -> (attempt times, recent statuses)
+        self._state: "OrderedDict[Tuple[str, str], Tuple[Deque[float], Deque[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, session_id: UUID, tool_name: str, status: str) -> None:
+        key = (str(session_id), tool_name)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                state = (deque(maxlen=MAX_CALLS_PER_MINUTE), deque(maxlen=MAX_CONSECUTIVE_FAILURES))
+                self._state[key] = state
+            self._state.move_to_end(key)
+            state[0].append(time.monotonic())
+            state[1].append(status)
+            while len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+
+    def check_rate_limit(self, session_id: UUID, tool_name: str) -> bool:
+        with self._lock:
+            state = self._state.get((str(session_id), tool_name))
+            if state is None:
+                return True
+            calls = state[0]
+            # Full window whose oldest call is still within the last minute -> over the limit
+            return len(calls) < MAX_CALLS_PER_MINUTE or time.monotonic() - calls[0] >= WINDOW_SECONDS
+
+    def check_loop_breaker(self, session_id: UUID, tool_name: str) -> bool:
+        with self._lock:
+            state = self._state.get((str(session_id), tool_name))
+            if state is None or len(state[1]) < MAX_CONSECUTIVE_FAILURES:
+                return True
+            return any(status == "success" for status in state[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._state.clear()
+
+
+class RedisToolGuards:
+    """
+    Shared backend: a sorted set of attempt times and a capped status list per
+    (session, tool). Redis errors fail open (logged) rather than blocking tools.
+    """
+    def __init__(self, url: str, prefix: str = "victus:guards"):
+        import redis  # optional dependency
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _keys(self, session_id: UUID, tool_name: str) -> Tuple[str, str]:
+        base = f"{self.prefix}:{session_id}:{tool_name}"
+        return f"{base}:calls", f"{base}:statuses"
+
+    def record(self, session_id: UUID, tool_name: str, status: str) -> None:
+        calls_key, statuses_key = self._keys(session_id, tool_name)
+        now = time.time()
+        try:
+            pipe = self.client.pipeline()
+            pipe.zadd(calls_key, {uuid4().hex: now})
+            pipe.zremrangebyscore(calls_key, 0, now - WINDOW_SECONDS)
+            pipe.expire(calls_key, WINDOW_SECONDS)
+            pipe.lpush(statuses_key, status)
+            pipe.ltrim(statuses_key, 0, MAX_CONSECUTIVE_FAILURES - 1)
+            pipe.expire(statuses_key, 24 * 3600)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Guard record failed: {e}")
+
+    def check_rate_limit(self, session_id: UUID, tool_name: str) -> bool:
+        calls_key, _ = self._keys(session_id, tool_name)
+        try:
+            count = self.client.zcount(calls_key, time.time() - WINDOW_SECONDS, "+inf")
+        except Exception as e:
+            logger.warning(f"Guard rate limit check failed: {e}")
+            return True
+        return count < MAX_CALLS_PER_MINUTE
+
+    def check_loop_breaker(self, session_id: UUID, tool_name: str) -> bool:
+        _, statuses_key = self._keys(session_id, tool_name)
+        try:
+            statuses = [s.decode() for s in self.client.lrange(statuses_key, 0, MAX_CONSECUTIVE_FAILURES - 1)]
+        except Exception as e:
+            logger.warning(f"Guard loop check failed: {e}")
+            return True
+        if len(statuses) < MAX_CONSECUTIVE_FAILURES:
+            return True
+        return "success" in statuses
+
+
+_shared_guards = None
+_shared_lock = threading.Lock()
+
+
+def get_tool_guards(db: Session):
+    """
+    Guard backend selected by TOOL_GUARD_BACKEND. The memory/redis backends are process-wide.
+    """
+    global _shared_guards
+    if settings.TOOL_GUARD_BACKEND == "db":
+        return ToolGuards(db)
+
+    with _shared_lock:
+        if _shared_guards is None:
+            if settings.TOOL_GUARD_BACKEND == "redis":
+                try:
+                    _shared_guards = RedisToolGuards(settings.TOOL_GUARD_REDIS_URL)
+                except ImportError:
+                    logger.warning("redis package not installed, using in-memory tool guards")
+            if _shared_guards is None:
+                _shared_guards = InMemoryToolGuards()
+        return _shared_guards
@@ -13,16 +13,22 @@ from .schemas.m365_schemas import (
     ReadEmailsSchema, SendEmailSchema,
     GetCalendarEventsSchema, CreateCalendarEventSchema
 )
+from .circuit_breaker import raise_for_upstream
+from .contracts import ToolError
 from ..m365_auth import get_access_token
 
 BASE_URL = "https://graph.microsoft.com/v1.0"
+# (connect, read) seconds; a hung Graph call must not outlive the tool's latency budget
+GRAPH_TIMEOUT = (5, 15)
+# Latency budget per Graph tool (ToolSpec.timeout_seconds)
+GRAPH_TOOL_BUDGET = 20.0
 
 # --- Core Function Implementations ---
 
 def _read_emails(max_emails: int = 5, folder: str = "inbox") -> str:
     token = get_access_token()
     if not token:
-        return "Authentication failed. The login process must be completed in the terminal."
+        raise ToolError("Authentication failed. The login process must be completed in the terminal.")
 
     # Use a dictionary to map simple names to the official Microsoft Graph API folder IDs
     folder_map = {
@@ -37,7 +43,8 @@ def _read_emails(max_emails: int = 5, folder: str = "inbox") -> str:
     headers = {"Authorization": f"Bearer {token}"}
     endpoint = f"{BASE_URL}/me/mailFolders/{folder_id}/messages?$select=subject,from,receivedDateTime&$orderby=receivedDateTime desc&$top={max_emails}"
     
-    response = requests.get(endpoint, headers=headers)
+    response = requests.get(endpoint, headers=headers, timeout=GRAPH_TIMEOUT)
+    raise_for_upstream("graph", response.status_code, response.text)
     
     if response.status_code == 200:
         emails = response.json().get("value", [])
@@ -46,12 +53,12 @@ def _read_emails(max_emails: int = 5, folder: str = "inbox") -> str:
         summaries = [f"From: {e['from']['emailAddress']['name']}\nSubject: {e['subject']}" for e in emails]
         return "\n\n---\n\n".join(summaries)
     
-    return f"Error reading emails from folder '{folder_id}': {response.text}"
+    raise ToolError(f"Error reading emails from folder '{folder_id}': {response.text}")
 
 def _send_email(to: str, subject: str, content: str = "") -> str:
     token = get_access_token()
     if not token:
-        return "Authentication failed. The login process must be completed in the terminal."
+        raise ToolError("Authentication failed. The login process must be completed in the terminal.")
 
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     email_data = {
@@ -62,13 +69,16 @@ def _send_email(to: str, subject: str, content: str = "") -> str:
         },
         "saveToSentItems": "true"
     }
-    response = requests.post(f"{BASE_URL}/me/sendMail", headers=headers, json=email_data)
-    return "Email sent successfully." if response.status_code == 202 else f"Error sending email: {response.text}"
+    response = requests.post(f"{BASE_URL}/me/sendMail", headers=headers, json=email_data, timeout=GRAPH_TIMEOUT)
+    raise_for_upstream("graph", response.status_code, response.text)
+    if response.status_code != 202:
+        raise ToolError(f"Error sending email: {response.text}")
+    return "Email sent successfully."
 
 def _get_calendar_events(days: int = 7, specific_date: Optional[str] = None) -> str:
     token = get_access_token()
     if not token:
-        return "Authentication failed. The login process must be completed in the terminal."
+        raise ToolError("Authentication failed. The login process must be completed in the terminal.")
 
     headers = {"Authorization": f"Bearer {token}"}
     
@@ -79,7 +89,7 @@ def _get_calendar_events(days: int = 7, specific_date: Optional[str] = None) ->
             start_time = start_dt.isoformat() + "Z"
             end_time = end_dt.isoformat() + "Z"
         except ValueError:
-            return "Error: Please provide the specific_date in YYYY-MM-DD format."
+            raise ToolError("Please provide the specific_date in YYYY-MM-DD format.")
     else:
         start_time = datetime.utcnow().isoformat() + "Z"
         end_time = (datetime.utcnow() + timedelta(days=days)).isoformat() + "Z"
@@ -90,7 +100,8 @@ def _get_calendar_events(days: int = 7, specific_date: Optional[str] = None) ->
         '$select': 'subject,start,end',
         '$orderby': 'start/dateTime'
     }
-    response = requests.get(f"{BASE_URL}/me/calendarview", headers=headers, params=params)
+    response = requests.get(f"{BASE_URL}/me/calendarview", headers=headers, params=params, timeout=GRAPH_TIMEOUT)
+    raise_for_upstream("graph", response.status_code, response.text)
     
     if response.status_code == 200:
         events = response.json().get("value", [])
@@ -126,7 +137,7 @@ def _get_calendar_events(days: int = 7, specific_date: Optional[str] = None) ->
                 details.append(f"- {e['subject']} starting at {e['start']['dateTime']}")
         
         return "Here are the matching events:\n" + "\n".join(details)
-    return f"Error getting calendar events: {response.text}"
+    raise ToolError(f"Error getting calendar events: {response.text}")
 
 def _create_calendar_event(
     subject: str,
@@ -139,20 +150,21 @@ def _create_calendar_event(
 ) -> str:
     token = get_access_token()
     if not token:
-        return "Authentication failed. The login process must be completed in the terminal."
+        raise ToolError("Authentication failed. The login process must be completed in the terminal.")
 
     try:
         start_dt = dateparser.parse(start_time_str)
         end_dt = dateparser.parse(end_time_str)
 
-        if not start_dt or not end_dt:
-            return "Error: Could not understand the start or end time. Please be more specific (e.g., 'today at 5pm', 'August 29 2025 at 10am')."
-
-        # Convert the parsed local time to UTC for the API
-        start_utc = start_dt.astimezone(timezone.utc)
-        end_utc = end_dt.astimezone(timezone.utc)
     except Exception as e:
-        return f"Error parsing date/time: {e}. Please use a clearer format."
+        raise ToolError(f"Error parsing date/time: {e}. Please use a clearer format.")
+
+    if not start_dt or not end_dt:
+        raise ToolError("Could not understand the start or end time. Please be more specific (e.g., 'today at 5pm', 'August 29 2025 at 10am').")
+
+    # Convert the parsed local time to UTC for the API
+    start_utc = start_dt.astimezone(timezone.utc)
+    end_utc = end_dt.astimezone(timezone.utc)
 
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     
@@ -176,14 +188,15 @@ def _create_calendar_event(
     if body:
         event_data["body"] = {"contentType": "Text", "content": body}
 
-    response = requests.post(f"{BASE_URL}/me/events", headers=headers, json=event_data)
+    response = requests.post(f"{BASE_URL}/me/events", headers=headers, json=event_data, timeout=GRAPH_TIMEOUT)
+    raise_for_upstream("graph", response.status_code, response.text)
 
     if response.status_code == 201:
         if attendees:
             return f"Successfully created event '{subject}' and sent invitations to {', '.join(attendees)}."
         return f"Successfully created calendar event: '{subject}'."
     
-    return f"Error creating calendar event: {response.status_code} - {response.text}"
+    raise ToolError(f"Error creating calendar event: {response.status_code} - {response.text}")
 
 # --- Tool Construction ---
 
@@ -192,7 +205,9 @@ read_emails = SafeTool.from_func(
     name="read_emails",
     description="Reads emails from a specified folder in the user's Microsoft Outlook account.",
     args_schema=ReadEmailsSchema,
-    risk_level=RiskLevel.MEDIUM
+    risk_level=RiskLevel.MEDIUM,
+    timeout_seconds=GRAPH_TOOL_BUDGET,
+    cache_ttl_seconds=30
 )
 
 send_email = SafeTool.from_func(
@@ -200,7 +215,8 @@ send_email = SafeTool.from_func(
     name="send_email",
     description="Sends an email from the user's Microsoft Outlook account.",
     args_schema=SendEmailSchema,
-    risk_level=RiskLevel.HIGH
+    risk_level=RiskLevel.HIGH,
+    timeout_seconds=GRAPH_TOOL_BUDGET
 )
 
 get_calendar_events = SafeTool.from_func(
@@ -208,7 +224,9 @@ get_calendar_events = SafeTool.from_func(
     name="get_calendar_events",
     description="Gets events from the user's Microsoft Outlook calendar.",
     args_schema=GetCalendarEventsSchema,
-    risk_level=RiskLevel.MEDIUM
+    risk_level=RiskLevel.MEDIUM,
+    timeout_seconds=GRAPH_TOOL_BUDGET,
+    cache_ttl_seconds=60
 )
 
 create_calendar_event = SafeTool.from_func(
@@ -216,5 +234,6 @@ create_calendar_event = SafeTool.from_func(
     name="create_calendar_event",
     description="Creates a new event in the user's Outlook calendar.",
     args_schema=CreateCalendarEventSchema,
-    risk_level=RiskLevel.HIGH
+    risk_level=RiskLevel.HIGH,
+    timeout_seconds=GRAPH_TOOL_BUDGET
 )
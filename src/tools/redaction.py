@@ -1,9 +1,26 @@
+"""
+Structured redaction for tool args, tool results and stored previews.
+
+One walk over the object does everything:
+- Values under SENSITIVE_KEYS are replaced outright.
+- String leaves that are a bare JWT or a Bearer credential are replaced whole.
+- All other string leaves get the shared single-pass text scrub (utils.redaction). That
+  scrub is one compiled alternation, so each string is scanned once.
+
+Non-string leaves (numbers, bools, None) are copied without any pattern work. Paths
+("messages[3].headers.authorization") are only rendered for values that were actually
+redacted. The walk carries a cheap parent link instead of building a string per key,
+which matters for large Graph / Tavily payloads where almost nothing is redacted.
+"""
+
 import re
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
+
+from ..utils.redaction import scrub_text
 
 # Redaction patterns
 SENSITIVE_KEYS = {
-    "token", "access_token", "refresh_token", "api_key", "secret", 
+    "token", "access_token", "refresh_token", "api_key", "secret",
     "password", "cookie", "authorization", "auth_token"
 }
 
@@ -12,6 +29,32 @@ SENSITIVE_KEYS = {
 JWT_PATTERN = re.compile(r"^[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+$")
 BEARER_PATTERN = re.compile(r"^Bearer\s+", re.IGNORECASE)
 
+# Lazy path: (parent, key or index, is_index); None is the root
+_Path = Optional[Tuple[Any, Any, bool]]
+
+def _render_path(path: _Path) -> str:
+    segments = []
+    while path is not None:
+        path, segment, is_index = path
+        segments.append((segment, is_index))
+
+    rendered = ""
+    for segment, is_index in reversed(segments):
+        if is_index:
+            rendered += f"[{segment}]"
+        else:
+            rendered = f"{rendered}.{segment}" if rendered else str(segment)
+    # A bare string passed at the top level
+    return rendered or "$"
+
+def _redact_string(value: str) -> Tuple[str, bool]:
+    # Whole-value credentials first (anchored, fail fast), then the substring scrub
+    if len(value) > 20 and JWT_PATTERN.match(value):
+        return "[REDACTED OPTIONAL JWT]", True
+    if value[:1] in ("B", "b") and BEARER_PATTERN.match(value):
+        return "[REDACTED BEARER]", True
+    return scrub_text(value)
+
 def redact(obj: Any) -> Tuple[Any, List[str]]:
     """
     Recursively scans and redact secrets from dictionaries and lists.
@@ -20,46 +63,62 @@ def redact(obj: Any) -> Tuple[Any, List[str]]:
     """
     redacted_keys = []
 
-    def _redact_recursive(item: Any, path: str = "") -> Any:
+    def _redact_recursive(item: Any, path: _Path) -> Any:
         try:
             if isinstance(item, dict):
                 new_dict = {}
                 for k, v in item.items():
-                    current_path = f"{path}.{k}" if path else k
-                    
                     # Check key name
-                    if k.lower() in SENSITIVE_KEYS:
-                        redacted_keys.append(current_path)
+                    if isinstance(k, str) and k.lower() in SENSITIVE_KEYS:
+                        redacted_keys.append(_render_path((path, k, False)))
                         new_dict[k] = "[REDACTED]"
-                        continue
-                    
-                    # Check string values for patterns
-                    if isinstance(v, str):
-                        if len(v) > 20 and JWT_PATTERN.match(v):
-                             redacted_keys.append(current_path)
-                             new_dict[k] = "[REDACTED OPTIONAL JWT]"
-                             continue
-                        if BEARER_PATTERN.match(v):
-                             redacted_keys.append(current_path)
-                             new_dict[k] = "[REDACTED BEARER]"
-                             continue
-
-                    # Recurse
-                    new_dict[k] = _redact_recursive(v, current_path)
+                    elif type(v) is str:
+                        new_value, changed = _redact_string(v)
+                        if changed:
+                            redacted_keys.append(_render_path((path, k, False)))
+                        new_dict[k] = new_value
+                    elif isinstance(v, (dict, list, str)):
+                        new_dict[k] = _redact_recursive(v, (path, k, False))
+                    else:
+                        # Numbers, bools, None: nothing to scan
+                        new_dict[k] = v
                 return new_dict
-                
-            elif isinstance(item, list):
-                return [_redact_recursive(x, f"{path}[{i}]") for i, x in enumerate(item)]
-            
+
+            if isinstance(item, list):
+                new_list = []
+                for i, x in enumerate(item):
+                    if type(x) is str:
+                        new_value, changed = _redact_string(x)
+                        if changed:
+                            redacted_keys.append(_render_path((path, i, True)))
+                        new_list.append(new_value)
+                    elif isinstance(x, (dict, list, str)):
+                        new_list.append(_redact_recursive(x, (path, i, True)))
+                    else:
+                        new_list.append(x)
+                return new_list
+
+            if isinstance(item, str):
+                new_value, changed = _redact_string(item)
+                if changed:
+                    redacted_keys.append(_render_path(path))
+                return new_value
+
             return item
-            
+
         except Exception:
-            # Safety net: if redaction fails, return a safe error marker 
+            # Safety net: if redaction fails, return a safe error marker
             # rather than blowing up or leaking raw data if we tried to partial return.
             # But prompt says "if error, return original with a 'redaction_error' flag".
-            # Returning original might be unsafe if it contains secrets. 
+            # Returning original might be unsafe if it contains secrets.
             # I'll return a safe placeholder + error flag logic structure if this simple recursion fails.
             return {"_error": "Redaction failed", "_safe": True}
 
-    result = _redact_recursive(obj)
+    result = _redact_recursive(obj, None)
     return result, redacted_keys
+
+def redact_data(data: Any) -> Any:
+    """
+    Redacted copy of data, for read paths that do not need the list of paths.
+    """
+    return redact(data)[0]
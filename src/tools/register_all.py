@@ -3,6 +3,7 @@ from .contracts import ToolSpec
 from .registry import register_tool
 from .assembler import get_all_tools
 from .base import SafeTool, RiskLevel
+from ..policy.tool_registry import TOOL_POLICY_REGISTRY
 
 def _map_risk_to_spec(tool: SafeTool) -> dict:
     """Heuristic mapping from old RiskLevel to new ToolSpec fields."""
@@ -50,6 +51,12 @@ def _map_risk_to_spec(tool: SafeTool) -> dict:
     else:
         spec["category"] = "other"
         
+    # The policy registry is authoritative where it has an entry
+    # (e.g. get_calendar_events is MEDIUM risk but read-only)
+    policy_meta = TOOL_POLICY_REGISTRY.get(tool.name)
+    if policy_meta:
+        spec.update(policy_meta)
+        
     return spec
 
 def register_all_tools():
@@ -76,7 +83,9 @@ def register_all_tools():
                 destructive=defaults["destructive"],
                 default_action_type=defaults["default_action_type"],
                 default_sensitivity=defaults["default_sensitivity"],
-                default_scope=defaults["default_scope"]
+                default_scope=defaults["default_scope"],
+                timeout_seconds=tool.timeout_seconds,
+                cache_ttl_seconds=tool.cache_ttl_seconds
             )
             
             # Register with the raw function (_func)
@@ -0,0 +1,134 @@
+"""
+Per-process cache of read-only tool results keyed by (user_id, tool_name, canonical args).
+
+Read-only tools (weather, calendar, mail, web search, ...) are often called again with the
+same arguments within minutes. ToolRuntime serves those repeats from here instead of
+calling the upstream again. Only tools with side_effects=False and a cache_ttl_seconds on
+their ToolSpec are cached, and only successful, already redacted results are stored.
+
+Scope, validation, policy and guard checks still run on a hit. The hit is also audited in
+tool_calls with cached=True, so the trail matches what the user saw.
+
+Memory is bounded two ways: an entry count and an approximate byte budget. The size of an
+entry is measured from its serialized result. The least recently used entries are evicted
+first. A successful side-effecting tool invalidates the user's entries in the same
+category, so that for example a new calendar event is visible on the next read.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+from ..observability.metrics import TOOL_RESULT_CACHE_TOTAL
+
+# (user_id, tool_name, canonical args)
+ResultKey = Tuple[str, str, str]
+
+
+class CachedResult(NamedTuple):
+    data: Any
+    redactions_applied: List[str]
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    category: str
+    size: int
+    result: CachedResult
+
+
+def canonical_args(args: Dict[str, Any]) -> str:
+    """
+    Stable string form of validated args: key order and whitespace do not matter.
+    """
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[ResultKey, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, user_id: Any, tool_name: str, args: Dict[str, Any]) -> Optional[CachedResult]:
+        if not self.enabled:
+            return None
+        key = (str(user_id), tool_name, canonical_args(args))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry.expires_at:
+                self._entries.move_to_end(key)
+                TOOL_RESULT_CACHE_TOTAL.labels(tool_name=tool_name, result="hit").inc()
+                return entry.result
+            if entry:
+                self._remove(key)
+        TOOL_RESULT_CACHE_TOTAL.labels(tool_name=tool_name, result="miss").inc()
+        return None
+
+    def put(
+        self,
+        user_id: Any,
+        tool_name: str,
+        category: str,
+        args: Dict[str, Any],
+        ttl_seconds: float,
+        result: CachedResult
+    ) -> None:
+        if not self.enabled or ttl_seconds <= 0:
+            return
+        size = len(json.dumps(result.data, default=str))
+        if size > self.max_bytes:
+            # A single oversized payload would flush everything else
+            TOOL_RESULT_CACHE_TOTAL.labels(tool_name=tool_name, result="too_large").inc()
+            return
+        key = (str(user_id), tool_name, canonical_args(args))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(time.monotonic() + ttl_seconds, category, size, result)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, _ = next(iter(self._entries.items()))
+                self._remove(evicted_key)
+                TOOL_RESULT_CACHE_TOTAL.labels(tool_name=evicted_key[1], result="evicted").inc()
+
+    def invalidate_category(self, user_id: Any, category: str) -> None:
+        """
+        Drops a user's cached reads in a category after a write to it.
+        """
+        user_id = str(user_id)
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if k[0] == user_id and e.category == category]:
+                self._remove(key)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: ResultKey) -> None:
+        # Caller holds the lock
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+# Global instance
+result_cache = ToolResultCache(
+    max_entries=settings.TOOL_RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.TOOL_RESULT_CACHE_MAX_BYTES
+)
@@ -1,25 +1,67 @@
+import asyncio
+import concurrent.futures
+import contextvars
 import logging
+import threading
 import traceback
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from uuid import UUID, uuid4
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
 
 from sqlalchemy.orm import Session
 from pydantic import ValidationError
 
-from .contracts import ToolResult
+from .contracts import ToolResult, ToolSpec
 from .registry import get_tool
 from .redaction import redact
-from .guards import ToolGuards
+from .guards import get_tool_guards
 from ..policy.contracts import PolicyCheck
 from ..policy.service import check_and_record_policy
 from ..models.tool_call import ToolCall
 from ..models.user import User
 from ..models.session import Session as SessionModel
 from ..security.scopes import Scope, ScopeSet
+from ..security.scope_cache import scope_cache
+from ..db.unit_of_work import best_effort, checkpoint
+from ..config import settings
+from .audit import audit_sink
+from .circuit_breaker import UPSTREAM_FAILURES, CircuitBreaker, get_breaker
+from .result_cache import CachedResult, result_cache
 
 logger = logging.getLogger(__name__)
 
+# Blocking tools run here, so a burst of slow tools cannot exhaust the default executor
+# that asyncio.to_thread (DB work) relies on.
+TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=settings.TOOL_THREAD_POOL_SIZE, thread_name_prefix="tool")
+
+# Coroutine tools called from sync code run on one long-lived loop. A fresh asyncio.run()
+# per call would close the loop that loop-bound resources (tools.config's HTTP client) use.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="tool-loop", daemon=True).start()
+    return _sync_loop
+
+
+class _PreparedCall(NamedTuple):
+    """
+    A tool call that passed registry, scope, validation, policy and guard checks.
+    """
+    tool_spec: ToolSpec
+    tool_func: Callable
+    clean_args: Dict[str, Any]
+    redacted_args: Dict[str, Any]
+    policy_decision_id: Optional[UUID]
+    start_time: float
+
 class ToolRuntime:
     def execute(
         self, 
@@ -29,11 +71,153 @@ class ToolRuntime:
         args_dict: Dict[str, Any], 
         db: Session,
         intent_summary: Optional[str] = None,
-        trace: Optional[Any] = None
+        trace: Optional[Any] = None,
+        on_phase: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ) -> ToolResult:
         """
         The ONLY supported way to execute tools.
-        Enforces: Registry -> Validation -> Policy -> Guards -> Execution -> Redaction -> Persistence.
+        Enforces: Registry -> Validation -> Policy -> Guards -> Cache -> Execution -> Redaction -> Persistence.
+        on_phase, if given, is called with ("policy", {...}) once the policy decision is made.
+        Blocking variant for sync callers (LangChain SafeTool._run); async callers use aexecute.
+        """
+        call = self._prepare(user_id, session_id, tool_name, args_dict, db, intent_summary, on_phase)
+        if isinstance(call, ToolResult):
+            return call
+        
+        cached = self._cache_lookup(user_id, call)
+        if cached:
+            return self._complete_cached(db, user_id, session_id, call, cached)
+        
+        breaker = get_breaker(tool_name)
+        if not breaker.allow():
+            return self._fail(db, user_id, session_id, call, self._circuit_open_message(tool_name))
+        
+        timeout = self._timeout_for(call.tool_spec)
+        try:
+            if asyncio.iscoroutinefunction(call.tool_func):
+                future = asyncio.run_coroutine_threadsafe(
+                    asyncio.wait_for(call.tool_func(**call.clean_args), timeout), _get_sync_loop()
+                )
+                result_data = future.result()
+            else:
+                future = TOOL_EXECUTOR.submit(contextvars.copy_context().run, partial(call.tool_func, **call.clean_args))
+                try:
+                    result_data = future.result(timeout=timeout)
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    raise
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            breaker.record_failure()
+            logger.warning(f"Tool timed out: {tool_name} after {timeout}s")
+            return self._timed_out(db, user_id, session_id, call, timeout)
+        except Exception as e:
+            # Runtime error
+            self._record_outcome(breaker, e)
+            logger.error(f"Tool execution failed: {tool_name} {traceback.format_exc()}")
+            return self._fail(db, user_id, session_id, call, f"Execution Error: {str(e)}") # Safe string
+        
+        breaker.record_success()
+        return self._complete(db, user_id, session_id, call, result_data)
+
+    async def aexecute(
+        self, 
+        user_id: UUID, 
+        session_id: UUID, 
+        tool_name: str, 
+        args_dict: Dict[str, Any], 
+        db: Session,
+        intent_summary: Optional[str] = None,
+        trace: Optional[Any] = None,
+        on_phase: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> ToolResult:
+        """
+        Async variant of execute. Coroutine tools are awaited on the loop; blocking tools run
+        in the bounded tool thread pool. DB work (policy, audit) is offloaded to worker threads.
+        A timeout or cancellation is recorded as an error; a blocking tool cannot be interrupted,
+        its thread is abandoned and its result discarded. A side-effecting tool that times out
+        may still complete, so its outcome is recorded as "unknown" rather than failed.
+        """
+        call = await asyncio.to_thread(
+            self._prepare, user_id, session_id, tool_name, args_dict, db, intent_summary, on_phase
+        )
+        if isinstance(call, ToolResult):
+            return call
+        
+        cached = self._cache_lookup(user_id, call)
+        if cached:
+            return await asyncio.to_thread(self._complete_cached, db, user_id, session_id, call, cached)
+        
+        breaker = get_breaker(tool_name)
+        if not breaker.allow():
+            return await asyncio.to_thread(
+                self._fail, db, user_id, session_id, call, self._circuit_open_message(tool_name)
+            )
+        
+        timeout = self._timeout_for(call.tool_spec)
+        try:
+            if asyncio.iscoroutinefunction(call.tool_func):
+                pending = call.tool_func(**call.clean_args)
+            else:
+                loop = asyncio.get_running_loop()
+                pending = loop.run_in_executor(
+                    TOOL_EXECUTOR, contextvars.copy_context().run, partial(call.tool_func, **call.clean_args)
+                )
+            result_data = await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            logger.warning(f"Tool timed out: {tool_name} after {timeout}s")
+            return await asyncio.to_thread(self._timed_out, db, user_id, session_id, call, timeout)
+        except asyncio.CancelledError:
+            # Caller went away; still leave an audit row
+            breaker.release()
+            await asyncio.shield(asyncio.to_thread(self._fail, db, user_id, session_id, call, "Cancelled"))
+            raise
+        except Exception as e:
+            self._record_outcome(breaker, e)
+            logger.error(f"Tool execution failed: {tool_name} {traceback.format_exc()}")
+            return await asyncio.to_thread(
+                self._fail, db, user_id, session_id, call, f"Execution Error: {str(e)}"
+            )
+        
+        breaker.record_success()
+        return await asyncio.to_thread(self._complete, db, user_id, session_id, call, result_data)
+
+    def _timeout_for(self, tool_spec: ToolSpec) -> float:
+        # Latency budget declared on the spec, else the global default
+        return tool_spec.timeout_seconds or settings.TOOL_TIMEOUT_SECONDS
+
+    def _record_outcome(self, breaker: CircuitBreaker, error: Exception) -> None:
+        # Only upstream trouble trips the breaker; other errors mean the upstream answered
+        if isinstance(error, UPSTREAM_FAILURES):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _circuit_open_message(self, tool_name: str) -> str:
+        return f"Circuit open: {tool_name} is failing upstream, try again shortly"
+
+    def _cacheable(self, tool_spec: ToolSpec) -> bool:
+        return not tool_spec.side_effects and bool(tool_spec.cache_ttl_seconds)
+
+    def _cache_lookup(self, user_id: UUID, call: "_PreparedCall") -> Optional[CachedResult]:
+        # Keyed on validated args, so defaults and coercion do not split entries
+        if not self._cacheable(call.tool_spec):
+            return None
+        return result_cache.get(user_id, call.tool_spec.name, call.clean_args)
+
+    def _prepare(
+        self,
+        user_id: UUID,
+        session_id: UUID,
+        tool_name: str,
+        args_dict: Dict[str, Any],
+        db: Session,
+        intent_summary: Optional[str],
+        on_phase: Optional[Callable[[str, Dict[str, Any]], None]]
+    ) -> Union[ToolResult, "_PreparedCall"]:
+        """
+        Steps 1-5: registry, scopes, validation, policy, guards.
+        Returns a ToolResult if the call stops here, else what is needed to run the tool.
         """
         start_time = time.time()
         
@@ -50,32 +234,31 @@ class ToolRuntime:
         tool_spec, tool_func = tool_entry
 
         # 1.5 Scope Check
-        # Fetch user/session to check scopes
-        # Using db session passed in.
-        
-        # We need to efficiently fetch only scopes potentially?
-        # For now, fetching objects is fine.
-        db_user = db.query(User).filter(User.id == user_id).first()
-        db_session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        # Effective scopes are cached per (user, session); only a miss loads the rows.
+        effective_scopes_list = scope_cache.get(user_id, session_id)
+        if effective_scopes_list is None:
+            db_user = db.query(User).filter(User.id == user_id).first()
+            db_session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
 
-        if not db_user:
-             # Should not happen if authenticated, but safety
-             return self._record_and_return_error(
-                db, user_id, session_id, tool_name, args_dict,
-                "User not found for scope check",
-                "denied",
-                start_time
-            )
-            
-        # Determine effective scopes
-        # Default to User scopes, override if Session has specific override (optional)
-        # Assuming user.scopes is list of strings
-        user_scopes = db_user.scopes or []
-        # If session override exists, it MIGHT replace or append. 
-        # Requirement: "per-session restrictions (optional override)". 
-        # Usually override means "use this instead". Or it restricts?
-        # Safe default: if override, use it. If not, use user.
-        effective_scopes_list = db_session.scopes_override if (db_session and db_session.scopes_override is not None) else user_scopes
+            if not db_user:
+                 # Should not happen if authenticated, but safety
+                 return self._record_and_return_error(
+                    db, user_id, session_id, tool_name, args_dict,
+                    "User not found for scope check",
+                    "denied",
+                    start_time
+                )
+                
+            # Determine effective scopes
+            # Default to User scopes, override if Session has specific override (optional)
+            # Assuming user.scopes is list of strings
+            user_scopes = db_user.scopes or []
+            # If session override exists, it MIGHT replace or append. 
+            # Requirement: "per-session restrictions (optional override)". 
+            # Usually override means "use this instead". Or it restricts?
+            # Safe default: if override, use it. If not, use user.
+            effective_scopes_list = db_session.scopes_override if (db_session and db_session.scopes_override is not None) else user_scopes
+            scope_cache.put(user_id, session_id, effective_scopes_list)
         
         scope_set = ScopeSet.from_list(effective_scopes_list)
         
@@ -124,6 +307,8 @@ class ToolRuntime:
         )
         
         policy_decision = check_and_record_policy(policy_check, db)
+        if on_phase:
+            on_phase("policy", {"tool": tool_name, "decision": policy_decision.decision})
         
         # 4. Handle Policy Decision
         if policy_decision.decision == "DENY":
@@ -145,6 +330,7 @@ class ToolRuntime:
             from ..models.policy import PendingConfirmationModel
             pending = db.query(PendingConfirmationModel).filter(
                              PendingConfirmationModel.session_id == session_id,
+                             PendingConfirmationModel.tool_name == tool_name,
                              PendingConfirmationModel.status == "pending",
                              # created recently?
                       ).order_by(PendingConfirmationModel.created_at.desc()).first()
@@ -169,7 +355,7 @@ class ToolRuntime:
             )
 
         # 5. Guards (Rate Limits & Loops)
-        guards = ToolGuards(db)
+        guards = get_tool_guards(db)
         if not guards.check_rate_limit(session_id, tool_name):
              return self._record_and_return_error(
                 db, user_id, session_id, tool_name, redacted_args,
@@ -188,52 +374,85 @@ class ToolRuntime:
                 policy_decision_id=policy_decision.id
             )
 
-        # 6. Execution
-        try:
-            # We assume tool_func takes simple args or dependency injection is handled outside runtime OR 
-            # we need to inject DB if the tool expects it?
-            # Prompt: "If tools use DB, inject via dependency, not global engine creation."
-            # "Tool callable must not receive raw DB sessions unless your existing tools require it."
-            
-            # We'll pass validated args. If tool needs 'db', we might need introspection or convention.
-            # For now, simplistic **clean_args call.
-            
-            # NOTE: If we are wrapping existing tools, they might expect specific signatures.
-            # We assume existing tool adapter (Step 6G) handles signature matching.
-            
-            result_data = tool_func(**clean_args)
-            
-            # 7. Redaction of Result
-            redacted_result, result_redactions = redact(result_data)
-            
-            # 8. Success Persistence
-            self._persist_tool_call(
-                db, user_id, session_id, tool_name, redacted_args, 
-                redacted_result, 
-                "success", 
-                int((time.time() - start_time) * 1000)
-            )
-            
-            return ToolResult(
-                status="success",
-                data=redacted_result if isinstance(redacted_result, dict) else {"result": redacted_result},
-                latency_ms=int((time.time() - start_time) * 1000),
-                redactions_applied=result_redactions,
-                policy_decision_id=policy_decision.id
-            )
+        # Durability point: the decision (and any consumed confirmation) must be committed
+        # before an irreversible action, even when the turn batches its writes.
+        if tool_spec.side_effects:
+            checkpoint(db)
+        
+        return _PreparedCall(tool_spec, tool_func, clean_args, redacted_args, policy_decision.id, start_time)
 
-        except Exception as e:
-            # Runtime error
-            trace = traceback.format_exc()
-            logger.error(f"Tool execution failed: {tool_name} {trace}")
-            
-            return self._record_and_return_error(
-                db, user_id, session_id, tool_name, redacted_args,
-                f"Execution Error: {str(e)}", # Safe string
-                "error",
-                start_time,
-                policy_decision_id=policy_decision.id
+    def _complete(self, db: Session, user_id: UUID, session_id: UUID, call: "_PreparedCall", result_data: Any) -> ToolResult:
+        # 7. Redaction of Result
+        redacted_result, result_redactions = redact(result_data)
+        
+        # 7.5 Result cache: store read-only results, drop reads made stale by a write
+        tool_spec = call.tool_spec
+        if self._cacheable(tool_spec):
+            result_cache.put(
+                user_id, tool_spec.name, tool_spec.category, call.clean_args,
+                tool_spec.cache_ttl_seconds, CachedResult(redacted_result, result_redactions)
             )
+        elif tool_spec.side_effects:
+            result_cache.invalidate_category(user_id, tool_spec.category)
+        
+        # 8. Success Persistence
+        self._persist_tool_call(
+            db, user_id, session_id, call.tool_spec.name, call.redacted_args, 
+            redacted_result, 
+            "success", 
+            int((time.time() - call.start_time) * 1000)
+        )
+        
+        return ToolResult(
+            status="success",
+            data=redacted_result if isinstance(redacted_result, dict) else {"result": redacted_result},
+            latency_ms=int((time.time() - call.start_time) * 1000),
+            redactions_applied=result_redactions,
+            policy_decision_id=call.policy_decision_id
+        )
+
+    def _complete_cached(self, db: Session, user_id: UUID, session_id: UUID, call: "_PreparedCall", cached: CachedResult) -> ToolResult:
+        # A hit is still a tool call as far as the audit trail is concerned
+        latency = int((time.time() - call.start_time) * 1000)
+        self._persist_tool_call(
+            db, user_id, session_id, call.tool_spec.name, call.redacted_args,
+            cached.data,
+            "success",
+            latency,
+            cached=True
+        )
+        
+        return ToolResult(
+            status="success",
+            data=cached.data if isinstance(cached.data, dict) else {"result": cached.data},
+            latency_ms=latency,
+            redactions_applied=list(cached.redactions_applied),
+            policy_decision_id=call.policy_decision_id,
+            cached=True
+        )
+
+    def _fail(self, db: Session, user_id: UUID, session_id: UUID, call: "_PreparedCall", error_msg: str) -> ToolResult:
+        return self._record_and_return_error(
+            db, user_id, session_id, call.tool_spec.name, call.redacted_args,
+            error_msg,
+            "error",
+            call.start_time,
+            policy_decision_id=call.policy_decision_id
+        )
+
+    def _timed_out(self, db: Session, user_id: UUID, session_id: UUID, call: "_PreparedCall", timeout: float) -> ToolResult:
+        tool_name = call.tool_spec.name
+        if not call.tool_spec.side_effects:
+            return self._fail(db, user_id, session_id, call, f"Timeout: {tool_name} exceeded {timeout}s")
+        # The abandoned call can still land (email sent, event created); a retry could repeat it
+        return self._record_and_return_error(
+            db, user_id, session_id, tool_name, call.redacted_args,
+            f"Outcome unknown: {tool_name} did not finish within {timeout}s and may still complete. "
+            "Check before retrying.",
+            "unknown",
+            call.start_time,
+            policy_decision_id=call.policy_decision_id
+        )
 
     def _record_and_return_error(
         self, db, user_id, session_id, tool_name, args, error_msg, status, start_time, policy_decision_id=None
@@ -257,7 +476,25 @@ class ToolRuntime:
             policy_decision_id=policy_decision_id
         )
 
-    def _persist_tool_call(self, db, user_id, session_id, tool_name, args, result, status, latency):
+    def _persist_tool_call(self, db, user_id, session_id, tool_name, args, result, status, latency, cached=False):
+        # Guards count every persisted attempt, whichever backend is active
+        get_tool_guards(db).record(session_id, tool_name, status)
+        
+        if settings.TOOL_AUDIT_ASYNC and audit_sink.running:
+            # Off the request path; the background writer bulk-inserts it
+            audit_sink.enqueue({
+                "id": str(uuid4()),
+                "session_id": str(session_id),
+                "user_id": str(user_id),
+                "tool_name": tool_name,
+                "args": args,
+                "result": result,
+                "status": status,
+                "latency_ms": latency,
+                "cached": cached
+            })
+            return
+        
         try:
             # Ensure args and result are JSON serializable (dicts).
             # If result is not dict, wrap it?
@@ -275,10 +512,10 @@ class ToolRuntime:
                 args=args, # Correct column name
                 result=result, # Correct column name is 'result'
                 status=status,
-                latency_ms=latency # Assuming model has latency_ms or we check model definition again
+                latency_ms=latency, # Assuming model has latency_ms or we check model definition again
+                cached=cached
             )
-            db.add(call)
-            db.commit()
+            with best_effort(db):
+                db.add(call)
         except Exception as e:
             logger.error(f"Failed to persist tool call: {e}")
-            db.rollback()
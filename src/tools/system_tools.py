@@ -389,7 +389,8 @@ list_files = SafeTool.from_func(
     name="list_files",
     description="Lists files and directories in a specified location.",
     args_schema=ListFilesSchema,
-    risk_level=RiskLevel.LOW
+    risk_level=RiskLevel.LOW,
+    cache_ttl_seconds=15
 )
 
 open_app = SafeTool.from_func(
@@ -437,5 +438,6 @@ get_system_info = SafeTool.from_func(
     name="get_system_info",
     description="Returns information about the current system.",
     args_schema=GetSystemInfoSchema,
-    risk_level=RiskLevel.LOW
+    risk_level=RiskLevel.LOW,
+    cache_ttl_seconds=60
 )
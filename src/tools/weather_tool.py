@@ -6,16 +6,18 @@ import httpx
 from datetime import datetime
 
 from ..config import settings
-from .config import async_client
+from .config import get_async_client
 
 # Refactor: Use SafeTool and local schemas
 from .base import SafeTool, RiskLevel
 from .schemas.weather_schemas import GetWeatherInfoSchema
+from .circuit_breaker import raise_for_upstream
+from .contracts import ToolError
 
 async def _get_weather_info(location: str, num_days: int = 1) -> str:
     api_key = settings.OPENWEATHER_API_KEY
     if not api_key:
-        return "Error: OpenWeatherMap API key is not set. Please add it to your .env file."
+        raise ToolError("OpenWeatherMap API key is not set. Please add it to your .env file.")
 
     base_url = "http://api.openweathermap.org/data/2.5"
     num_days = min(num_days, 5)
@@ -24,7 +26,7 @@ async def _get_weather_info(location: str, num_days: int = 1) -> str:
         if num_days <= 1:
             # Get Current Weather
             url = f"{base_url}/weather?q={location}&appid={api_key}&units=metric"
-            response = await async_client.get(url)
+            response = await get_async_client().get(url)
             response.raise_for_status()
             data = response.json()
             
@@ -43,7 +45,7 @@ async def _get_weather_info(location: str, num_days: int = 1) -> str:
         else:
             # Get 5-Day / 3-Hour Forecast and process it for daily summary
             url = f"{base_url}/forecast?q={location}&appid={api_key}&units=metric"
-            response = await async_client.get(url)
+            response = await get_async_client().get(url)
             response.raise_for_status()
             data = response.json()
             
@@ -80,12 +82,17 @@ async def _get_weather_info(location: str, num_days: int = 1) -> str:
                 
             return "\n".join(forecast_summary)
 
+    except httpx.TimeoutException:
+        # Counted by the circuit breaker
+        raise
     except httpx.HTTPStatusError as http_err:
+        # Let the circuit breaker see upstream outages
+        raise_for_upstream("openweathermap", http_err.response.status_code)
         if http_err.response.status_code == 404:
-            return f"Error: Could not find weather data for '{location}'. Please check the spelling."
-        return f"HTTP error occurred: {http_err}"
-    except Exception as e:
-        return f"An unexpected error occurred: {e}"
+            raise ToolError(f"Could not find weather data for '{location}'. Please check the spelling.")
+        raise ToolError(f"HTTP error occurred: {http_err}")
+    except (KeyError, ValueError) as e:
+        raise ToolError(f"Unexpected weather data: {e}")
 
 # --- Tool Construction ---
 
@@ -94,5 +101,7 @@ get_weather_info = SafeTool.from_func(
     name="get_weather_info",
     description="Provides the current weather or a multi-day forecast.",
     args_schema=GetWeatherInfoSchema,
-    risk_level=RiskLevel.LOW
+    risk_level=RiskLevel.LOW,
+    timeout_seconds=12.0,  # the shared HTTP client times out at 10s per request
+    cache_ttl_seconds=600  # OpenWeatherMap updates roughly every 10 minutes
 )
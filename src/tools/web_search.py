@@ -40,7 +40,8 @@ def _get_web_search_tool() -> Optional[SafeTool]:
             name="web_search",
             description="Performs a web search to find information.",
             args_schema=WebSearchSchema,
-            risk_level=RiskLevel.LOW
+            risk_level=RiskLevel.LOW,
+            cache_ttl_seconds=300
         )
         
     except Exception as e:
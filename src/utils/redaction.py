@@ -1,10 +1,11 @@
 import re
+from typing import Any, Tuple
 
 class Redacter:
     """
     Utility to redact sensitive information from text.
     """
-    
+
     # Simple regex patterns for common secrets
     PATTERNS = [
         (r"sk-[a-zA-Z0-9]{20,}T3BlbkFJ[a-zA-Z0-9]{20,}", "[REDACTED_OPENAI_KEY]"), # OpenAI key lookalike
@@ -21,25 +22,62 @@ class Redacter:
     def redact(text: str) -> str:
         if not text:
             return text
-        for pattern, replacement in Redacter.PATTERNS:
-            text = re.sub(pattern, replacement, text)
-        return text
+        return scrub_text(text)[0]
+
+# Every pattern starts with one of these literals. A plain substring check for them is
+# far cheaper than any regex, and almost no string contains one.
+SECRET_TRIGGERS = ("sk-", "ghp_", "Bearer ", "assword=")
+# Shortest string any pattern can match ("password="); shorter strings skip the scan
+MIN_SECRET_LENGTH = 9
+
+# All patterns compiled into one alternation, so a candidate string is scanned once instead
+# of once per pattern. Earlier alternatives win at the same position, which matches applying
+# PATTERNS in order. Non-capturing groups keep the first-character prefilter that sre builds
+# for the alternation (named groups would disable it).
+SECRET_PATTERN = re.compile("|".join(f"(?:{pattern})" for pattern, _ in Redacter.PATTERNS))
+_RULES = [(re.compile(pattern), replacement) for pattern, replacement in Redacter.PATTERNS]
+
+def _replacement(match: "re.Match") -> str:
+    # The first rule that matches the whole hit is the alternative that produced it
+    secret = match.group()
+    for rule, replacement in _RULES:
+        if rule.fullmatch(secret):
+            return replacement
+    return "[REDACTED]"
+
+def scrub_text(text: str) -> Tuple[str, bool]:
+    """
+    Single-pass redaction of a string. Returns the text and whether anything was replaced.
+    """
+    if len(text) < MIN_SECRET_LENGTH:
+        return text, False
+    for trigger in SECRET_TRIGGERS:
+        if trigger in text:
+            break
+    else:
+        return text, False
+    redacted, count = SECRET_PATTERN.subn(_replacement, text)
+    return redacted, count > 0
 
 def redact_text(text: str) -> str:
     return Redacter.redact(text)
 
+def _redact_value(value: Any) -> Any:
+    # Non-string leaves are returned as-is without any pattern work
+    if type(value) is str:
+        return scrub_text(value)[0]
+    if isinstance(value, dict):
+        return {k: _redact_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact_value(v) for v in value]
+    if isinstance(value, str):
+        return scrub_text(value)[0]
+    return value
+
 def redact_dict(data: dict) -> dict:
     """
     Recursively redact string values in a dictionary.
     """
     if not data:
         return data
-    new_data = data.copy()
-    for k, v in new_data.items():
-        if isinstance(v, str):
-            new_data[k] = redact_text(v)
-        elif isinstance(v, dict):
-            new_data[k] = redact_dict(v)
-        elif isinstance(v, list):
-            new_data[k] = [redact_dict(i) if isinstance(i, dict) else redact_text(i) if isinstance(i, str) else i for i in v]
-    return new_data
+    return _redact_value(data)
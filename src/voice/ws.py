@@ -113,7 +113,7 @@ class VoiceSession:
         # OR better: pass trace_id to orchestrator. 
         # Orchestrator signature doesn't take trace_id. 
         
-        orch_resp = self.orchestrator.handle_user_utterance(
+        orch_resp = await self.orchestrator.ahandle_user_utterance(
             db=self.db,
             user_id=self.user.id,
             session_id=session_id,
@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+from src.agent import fast_path
+from src.agent.intent_parser import parse_intent
+
+def test_weather_with_location():
+    intent = fast_path.classify("what's the weather in Pune")
+    assert intent.name == "get_weather_info"
+    assert intent.slots == {"location": "Pune"}
+    assert intent.confidence >= 0.9
+
+def test_calendar_days_slot():
+    intent = fast_path.classify("check my calendar for 3 days")
+    assert intent.name == "get_calendar_events"
+    assert intent.slots["days"] == 3
+    assert intent.confidence >= 0.9
+
+def test_personal_location_is_low_confidence():
+    # "home" must be resolved from memory by the LLM
+    intent = fast_path.classify("weather at home")
+    assert intent.confidence < 0.9
+
+def test_write_and_compound_requests_not_classified():
+    assert fast_path.classify("schedule a meeting with Bob tomorrow") is None
+    assert fast_path.classify("send an email to bob") is None
+    assert fast_path.classify("check the weather and my calendar") is None
+
+def test_parse_intent_skips_llm_on_hit():
+    with patch("src.agent.intent_parser.chain") as mock_chain:
+        intent = parse_intent("read my emails")
+        assert intent.name == "read_emails"
+        mock_chain.invoke.assert_not_called()
+
+def test_write_verbs_never_fast_pathed():
+    for utterance in [
+        "schedule meeting with Bob tomorrow at 3pm",
+        "set a meeting tomorrow",
+        "reschedule my meeting tomorrow",
+        "mark my emails as read",
+        "archive all emails in inbox",
+        "move my 3pm meeting",
+        "flag the email from Alice",
+    ]:
+        assert fast_path.classify(utterance) is None, utterance
+
+def test_schedule_as_noun_is_still_a_read():
+    intent = fast_path.classify("what's on my schedule today")
+    assert intent.name == "get_calendar_events"
+    assert intent.confidence >= 0.9
+
+def test_unparsed_qualifier_stays_below_threshold():
+    # The sender cannot be expressed as a slot; the LLM must not be skipped
+    intent = fast_path.classify("any emails from Bob?")
+    assert intent.name == "read_emails"
+    assert intent.confidence < 0.9
+    assert fast_path.classify("do I have meetings about the launch this week").confidence < 0.9
+
+def test_bare_nouns_without_read_phrasing_not_classified():
+    assert fast_path.classify("meeting tomorrow 3pm") is None
+    assert fast_path.classify("email Bob tomorrow") is None
+
+def test_system_info_needs_a_metric():
+    assert fast_path.classify("what's my cpu usage").name == "get_system_info"
+    assert fast_path.classify("check battery level").name == "get_system_info"
+    for utterance in [
+        "what did Ram say about the launch",
+        "how much ram should I buy",
+        "which cpu is faster",
+        "buy a new battery",
+    ]:
+        assert fast_path.classify(utterance) is None, utterance
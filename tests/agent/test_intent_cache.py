@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+from src.agent.contracts import Intent
+from src.agent.intent_cache import IntentCache, normalize_utterance, intent_cache
+from src.agent.intent_parser import parse_intent
+
+def test_normalized_variants_share_entry():
+    cache = IntentCache(max_entries=10, ttl_seconds=60)
+    cache.put("Read my emails!", "fp", Intent(name="read_emails", confidence=0.9))
+    
+    hit = cache.get("  read my EMAILS ", "fp")
+    assert hit is not None and hit.name == "read_emails"
+    # Different context fingerprint is a different key
+    assert cache.get("read my emails", "other-fp") is None
+    assert normalize_utterance("What's on, today?") == "what s on today"
+
+def test_ttl_expiry():
+    now = [100.0]
+    cache = IntentCache(max_entries=10, ttl_seconds=60, clock=lambda: now[0])
+    cache.put("read my emails", "fp", Intent(name="read_emails"))
+    now[0] += 60
+    assert cache.get("read my emails", "fp") is not None
+    now[0] += 1
+    assert cache.get("read my emails", "fp") is None
+
+def test_lru_eviction():
+    cache = IntentCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "fp", Intent(name="a"))
+    cache.put("b", "fp", Intent(name="b"))
+    cache.get("a", "fp") # a is now most recent
+    cache.put("c", "fp", Intent(name="c"))
+    
+    assert cache.get("b", "fp") is None
+    assert cache.get("a", "fp") is not None
+
+def test_parse_intent_serves_repeat_from_cache():
+    intent_cache.clear()
+    llm_intent = Intent(name="unknown", confidence=0.4)
+    with patch("src.agent.intent_parser.chain") as mock_chain:
+        mock_chain.invoke.return_value = llm_intent
+        
+        first = parse_intent("remind me to stretch", context_fingerprint="fp")
+        second = parse_intent("Remind me to stretch.", context_fingerprint="fp")
+        
+        assert mock_chain.invoke.call_count == 1
+        assert first.name == second.name == "unknown"
+
+def test_semantic_embedding_errors_are_misses():
+    def failing_embed(texts):
+        raise RuntimeError("provider down")
+    cache = IntentCache(max_entries=10, ttl_seconds=60, embed_fn=failing_embed)
+    
+    # put stores the entry without a vector; get falls back to a miss
+    cache.put("read my emails", "fp", Intent(name="read_emails"))
+    assert cache.get("read my emails", "fp").name == "read_emails"
+    assert cache.get("show my inbox", "fp") is None
@@ -1,7 +1,8 @@
+import asyncio
 import pytest
 from uuid import uuid4
 from unittest.mock import patch
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from src.database import settings
@@ -10,6 +11,7 @@ from src.agent.contracts import Intent
 from src.models.user import User
 from src.models.session import Session
 from src.models.message import Message
+from src.models.tool_execution import AgentMessage
 from src.models.policy import PendingConfirmationModel
 
 # Setup DB
@@ -80,7 +82,7 @@ def test_orchestrator_happy_path(db):
         confidence=1.0
     )
     
-    with patch("src.agent.orchestrator.parse_intent", return_value=mock_intent):
+    with patch("src.agent.orchestrator.aparse_intent", return_value=mock_intent):
         # We manually patched registry in fixture, so get_system_info exists.
         
         response = orchestrator.handle_user_utterance(
@@ -115,7 +117,7 @@ def test_orchestrator_ambiguity(db):
         clarifying_question="When is the meeting?"
     )
     
-    with patch("src.agent.orchestrator.parse_intent", return_value=mock_intent):
+    with patch("src.agent.orchestrator.aparse_intent", return_value=mock_intent):
         response = orchestrator.handle_user_utterance(
             db=db,
             user_id=db.test_user_id,
@@ -173,11 +175,11 @@ def test_orchestrator_confirmation_loop(db):
         }
     }
 
-    with patch("src.agent.orchestrator.parse_intent", return_value=mock_intent), \
+    with patch("src.agent.orchestrator.aparse_intent", return_value=mock_intent), \
          patch.dict("src.agent.planner.INTENTS", new_catalog):
          
         # Mock Runtime Execute to force needs_confirmation on first call
-        with patch.object(orchestrator.tool_runtime, "execute") as mock_exec:
+        with patch.object(orchestrator.tool_runtime, "aexecute") as mock_exec:
             from src.tools.contracts import ToolResult
             
             # Call 1: Needs Confirmation
@@ -227,3 +229,255 @@ def test_orchestrator_confirmation_loop(db):
             
             assert "Done. Nuked" in response2.assistant_text
 
+
+@pytest.mark.asyncio
+async def test_orchestrator_async_path(db):
+    """
+    The async pipeline can be awaited directly from a running event loop.
+    """
+    orchestrator = AgentOrchestrator()
+    
+    mock_intent = Intent(
+        name="get_system_info",
+        slots={},
+        confidence=1.0
+    )
+    
+    with patch("src.agent.orchestrator.aparse_intent", return_value=mock_intent):
+        response = await orchestrator.ahandle_user_utterance(
+            db=db,
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            utterance="System status",
+            modality="text"
+        )
+        
+        assert "Done" in response.assistant_text
+        assert response.metadata["tool_result"]["status"] == "success"
+
+@pytest.mark.asyncio
+async def test_orchestrator_reports_phases(db):
+    """
+    on_phase receives context, intent, plan, policy and tool events in pipeline order.
+    """
+    orchestrator = AgentOrchestrator()
+    mock_intent = Intent(name="get_system_info", slots={}, confidence=1.0)
+    events = []
+    
+    with patch("src.agent.orchestrator.aparse_intent", return_value=mock_intent):
+        await orchestrator.ahandle_user_utterance(
+            db=db,
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            utterance="System status",
+            modality="text",
+            on_phase=lambda phase, data: events.append((phase, data))
+        )
+    
+    # call_soon_threadsafe callbacks run on the next loop iterations
+    await asyncio.sleep(0)
+    
+    assert [phase for phase, _ in events] == ["context", "intent", "plan", "policy", "tool"]
+    assert events[1][1]["intent"] == "get_system_info"
+    assert events[-1][1] == {"tool": "get_system_info", "status": "success"}
+
+def test_sync_entry_point_reuses_one_loop(db):
+    """
+    Loop-bound clients (intent LLM, embeddings pool) stay usable across sync calls.
+    """
+    orchestrator = AgentOrchestrator()
+    loops = []
+    
+    async def parse(*args, **kwargs):
+        loops.append(asyncio.get_running_loop())
+        return Intent(name="get_system_info", slots={}, confidence=1.0)
+    
+    with patch("src.agent.orchestrator.aparse_intent", side_effect=parse):
+        for _ in range(2):
+            orchestrator.handle_user_utterance(
+                db=db,
+                user_id=db.test_user_id,
+                session_id=db.test_session_id,
+                utterance="System status",
+                modality="text"
+            )
+    
+    assert loops[0] is loops[1]
+    assert not loops[0].is_closed()
+
+def test_turn_commits_once_in_unit_of_work(db):
+    """
+    A read-only turn buffers message, decision, tool call and reply into a single commit.
+    """
+    orchestrator = AgentOrchestrator()
+    mock_intent = Intent(name="get_system_info", slots={}, confidence=1.0)
+    commits = []
+    # Count real COMMITs on the connection; SAVEPOINT releases are not commits
+    on_commit = lambda conn: commits.append(conn)
+    event.listen(engine, "commit", on_commit)
+    
+    try:
+        with patch.object(settings, "AGENT_UNIT_OF_WORK", True), \
+             patch("src.agent.orchestrator.aparse_intent", return_value=mock_intent):
+            orchestrator.handle_user_utterance(
+                db=db,
+                user_id=db.test_user_id,
+                session_id=db.test_session_id,
+                utterance="System status",
+                modality="text"
+            )
+    finally:
+        event.remove(engine, "commit", on_commit)
+    
+    assert len(commits) == 1
+    msgs = db.query(AgentMessage).filter(AgentMessage.session_id == db.test_session_id).all()
+    roles = sorted(m.role for m in msgs)
+    assert roles == ["assistant", "user"]
+
+def test_speculative_intent_reparsed_when_memory_resolves_slot(db):
+    """
+    Speculative parse on history-only context is redone when a memory mentions a slot value.
+    """
+    orchestrator = AgentOrchestrator()
+    
+    speculative = Intent(name="get_system_info", slots={"target": "home"}, confidence=0.9)
+    final = Intent(name="get_system_info", slots={}, confidence=1.0)
+    
+    with patch.object(settings, "INTENT_SPECULATIVE_PARSE", True), \
+         patch("src.agent.orchestrator.aget_memory_facts", return_value=["[FACT] home: Pune"]), \
+         patch("src.agent.orchestrator.aparse_intent", side_effect=[speculative, final]) as mock_parse:
+        response = orchestrator.handle_user_utterance(
+            db=db,
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            utterance="Status at home",
+            modality="text"
+        )
+        
+        assert mock_parse.call_count == 2
+        assert "Relevant Memories:\n[FACT] home: Pune" in mock_parse.call_args.kwargs["context_str"]
+        assert "Done" in response.assistant_text
+
+def test_plan_dependents_skipped_after_failed_step(db):
+    """
+    A failed lookup blocks the step that depends on it; the independent lookup still runs.
+    """
+    from src.agent.contracts import Plan, PlanStep
+    from src.tools.contracts import ToolResult
+    
+    orchestrator = AgentOrchestrator()
+    plan = Plan(steps=[
+        PlanStep(step_id="a", tool_name="get_system_info", args={}, intent_summary="a"),
+        PlanStep(step_id="b", tool_name="get_system_info", args={}, intent_summary="b"),
+        PlanStep(step_id="c", tool_name="get_system_info", args={}, intent_summary="c", depends_on=["a", "b"]),
+    ])
+    
+    def fake_execute(tool_name, args_dict, **kwargs):
+        return ToolResult(status="error", error="boom", latency_ms=1)
+    
+    with patch("src.agent.orchestrator.build_plan", return_value=plan), \
+         patch("src.agent.orchestrator.aparse_intent", return_value=Intent(name="get_system_info", confidence=1.0)), \
+         patch.object(orchestrator.tool_runtime, "aexecute", side_effect=fake_execute) as mock_exec:
+        response = orchestrator.handle_user_utterance(
+            db=db,
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            utterance="System status",
+            modality="text"
+        )
+        
+        assert mock_exec.call_count == 2
+        assert set(response.metadata["step_results"]) == {"a", "b"}
+        assert "Something went wrong" in response.assistant_text
+
+def test_failed_weather_lookup_does_not_block_event_creation(db):
+    """
+    The lookups before an offline event are advisory: a weather failure still creates the event.
+    """
+    from src.agent.planner import build_plan
+    from src.tools.contracts import ToolResult
+    
+    orchestrator = AgentOrchestrator()
+    intent = Intent(
+        name="create_calendar_event",
+        slots={
+            "subject": "Site visit",
+            "start_time_str": "tomorrow at 4pm",
+            "end_time_str": "tomorrow at 5pm",
+            "location": "Pune"
+        },
+        confidence=1.0
+    )
+    
+    def fake_execute(tool_name, args_dict, **kwargs):
+        if tool_name == "get_weather_info":
+            return ToolResult(status="error", error="Weather API unavailable", latency_ms=1)
+        return ToolResult(status="success", data={"message": "ok"}, latency_ms=1)
+    
+    with patch("src.agent.orchestrator.build_plan", return_value=build_plan(intent, {})), \
+         patch("src.agent.orchestrator.aparse_intent", return_value=intent), \
+         patch.object(orchestrator.tool_runtime, "aexecute", side_effect=fake_execute) as mock_exec:
+        response = orchestrator.handle_user_utterance(
+            db=db,
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            utterance="Schedule a site visit in Pune tomorrow at 4pm",
+            modality="text"
+        )
+        
+        executed = [c.kwargs["tool_name"] for c in mock_exec.call_args_list]
+        assert executed[-1] == "create_calendar_event"
+        assert response.metadata["step_results"]["weather_check"]["status"] == "error"
+        assert response.metadata["tool_result"]["status"] == "success"
+
+def test_offline_event_plan_against_policy_registry(db):
+    """
+    With the real policy registry the lookups run and the event itself waits for confirmation.
+    """
+    from src.agent.planner import build_plan
+    from src.tools.registry import register_tool
+    from src.tools.contracts import ToolSpec
+    from src.tools.schemas.weather_schemas import GetWeatherInfoSchema
+    from src.tools.schemas.m365_schemas import CreateCalendarEventSchema, GetCalendarEventsSchema
+    from src.policy.tool_registry import TOOL_POLICY_REGISTRY
+    
+    tools = {
+        "get_weather_info": (GetWeatherInfoSchema, lambda location, num_days: f"Sunny in {location}"),
+        "get_calendar_events": (GetCalendarEventsSchema, lambda days, specific_date=None: "No events found."),
+        "create_calendar_event": (CreateCalendarEventSchema, lambda **kwargs: "Event created."),
+    }
+    for name, (args_model, func) in tools.items():
+        register_tool(ToolSpec(
+            name=name,
+            description=name,
+            args_model=args_model,
+            **TOOL_POLICY_REGISTRY[name]
+        ), func)
+    
+    orchestrator = AgentOrchestrator()
+    intent = Intent(
+        name="create_calendar_event",
+        slots={
+            "subject": "Site visit",
+            "start_time_str": "tomorrow at 4pm",
+            "end_time_str": "tomorrow at 5pm",
+            "location": "Pune"
+        },
+        confidence=1.0
+    )
+    
+    with patch("src.agent.orchestrator.build_plan", return_value=build_plan(intent, {})), \
+         patch("src.agent.orchestrator.aparse_intent", return_value=intent):
+        response = orchestrator.handle_user_utterance(
+            db=db,
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            utterance="Schedule a site visit in Pune tomorrow at 4pm",
+            modality="text"
+        )
+    
+    steps = response.metadata["step_results"]
+    assert steps["weather_check"]["status"] == "success"
+    assert "Sunny in Pune" in str(steps["weather_check"]["data"])
+    assert steps["calendar_check"]["status"] == "success"
+    assert response.metadata["tool_result"]["status"] == "needs_confirmation"
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+from src.agent.contracts import Intent
+from src.agent.planner import build_plan
+
+def test_single_step_plan():
+    plan = build_plan(Intent(name="read_emails", slots={}, confidence=1.0), {})
+    assert len(plan.steps) == 1
+    assert plan.steps[0].depends_on == []
+
+def test_offline_event_checks_weather_and_calendar_first():
+    intent = Intent(
+        name="create_calendar_event",
+        slots={
+            "subject": "Sync with Jane",
+            "start_time_str": "tomorrow at 4pm",
+            "end_time_str": "tomorrow at 5pm",
+            "location": "Mumbai office"
+        },
+        confidence=1.0
+    )
+    plan = build_plan(intent, {})
+    
+    tools = [s.tool_name for s in plan.steps]
+    assert tools == ["get_weather_info", "get_calendar_events", "create_calendar_event"]
+    # The two lookups are independent; the create runs after both but does not need them to succeed
+    assert plan.steps[0].runs_after == [] and plan.steps[1].runs_after == []
+    assert set(plan.steps[2].runs_after) == {plan.steps[0].step_id, plan.steps[1].step_id}
+    assert plan.steps[2].depends_on == []
+    assert plan.steps[0].args["location"] == "Mumbai office"
+
+def test_teams_meeting_skips_weather():
+    intent = Intent(
+        name="create_calendar_event",
+        slots={
+            "subject": "Standup",
+            "start_time_str": "tomorrow at 10am",
+            "end_time_str": "tomorrow at 10:15am",
+            "location": "Teams",
+            "create_teams_meeting": True
+        },
+        confidence=1.0
+    )
+    assert len(build_plan(intent, {}).steps) == 1
+
+def _offline_event(start: str) -> Intent:
+    return Intent(
+        name="create_calendar_event",
+        slots={"subject": "Site visit", "start_time_str": start, "location": "Pune"},
+        confidence=1.0
+    )
+
+def test_weather_skipped_outside_forecast_window():
+    for days_ahead in (-1, 5, 10):
+        start = (date.today() + timedelta(days=days_ahead)).isoformat()
+        tools = [s.tool_name for s in build_plan(_offline_event(start), {}).steps]
+        assert tools == ["get_calendar_events", "create_calendar_event"], days_ahead
+
+def test_weather_forecast_covers_event_day():
+    start = (date.today() + timedelta(days=4)).isoformat()
+    plan = build_plan(_offline_event(start), {})
+    assert plan.steps[0].tool_name == "get_weather_info"
+    assert plan.steps[0].args["num_days"] == 5
@@ -8,6 +8,8 @@ os.environ["SMTP_PASS"] = "test"
 os.environ["SMTP_HOST"] = "localhost"
 os.environ["FROM_EMAIL"] = "test@example.com"
 os.environ["SMTP_PORT"] = "587"
+# The app engine has no embedding_cache table in tests
+os.environ["EMBEDDING_CACHE_PERSIST"] = "false"
 
 import pytest
 import pytest_asyncio
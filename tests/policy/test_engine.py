@@ -35,6 +35,13 @@ def test_readonly_low_risk_allow():
     assert decision.risk_score <= 10
     assert decision.reason_code == "LOW_RISK_READ"
 
+def test_cacheable_lookup_tools_allowed():
+    # Read-only tools with a result cache TTL must not stop at policy
+    for tool_name in ("get_weather_info", "web_search"):
+        decision = evaluate_policy(create_check(tool_name, action_type="READ"))
+        assert decision.decision == "ALLOW"
+        assert decision.reason_code == "LOW_RISK_READ"
+
 def test_external_communication_confirm():
     # email.send is external comms
     check = create_check("email.send", action_type="WRITE", sensitivity="high")
@@ -96,3 +103,39 @@ def test_risk_normalization():
     check = create_check("file.delete", action_type="DELETE", sensitivity="high")
     decision = evaluate_policy(check)
     assert 0 <= decision.risk_score <= 100
+
+def test_decision_table_matches_rules_for_registry():
+    from src.policy.engine import policy_table, evaluate_policy_uncached, ACTION_TYPES, SCOPES
+    from src.policy.tool_registry import TOOL_POLICY_REGISTRY
+    
+    policy_table.clear()
+    assert policy_table.warm() >= len(TOOL_POLICY_REGISTRY) * len(ACTION_TYPES) * len(SCOPES)
+    
+    for tool_name, meta in TOOL_POLICY_REGISTRY.items():
+        for action_type in ACTION_TYPES:
+            for scope in SCOPES:
+                check = create_check(tool_name, action_type=action_type, scope=scope, target_entity=meta["category"])
+                cached = evaluate_policy(check)
+                reference = evaluate_policy_uncached(check)
+                assert cached.model_dump(exclude={"expires_at"}) == reference.model_dump(exclude={"expires_at"})
+                assert (cached.expires_at is None) == (reference.expires_at is None)
+
+def test_decision_table_follows_registry_changes():
+    from unittest.mock import patch
+    
+    check = create_check("test.table_tool", action_type="READ")
+    assert evaluate_policy(check).decision == "DENY"
+    
+    meta = {
+        "category": "other",
+        "default_action_type": "READ",
+        "default_sensitivity": "low",
+        "default_scope": "single",
+        "side_effects": False,
+        "external_communication": False,
+        "destructive": False,
+    }
+    with patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"test.table_tool": meta}):
+        assert evaluate_policy(check).decision == "ALLOW"
+    
+    assert evaluate_policy(check).decision == "DENY"
@@ -70,3 +70,39 @@ def test_policy_persistence_confirmation(db):
     assert confirmation.tool_name == "email.send"
     assert confirmation.status == "pending"
     assert confirmation.tool_args == {"to": "test@example.com"}
+
+def test_confirmed_approval_matched_by_args_hash(db):
+    # A confirmation is consumed once, and only by the exact payload it was given for
+    from datetime import datetime, timedelta, timezone
+    
+    session_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    db.add(PendingConfirmationModel(
+        session_id=session_id,
+        user_id=user_id,
+        tool_name="email.send",
+        tool_args={"to": "a@example.com", "subject": "hi"},
+        decision_type="ALLOW_WITH_CONFIRMATION",
+        status="confirmed",
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=5)
+    ))
+    db.commit()
+    
+    def check(args):
+        return PolicyCheck(
+            user_id=user_id,
+            session_id=session_id,
+            tool_name="email.send",
+            action_type="WRITE",
+            target_entity="email",
+            scope="single",
+            sensitivity="high",
+            intent_summary="Sending email",
+            tool_args_preview=args
+        )
+    
+    # Different payload: not approved
+    assert check_and_record_policy(check({"to": "b@example.com", "subject": "hi"}), db).decision == "ALLOW_WITH_CONFIRMATION"
+    # Same payload, different key order: approved once
+    assert check_and_record_policy(check({"subject": "hi", "to": "a@example.com"}), db).reason_code == "USER_CONFIRMED"
+    assert check_and_record_policy(check({"subject": "hi", "to": "a@example.com"}), db).reason_code != "USER_CONFIRMED"
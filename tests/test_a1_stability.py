@@ -61,7 +61,7 @@ def test_a1_create_session(test_user):
     except ValueError:
         pytest.fail("Returned session_id is not a valid UUID")
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 @pytest.fixture
 def mock_orchestratorv():
@@ -72,7 +72,7 @@ def mock_orchestratorv():
         response.assistant_text = "I am a mock agent"
         response.pending_confirmation = None
         response.metadata = {"request_id": "test-req-id"}
-        instance.handle_user_utterance.return_value = response
+        instance.ahandle_user_utterance = AsyncMock(return_value=response)
         yield instance
 
 def test_a1_message_valid_session(db_session, test_user, mock_orchestratorv):
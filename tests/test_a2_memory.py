@@ -53,3 +53,70 @@ def test_retrieve_memory_logic(db_session: Session):
     assert "Apples" in results[0].content
     assert results[0].metadata_["topic"] == "fruit"
 
+
+def test_expiry_sweep_soft_deletes_memories_and_confirmations(db_session: Session):
+    from datetime import datetime, timedelta, timezone
+    from src.db.expiry_sweeper import expire_memories, expire_confirmations, count_pending_confirmations
+    from src.models.policy import PendingConfirmationModel
+    
+    user_id = str(uuid4())
+    expired_ids = [
+        write_memory(db_session, user_id, None, "TASK", "test", f"Short-lived task {i}", retention_days=1)
+        for i in range(3)
+    ]
+    kept_id = write_memory(db_session, user_id, None, "FACT", "test", "Long-lived fact")
+    
+    session_id = uuid4()
+    for status in ("pending", "pending", "confirmed"):
+        db_session.add(PendingConfirmationModel(
+            session_id=session_id,
+            user_id=uuid4(),
+            tool_name="email.send",
+            tool_args={},
+            decision_type="ALLOW_WITH_CONFIRMATION",
+            status=status,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=5)
+        ))
+    db_session.commit()
+    
+    # Two days later the TASKs and all confirmations are past expiry
+    later = datetime.now(timezone.utc) + timedelta(days=2)
+    assert expire_memories(db_session, later, batch_size=2) == 3
+    assert expire_memories(db_session, later, batch_size=2) == 0
+    assert expire_confirmations(db_session, later) >= 3
+    
+    db_session.expire_all()
+    for mem_id in expired_ids:
+        assert db_session.query(Memory).filter(Memory.id == mem_id).one().is_deleted
+    assert not db_session.query(Memory).filter(Memory.id == kept_id).one().is_deleted
+    
+    events = db_session.query(MemoryEvent).filter(MemoryEvent.event_type == "EXPIRED").all()
+    assert {str(e.memory_id) for e in events} >= set(expired_ids)
+    
+    statuses = {c.status for c in db_session.query(PendingConfirmationModel).filter_by(session_id=session_id)}
+    assert statuses == {"expired"}
+    assert count_pending_confirmations(db_session, later) == 0
+
+def test_auto_search_strategy_uses_exact_scan_for_small_users(db_session: Session):
+    from unittest.mock import patch
+    from src.config import settings
+    from src.memory.retrieve import choose_search_strategy
+    
+    user_id = str(uuid4())
+    write_memory(db_session, user_id, None, "FACT", "test", "Fact one")
+    write_memory(db_session, user_id, None, "FACT", "test", "Fact two")
+    
+    with patch.object(settings, "MEMORY_EXACT_SCAN_MAX_ROWS", 2):
+        assert choose_search_strategy(db_session, user_id, "auto") == "exact"
+    with patch.object(settings, "MEMORY_EXACT_SCAN_MAX_ROWS", 1):
+        assert choose_search_strategy(db_session, user_id, "auto") == "hnsw"
+    
+    assert choose_search_strategy(db_session, user_id, "exact") == "exact"
+    assert choose_search_strategy(db_session, user_id, "bogus") == "hnsw"
+    
+    # The size check is cached per user: a third memory is not seen until the TTL lapses
+    write_memory(db_session, user_id, None, "FACT", "test", "Fact three")
+    with patch.object(settings, "MEMORY_EXACT_SCAN_MAX_ROWS", 2):
+        assert choose_search_strategy(db_session, user_id, "auto") == "exact"
+        with patch.object(settings, "MEMORY_SEARCH_SIZE_CACHE_TTL_SECONDS", 0):
+            assert choose_search_strategy(db_session, user_id, "auto") == "hnsw"
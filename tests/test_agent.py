@@ -23,3 +23,29 @@ def test_create_agent_executor_with_rag():
                 executor = create_agent_executor(rag_enabled=True)
                 assert executor is not None
 
+
+def test_executor_pool_reuses_until_tool_set_changes():
+    """Pooled executor is reused per RAG variant and rebuilt when the tools change."""
+    from unittest.mock import MagicMock
+    from src.agent.executor_pool import AgentExecutorPool
+
+    def named(*names):
+        tools = []
+        for name in names:
+            tool = MagicMock()
+            tool.name = name
+            tools.append(tool)
+        return tools
+
+    tool_sets = {False: named("a", "b"), True: named("a", "b", "rag")}
+    factory = MagicMock(side_effect=lambda rag_enabled: object())
+    pool = AgentExecutorPool(factory=factory, tools_fn=lambda rag_enabled: tool_sets[rag_enabled])
+
+    base = pool.get(rag_enabled=False)
+    assert pool.get(rag_enabled=False) is base
+    assert pool.get(rag_enabled=True) is not base
+    assert factory.call_count == 2
+
+    tool_sets[False] = named("a", "b", "c")
+    assert pool.get(rag_enabled=False) is not base
+    assert factory.call_count == 3
@@ -0,0 +1,292 @@
+import threading
+
+from unittest.mock import PropertyMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.memory.embedding_batcher import EmbeddingBatcher, split_batches
+from src.memory.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.memory.embeddings import EmbeddingsProvider, HashedNgramEmbeddings, LocalEmbeddings, stable_hash
+from src.memory.local_model import SentenceEmbeddings, fit_dimension
+
+class OversizedError(Exception):
+    status_code = 400
+
+class InvalidRequestError(Exception):
+    status_code = 400
+
+def test_batcher_coalesces_concurrent_requests():
+    calls = []
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+    
+    batcher = EmbeddingBatcher(embed_fn, max_batch_size=64, max_wait=0.2)
+    results = {}
+    def worker(i):
+        results[i] = batcher.embed(["x" * i, "y" * (i + 100)])
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.stop()
+    
+    # Every caller gets its own vectors, in its own order
+    assert results == {i: [[float(i)], [float(i + 100)]] for i in range(1, 9)}
+    assert len(calls) < 8
+    assert sum(len(c) for c in calls) == 16
+
+def test_batcher_respects_limits_and_splits_oversized_batches():
+    calls = []
+    def embed_fn(texts):
+        calls.append(len(texts))
+        if len(texts) > 2:
+            raise OversizedError("too many tokens")
+        if "bad" in texts:
+            raise OversizedError("input too long")
+        return [[1.0] for _ in texts]
+    
+    batcher = EmbeddingBatcher(embed_fn, max_batch_size=4, max_wait=0)
+    assert batcher.embed(["a"] * 10) == [[1.0]] * 10
+    # 10 texts in batches of at most 4, the 4s split into 2 + 2
+    assert max(calls) == 4
+    
+    calls.clear()
+    with pytest.raises(OversizedError):
+        batcher.embed(["a", "bad"])
+    assert calls == [2, 1, 1]
+    batcher.stop()
+
+def test_batcher_fails_whole_batch_on_other_bad_requests():
+    calls = []
+    def embed_fn(texts):
+        calls.append(len(texts))
+        raise InvalidRequestError("Invalid model: text-embedding-4")
+    
+    batcher = EmbeddingBatcher(embed_fn, max_batch_size=8, max_wait=0)
+    with pytest.raises(InvalidRequestError):
+        batcher.embed(["a", "b", "c", "d"])
+    batcher.stop()
+    
+    # Not a size rejection: no split-and-retry
+    assert calls == [4]
+
+def test_batcher_sends_batches_concurrently():
+    lock = threading.Lock()
+    active = []
+    peak = []
+    def embed_fn(texts):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        threading.Event().wait(0.05)
+        with lock:
+            active.pop()
+        return [[float(len(t))] for t in texts]
+    
+    batcher = EmbeddingBatcher(embed_fn, max_batch_size=1, max_wait=0, max_concurrency=2)
+    texts = ["a" * i for i in range(1, 7)]
+    assert batcher.embed(texts) == [[float(i)] for i in range(1, 7)]
+    batcher.stop()
+    
+    # One text per batch, at most two batches in flight
+    assert len(peak) == 6
+    assert max(peak) == 2
+
+class CountingProvider(EmbeddingsProvider):
+    model = "counting"
+    dim = 3
+    cacheable = True
+    
+    def __init__(self):
+        self.calls = []
+    
+    def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+def test_cached_embeddings_skip_the_provider_for_repeated_texts():
+    provider = CountingProvider()
+    cached = CachedEmbeddings(provider, EmbeddingCache(max_entries=16, persist=False))
+    
+    assert cached.embed_texts(["abc", "de", "abc"]) == [[3.0, 0.5, -1.0], [2.0, 0.5, -1.0], [3.0, 0.5, -1.0]]
+    assert cached.embed_texts(["de", "fghi"]) == [[2.0, 0.5, -1.0], [4.0, 0.5, -1.0]]
+    # Each distinct text reached the provider once
+    assert provider.calls == [["abc", "de"], ["fghi"]]
+
+def test_cached_embeddings_hash_redacted_text():
+    provider = CountingProvider()
+    cached = CachedEmbeddings(provider, EmbeddingCache(max_entries=16, persist=False))
+    
+    cached.embed_texts(["my key is sk-" + "a" * 40])
+    cached.embed_texts(["my key is sk-" + "b" * 40])
+    # Secrets never reach the cache key or the provider; both texts share one entry
+    assert provider.calls == [["my key is [REDACTED_KEY]"]]
+
+def test_embedding_cache_persistent_tier_survives_the_lru(engine):
+    from sqlalchemy.orm import sessionmaker
+    
+    factory = sessionmaker(bind=engine)
+    provider = CountingProvider()
+    provider.model = f"counting-{uuid4()}"
+    cached = CachedEmbeddings(provider, EmbeddingCache(max_entries=16, session_factory=factory))
+    cached.embed_texts(["persisted text"])
+    
+    # A fresh process: empty LRU, same table
+    fresh = CachedEmbeddings(provider, EmbeddingCache(max_entries=16, session_factory=factory))
+    assert fresh.embed_texts(["persisted text"]) == [[14.0, 0.5, -1.0]]
+    assert provider.calls == [["persisted text"]]
+
+def test_sentence_provider_uses_in_memory_cache_only():
+    from unittest.mock import patch
+    from src.config import settings
+    from src.memory.embeddings import get_embeddings_provider
+    
+    with patch.object(settings, "EMBEDDINGS_PROVIDER", "sentence"), \
+         patch.object(settings, "EMBEDDING_CACHE_PERSIST", True), \
+         patch.object(settings, "EMBEDDING_CACHE_MAX_ENTRIES", 16), \
+         patch("src.memory.local_model.create_sentence_embeddings", return_value=CountingProvider()):
+        provider = get_embeddings_provider()
+    
+    assert isinstance(provider, CachedEmbeddings)
+    assert provider.cache.persist is False
+
+def test_local_embeddings_are_stable_float32_unit_vectors():
+    provider = LocalEmbeddings(dim=64)
+    matrix = provider.embed_matrix(["alpha", "beta", "alpha"])
+    
+    assert matrix.dtype == np.float32 and matrix.shape == (3, 64)
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-5)
+    assert np.array_equal(matrix[0], matrix[2])
+    assert not np.array_equal(matrix[0], matrix[1])
+    # Seeded by a stable hash, not hash(): same vector in every process
+    assert stable_hash("alpha") == 0x9A08C8EA20D20653
+    assert provider.embed_texts(["alpha"])[0] == matrix[0].tolist()
+
+def test_hashed_ngram_embeddings_rank_related_texts_higher():
+    provider = HashedNgramEmbeddings()
+    query, related, unrelated = provider.embed_matrix([
+        "What coffee do I prefer?",
+        "User prefers dark roast coffee",
+        "Quarterly budget review with finance"
+    ])
+    
+    assert query @ related > 0.3
+    assert query @ related > query @ unrelated + 0.2
+    # No word characters: still a unit vector, never all zeros
+    assert np.isclose(np.linalg.norm(provider.embed_matrix(["?!"])[0]), 1.0)
+
+class FakeEncoding:
+    def __init__(self, ids, length):
+        self.ids = ids + [0] * (length - len(ids))
+        self.attention_mask = [1] * len(ids) + [0] * (length - len(ids))
+
+class FakeTokenizer:
+    def encode_batch(self, texts):
+        ids = [[ord(c) % 8 + 1 for c in text] for text in texts]
+        length = max(len(i) for i in ids)
+        return [FakeEncoding(i, length) for i in ids]
+
+class FakeSession:
+    def __init__(self):
+        self.batches = []
+    
+    def run(self, outputs, feeds):
+        # Token id i lights up hidden unit i; padding tokens light up unit 0
+        self.batches.append(feeds["input_ids"].shape)
+        return [np.eye(9, dtype=np.float32)[feeds["input_ids"]]]
+
+def test_sentence_provider_fails_fast_without_extra():
+    from src.memory.local_model import create_sentence_embeddings
+    
+    with patch("importlib.util.find_spec", return_value=None):
+        with pytest.raises(RuntimeError, match="--extras sentence"):
+            create_sentence_embeddings()
+
+def test_sentence_embeddings_batch_pool_and_pad_to_embed_dim():
+    provider = SentenceEmbeddings(batch_size=2, dim=16)
+    provider._tokenizer = FakeTokenizer()
+    provider._session = FakeSession()
+    provider._input_names = ["input_ids", "attention_mask"]
+    
+    texts = ["abcabc", "a", "bb", "abc"]
+    matrix = provider.embed_matrix(texts)
+    
+    assert matrix.shape == (4, 16)
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-5)
+    # Batched by length: ("a", "bb") then ("abc", "abcabc"), padded only within a batch
+    assert provider._session.batches == [(2, 2), (2, 6)]
+    # Padding tokens are masked out of the mean, and rows come back in input order
+    assert np.allclose(matrix[0], matrix[3])
+    assert matrix[1][ord("a") % 8 + 1] == pytest.approx(1.0)
+    # Zero-padding beyond the model width keeps cosine similarity unchanged
+    assert not matrix[:, 9:].any()
+
+def test_fit_dimension_projects_wider_models_to_unit_rows():
+    matrix = np.eye(4, 32, dtype=np.float32)
+    fitted = fit_dimension(matrix, 16)
+    assert fitted.shape == (4, 16)
+    assert np.allclose(np.linalg.norm(fitted, axis=1), 1.0, atol=1e-5)
+    assert np.array_equal(fitted, fit_dimension(matrix, 16))
+
+def test_split_batches_respects_input_and_token_limits():
+    texts = ["a" * 40, "b" * 40, "c" * 400, "d"]
+    # estimate_tokens: 11, 11, 101, 1
+    assert split_batches(texts, max_batch_size=8, max_batch_tokens=30) == [["a" * 40, "b" * 40], ["c" * 400], ["d"]]
+    assert split_batches(texts, max_batch_size=1, max_batch_tokens=1000) == [[t] for t in texts]
+
+@pytest.mark.asyncio
+async def test_cached_embeddings_async_path_shares_the_cache():
+    provider = CountingProvider()
+    cached = CachedEmbeddings(provider, EmbeddingCache(max_entries=16, persist=False))
+    
+    assert await cached.aembed_texts(["abc", "abc"]) == [[3.0, 0.5, -1.0]] * 2
+    assert cached.embed_texts(["abc"]) == [[3.0, 0.5, -1.0]]
+    assert provider.calls == [["abc"]]
+
+@pytest.mark.asyncio
+async def test_openai_async_embeddings_split_oversized_batches():
+    from unittest.mock import MagicMock
+    from src.memory.embeddings import OpenAIEmbeddingsProvider
+    
+    calls = []
+    async def create(input, model, dimensions):
+        calls.append(len(input))
+        if len(input) > 1:
+            raise OversizedError("too many tokens")
+        return MagicMock(data=[MagicMock(index=0, embedding=[float(len(input[0]))])])
+    
+    provider = OpenAIEmbeddingsProvider.__new__(OpenAIEmbeddingsProvider)
+    provider.model, provider.dim = "text-embedding-3-small", 3
+    client = MagicMock()
+    client.embeddings.create = create
+    
+    with patch.object(OpenAIEmbeddingsProvider, "async_client", new_callable=PropertyMock, return_value=client):
+        assert await provider.aembed_texts(["a", "bb", "ccc"]) == [[1.0], [2.0], [3.0]]
+    assert calls[0] == 3 and calls.count(1) == 3
+
+def test_openai_async_client_is_per_event_loop():
+    import asyncio
+    from src.memory.embeddings import OpenAIEmbeddingsProvider
+    
+    provider = OpenAIEmbeddingsProvider()
+    
+    async def clients():
+        return provider.async_client, provider.async_client
+    
+    first, same = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+    # A new loop never reuses connections opened on a closed one
+    assert first is same
+    assert first is not second
+    
+    async def close():
+        client = provider.async_client
+        await provider.aclose()
+        return client.is_closed()
+    
+    assert asyncio.run(close())
@@ -2,7 +2,7 @@
 import pytest
 from httpx import AsyncClient
 from uuid import uuid4
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, AsyncMock
 
 @pytest.mark.asyncio
 async def test_post_message_to_existing_session(async_client: AsyncClient, token_headers, mock_db_session, mock_user):
@@ -29,9 +29,10 @@ async def test_post_message_to_existing_session(async_client: AsyncClient, token
     from unittest.mock import patch
     with patch("src.api.sessions.message.AgentOrchestrator") as mock_orch_cls:
         mock_orch = mock_orch_cls.return_value
-        mock_orch.handle_user_utterance.return_value.assistant_text = "I am ready"
-        mock_orch.handle_user_utterance.return_value.pending_confirmation = None
-        mock_orch.handle_user_utterance.return_value.metadata = {}
+        mock_orch.ahandle_user_utterance = AsyncMock()
+        mock_orch.ahandle_user_utterance.return_value.assistant_text = "I am ready"
+        mock_orch.ahandle_user_utterance.return_value.pending_confirmation = None
+        mock_orch.ahandle_user_utterance.return_value.metadata = {}
 
         msg_res = await async_client.post(
             f"/sessions/{session_id}/message", 
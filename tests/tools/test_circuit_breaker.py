@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from src.tools.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("test.tool", failure_threshold=3, reset_seconds=60)
+    
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker("test.tool", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker("test.tool", failure_threshold=1, reset_seconds=10, half_open_probes=1)
+    
+    with patch("src.tools.circuit_breaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    
+    with patch("src.tools.circuit_breaker.time.monotonic", return_value=111.0):
+        # One probe allowed, the next caller still fails fast
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+        
+        # Probe failed -> open again
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+    
+    with patch("src.tools.circuit_breaker.time.monotonic", return_value=122.0):
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
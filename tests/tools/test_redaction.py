@@ -0,0 +1,56 @@
+import re
+
+from src.tools.redaction import redact, redact_data
+from src.utils.redaction import Redacter, SECRET_TRIGGERS, redact_text, redact_dict
+
+
+def _sequential(text):
+    # Reference behaviour: one re.sub per pattern, in order
+    for pattern, replacement in Redacter.PATTERNS:
+        text = re.sub(pattern, replacement, text)
+    return text
+
+
+def test_single_pass_matches_sequential_patterns():
+    samples = [
+        "nothing to see here",
+        "key sk-" + "A" * 25 + "T3BlbkFJ" + "b" * 25 + " trailing",
+        "key sk-" + "a" * 40,
+        "ghp_" + "c" * 36 + " and Bearer " + "t" * 30,
+        "db Password=hunter2;user=x&password=other",
+    ]
+    for text in samples:
+        assert redact_text(text) == _sequential(text)
+
+
+def test_every_pattern_has_a_trigger():
+    # The substring prefilter must never hide a pattern
+    for pattern, _ in Redacter.PATTERNS:
+        literal_prefix = pattern.split("[", 1)[0]
+        assert any(trigger in literal_prefix for trigger in SECRET_TRIGGERS)
+
+
+def test_structured_paths_only_for_redacted_values():
+    payload = {
+        "value": [
+            {"subject": "hi", "isRead": True, "size": 12, "body": {"content": "plain text"}},
+            {"headers": {"Authorization": "Bearer abc.def.ghi"}, "notes": ["ok", "key sk-" + "a" * 40]},
+        ],
+        "api_key": "raw",
+        "id_token": "aaaaaaaaaa.bbbbbbbbbbbb.cccccccccc",
+    }
+
+    result, paths = redact(payload)
+
+    assert paths == ["value[1].headers.Authorization", "value[1].notes[1]", "api_key", "id_token"]
+    assert result["value"][0] == payload["value"][0]
+    assert result["value"][1]["notes"] == ["ok", "key [REDACTED_KEY]"]
+    assert result["id_token"] == "[REDACTED OPTIONAL JWT]"
+    # Input untouched
+    assert payload["api_key"] == "raw"
+
+
+def test_redact_dict_scrubs_nested_strings_only():
+    data = {"a": ["password=1", ["password=2"]], "b": 1, "c": None}
+    assert redact_dict(data) == {"a": ["password=[REDACTED]", ["password=[REDACTED]"]], "b": 1, "c": None}
+    assert redact_data({"token": "x"}) == {"token": "[REDACTED]"}
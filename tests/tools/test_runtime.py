@@ -262,3 +262,362 @@ def test_rate_limiting(db):
     
     assert result.status == "denied"
     assert "Rate limit" in result.error
+
+def test_async_audit_sink_bulk_writes_and_drops_when_full(db):
+    from src.tools.audit import ToolCallAuditSink
+    
+    sink = ToolCallAuditSink(session_factory=TestingSessionLocal, max_queue=2, enqueue_timeout=0)
+    
+    def row(status):
+        return {
+            "id": str(uuid4()),
+            "session_id": str(db.test_session_id),
+            "user_id": str(db.test_user_id),
+            "tool_name": "audit_probe",
+            "args": {},
+            "result": {},
+            "status": status,
+            "latency_ms": 1
+        }
+    
+    assert sink.enqueue(row("success"))
+    assert sink.enqueue(row("error"))
+    # Queue full and no wait allowed -> dropped
+    assert not sink.enqueue(row("success"))
+    
+    assert sink.flush() == 2
+    
+    calls = db.query(ToolCall).filter(
+        ToolCall.session_id == db.test_session_id,
+        ToolCall.tool_name == "audit_probe"
+    ).all()
+    assert sorted(c.status for c in calls) == ["error", "success"]
+
+def test_async_audit_sink_keeps_good_rows_when_one_fails(db):
+    from src.tools.audit import ToolCallAuditSink
+    
+    sink = ToolCallAuditSink(session_factory=TestingSessionLocal)
+    
+    def row(status):
+        return {
+            "id": str(uuid4()),
+            "session_id": str(db.test_session_id),
+            "user_id": str(db.test_user_id),
+            "tool_name": "audit_retry_probe",
+            "args": {},
+            "result": {},
+            "status": status,
+            "latency_ms": 1
+        }
+    
+    # status is NOT NULL: the bulk insert fails, the row-by-row retry keeps the other two
+    for status in ("success", None, "error"):
+        assert sink.enqueue(row(status))
+    assert sink.flush() == 2
+    
+    calls = db.query(ToolCall).filter(
+        ToolCall.session_id == db.test_session_id,
+        ToolCall.tool_name == "audit_retry_probe"
+    ).all()
+    assert sorted(c.status for c in calls) == ["error", "success"]
+
+def test_scope_cache_skips_lookup_and_invalidates_on_change(db):
+    from src.security.scope_cache import scope_cache
+    runtime = ToolRuntime()
+    
+    def run():
+        return runtime.execute(
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            tool_name="get_system_info",
+            args_dict={},
+            db=db
+        )
+    
+    assert run().status == "success"
+    assert scope_cache.get(db.test_user_id, db.test_session_id) is not None
+    
+    # Second call resolves scopes from the cache: no User/Session queries
+    queried = []
+    with patch.object(db, "query", wraps=db.query) as spy:
+        run()
+        queried = [c.args[0] for c in spy.call_args_list]
+    assert User not in queried and Session not in queried
+    
+    # Assigning an override drops the cached entry
+    sess = db.query(Session).filter(Session.id == db.test_session_id).first()
+    sess.scopes_override = []
+    db.commit()
+    assert scope_cache.get(db.test_user_id, db.test_session_id) is None
+    assert run().status == "denied"
+
+def test_in_memory_guards_window_and_loop_breaker():
+    from src.tools.guards import InMemoryToolGuards, MAX_CALLS_PER_MINUTE
+    guards = InMemoryToolGuards()
+    session_id = uuid4()
+    
+    for _ in range(2):
+        guards.record(session_id, "flaky", "error")
+    assert guards.check_loop_breaker(session_id, "flaky")
+    guards.record(session_id, "flaky", "error")
+    assert not guards.check_loop_breaker(session_id, "flaky")
+    guards.record(session_id, "flaky", "success")
+    assert guards.check_loop_breaker(session_id, "flaky")
+    
+    for _ in range(MAX_CALLS_PER_MINUTE):
+        guards.record(session_id, "busy", "success")
+    assert not guards.check_rate_limit(session_id, "busy")
+    # Limits are per (session, tool)
+    assert guards.check_rate_limit(session_id, "other")
+    assert guards.check_rate_limit(uuid4(), "busy")
+
+READ_ONLY_POLICY = {
+    "category": "other",
+    "default_action_type": "READ",
+    "default_sensitivity": "low",
+    "default_scope": "single",
+    "side_effects": False,
+    "external_communication": False,
+    "destructive": False,
+}
+
+class NoArgs(BaseModel):
+    pass
+
+def _register_read_only(name, func, args_model=NoArgs, **spec_fields):
+    # Callers patch TOOL_POLICY_REGISTRY with READ_ONLY_POLICY for this name
+    register_tool(
+        ToolSpec(
+            name=name,
+            description=name,
+            category="other",
+            args_model=args_model,
+            side_effects=False,
+            external_communication=False,
+            destructive=False,
+            default_action_type="READ",
+            default_sensitivity="low",
+            default_scope="single",
+            **spec_fields
+        ),
+        func
+    )
+
+@pytest.mark.asyncio
+async def test_aexecute_awaits_coroutine_tools(db):
+    async def async_tool():
+        return {"answer": 42}
+    _register_read_only("test.async_tool", async_tool)
+    
+    with patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"test.async_tool": READ_ONLY_POLICY}):
+        result = await ToolRuntime().aexecute(
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            tool_name="test.async_tool",
+            args_dict={},
+            db=db
+        )
+    
+    assert result.status == "success"
+    assert result.data == {"answer": 42}
+
+@pytest.mark.asyncio
+async def test_aexecute_times_out_slow_tools(db):
+    import asyncio
+    from src.config import settings
+    
+    async def slow_tool():
+        await asyncio.sleep(5)
+    _register_read_only("test.slow_tool", slow_tool)
+    
+    with patch.object(settings, "TOOL_TIMEOUT_SECONDS", 0.05), \
+         patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"test.slow_tool": READ_ONLY_POLICY}):
+        result = await ToolRuntime().aexecute(
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            tool_name="test.slow_tool",
+            args_dict={},
+            db=db
+        )
+    
+    assert result.status == "error"
+    assert "Timeout" in result.error
+
+def test_side_effecting_tool_timeout_is_unknown_outcome(db):
+    import time
+    from src.config import settings
+    
+    def slow_send():
+        time.sleep(0.5)
+        return {"message": "sent"}
+    register_tool(
+        ToolSpec(
+            name="test.slow_send",
+            description="test.slow_send",
+            category="other",
+            args_model=NoArgs,
+            side_effects=True,
+            external_communication=False,
+            destructive=False,
+            default_action_type="WRITE",
+            default_sensitivity="low",
+            default_scope="single"
+        ),
+        slow_send
+    )
+    policy = dict(READ_ONLY_POLICY, side_effects=True, default_action_type="WRITE")
+    
+    with patch.object(settings, "TOOL_TIMEOUT_SECONDS", 0.05), \
+         patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"test.slow_send": policy}):
+        result = ToolRuntime().execute(
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            tool_name="test.slow_send",
+            args_dict={},
+            db=db
+        )
+    
+    # The thread keeps running, so the send may still happen: never report a plain failure
+    assert result.status == "unknown"
+    assert "Check before retrying" in result.error
+
+def test_read_only_results_cached_per_user_and_args(db):
+    from src.tools.result_cache import result_cache
+    
+    class CityArgs(BaseModel):
+        city: str
+        units: str = "metric"
+    
+    calls = []
+    def forecast(city, units):
+        calls.append(city)
+        return {"city": city, "temp": 21}
+    _register_read_only("test.forecast", forecast, args_model=CityArgs, cache_ttl_seconds=60)
+    result_cache.clear()
+    runtime = ToolRuntime()
+    
+    def run(args, user_id=db.test_user_id):
+        return runtime.execute(
+            user_id=user_id,
+            session_id=db.test_session_id,
+            tool_name="test.forecast",
+            args_dict=args,
+            db=db
+        )
+    
+    with patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"test.forecast": READ_ONLY_POLICY}):
+        first = run({"city": "Pune"})
+        # Same validated args (default filled in) -> hit
+        second = run({"units": "metric", "city": "Pune"})
+        other_args = run({"city": "Delhi"})
+        # Another user never sees this user's entry
+        with patch("src.tools.runtime.scope_cache.get", return_value=["core"]):
+            other_user = run({"city": "Pune"}, user_id=uuid4())
+    
+    assert not first.cached and second.cached
+    assert second.data == first.data
+    assert not other_args.cached and not other_user.cached
+    assert calls == ["Pune", "Delhi", "Pune"]
+    
+    # Hits are audited too, flagged as cached
+    rows = db.query(ToolCall).filter(
+        ToolCall.session_id == db.test_session_id,
+        ToolCall.tool_name == "test.forecast"
+    ).all()
+    assert len(rows) == 4
+    assert sorted(r.cached for r in rows) == [False, False, False, True]
+    result_cache.clear()
+
+def test_weather_errors_are_not_cached(db):
+    from src.config import settings
+    from src.tools.result_cache import result_cache
+    
+    result_cache.clear()
+    runtime = ToolRuntime()
+    
+    def run():
+        return runtime.execute(
+            user_id=db.test_user_id,
+            session_id=db.test_session_id,
+            tool_name="get_weather_info",
+            args_dict={"location": "Pune"},
+            db=db
+        )
+    
+    with patch.object(settings, "OPENWEATHER_API_KEY", ""), \
+         patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"get_weather_info": READ_ONLY_POLICY}):
+        first = run()
+        second = run()
+    
+    # A ToolError is an error result, so the next call reaches the tool again
+    assert first.status == second.status == "error"
+    assert "API key is not set" in first.error
+    assert not second.cached
+    assert result_cache.get(db.test_user_id, "get_weather_info", {"location": "Pune", "num_days": 1}) is None
+
+def test_result_cache_lru_bounds_and_write_invalidation():
+    from src.tools.result_cache import ToolResultCache, CachedResult
+    
+    cache = ToolResultCache(max_entries=2, max_bytes=1024)
+    user = uuid4()
+    cache.put(user, "a", "calendar", {}, 60, CachedResult({"n": 1}, []))
+    cache.put(user, "b", "email", {}, 60, CachedResult({"n": 2}, []))
+    assert cache.get(user, "a", {})  # a is now most recent
+    cache.put(user, "c", "email", {}, 60, CachedResult({"n": 3}, []))
+    assert cache.get(user, "b", {}) is None
+    
+    # Oversized payloads are not cached
+    cache.put(user, "big", "web", {}, 60, CachedResult({"blob": "x" * 2048}, []))
+    assert cache.get(user, "big", {}) is None
+    
+    cache.invalidate_category(user, "calendar")
+    assert cache.get(user, "a", {}) is None
+    assert cache.get(user, "c", {}) is not None
+
+@pytest.mark.asyncio
+async def test_failed_audit_insert_keeps_unit_of_work_usable(db):
+    """
+    A rejected tool_calls row rolls back only its savepoint; the turn's other writes commit.
+    """
+    from src.db.unit_of_work import aunit_of_work
+    from src.models.message import Message
+    
+    runtime = ToolRuntime()
+    async with aunit_of_work(db):
+        db.add(Message(session_id=db.test_session_id, user_id=db.test_user_id, role="user", content="hi"))
+        # status is NOT NULL: this insert fails
+        runtime._persist_tool_call(db, db.test_user_id, db.test_session_id, "get_system_info", {}, {}, None, 1)
+        runtime._persist_tool_call(db, db.test_user_id, db.test_session_id, "get_system_info", {}, {}, "success", 1)
+    
+    assert db.query(Message).filter(Message.session_id == db.test_session_id).count() == 1
+    calls = db.query(ToolCall).filter(ToolCall.session_id == db.test_session_id).all()
+    assert [c.status for c in calls] == ["success"]
+
+def test_sync_execute_reuses_one_loop_for_coroutine_tools(db):
+    """
+    Loop-bound resources such as the shared HTTP client survive across sync calls.
+    """
+    from src.tools.config import get_async_client
+    
+    async def client_tool():
+        client = get_async_client()
+        return {"client": id(client), "closed": client.is_closed}
+    _register_read_only("test.client_tool", client_tool)
+    
+    runtime = ToolRuntime()
+    # No cache_ttl_seconds: both calls reach the tool
+    with patch.dict("src.policy.tool_registry.TOOL_POLICY_REGISTRY", {"test.client_tool": READ_ONLY_POLICY}):
+        results = [
+            runtime.execute(
+                user_id=db.test_user_id,
+                session_id=db.test_session_id,
+                tool_name="test.client_tool",
+                args_dict={},
+                db=db
+            )
+            for _ in range(2)
+        ]
+    
+    assert [r.status for r in results] == ["success", "success"]
+    assert results[0].data == results[1].data
+    assert results[0].data["closed"] is False